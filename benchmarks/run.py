@@ -0,0 +1,205 @@
+# benchmarks/run.py
+
+# Time each phase of turning metadata into a diagram on synthetic inputs.
+#
+#   python -m benchmarks.run --databases 5 --tables 200 --columns 20 --output results.json
+#   python -m benchmarks.run --compare results.json
+#   python -m benchmarks.run --startup-only --import-budget-ms 150
+#
+# Every phase is run --repeat times without tracing and the best wall time is
+# reported; a final run under tracemalloc records the phase's peak memory.
+
+import argparse
+import datetime
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+import pandas as pd
+from make_drawio_erd.cli import HEAVY_MODULES
+from make_drawio_erd.erd_drawio import ERDGenerator
+from make_drawio_erd.parsers.csv_data_parser import CSVDataParser
+from make_drawio_erd.parsers.metadata_csv_parser import MetaDataCSVParser
+from benchmarks.synthetic import make_metadata, write_data_files
+
+
+def measure(func, repeat):
+    """Return (result, best seconds, peak traced bytes) of calling func()."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    try:
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, best, peak
+
+
+def benchmark_generator(name, df, repeat):
+    """Time ERDGenerator's phases on a metadata DataFrame."""
+    results = []
+
+    def record(phase, func):
+        result, seconds, peak = measure(func, repeat)
+        results.append({'benchmark': name, 'phase': phase, 'seconds': seconds, 'peak_bytes': peak})
+        return result
+
+    generator = record('normalize', lambda: ERDGenerator(df))
+
+    def create_tables():
+        generator.tables, generator.cells, generator.pending_edges = {}, {}, []
+        generator._initialize_xml()
+        generator._create_tables()
+        return generator.mxGraphModel
+
+    model = record('create_tables', create_tables)
+    record('serialize', lambda: ET.tostring(model, encoding='utf-8', method='xml'))
+    record('write_drawio', lambda: ERDGenerator(df).write_drawio(io.StringIO()))
+    record('write_fragments', lambda: ERDGenerator(df, fragments=True).write_drawio(io.StringIO()))
+    return results
+
+
+STARTUP_SCRIPT = '''
+import sys, time
+start = time.perf_counter()
+import make_drawio_erd.cli
+print(time.perf_counter() - start)
+print(' '.join(name for name in %r if name in sys.modules))
+''' % (HEAVY_MODULES,)
+
+
+def benchmark_startup(repeat):
+    """Time importing the command line module in a fresh interpreter, and
+    list the heavy modules the import loaded."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    best = None
+    for _ in range(max(repeat, 1)):
+        output = subprocess.run(
+            [sys.executable, '-c', STARTUP_SCRIPT], capture_output=True, text=True, check=True, cwd=root
+        ).stdout.splitlines()
+        seconds = float(output[0])
+        best = seconds if best is None else min(best, seconds)
+    loaded = output[1].split() if len(output) > 1 else []
+    return {'benchmark': 'startup', 'phase': 'import_cli', 'seconds': best, 'peak_bytes': 0, 'heavy_modules': loaded}
+
+
+def run_benchmarks(args):
+    results = [benchmark_startup(args.repeat)]
+    if args.startup_only:
+        return results
+    with tempfile.TemporaryDirectory() as directory:
+        metadata = make_metadata(
+            args.databases, args.tables, args.columns,
+            pk_ratio=args.pk_ratio, fk_ratio=args.fk_ratio, seed=args.seed
+        )
+        metadata_path = os.path.join(directory, 'metadata.csv')
+        metadata.to_csv(metadata_path, index=False)
+
+        df, seconds, peak = measure(lambda: MetaDataCSVParser(metadata_path).parse(), args.repeat)
+        results.append({'benchmark': 'metadata', 'phase': 'parse', 'seconds': seconds, 'peak_bytes': peak})
+        results.extend(benchmark_generator('metadata', df, args.repeat))
+
+        if args.data_files:
+            data_directory = os.path.join(directory, 'data')
+            os.makedirs(data_directory)
+            write_data_files(data_directory, args.data_files, args.data_rows, args.data_columns, seed=args.seed)
+            parser = CSVDataParser(
+                data_directory, sample_size=args.data_rows, sampling=args.sampling,
+                jobs=1, discover_keys=args.discover_keys
+            )
+            df, seconds, peak = measure(parser.parse, args.repeat)
+            results.append({'benchmark': 'csvdata', 'phase': 'parse', 'seconds': seconds, 'peak_bytes': peak})
+            results.extend(benchmark_generator('csvdata', df, args.repeat))
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results, baseline=None):
+    # One line per phase, with the ratio to the baseline run when given
+    previous = {(r['benchmark'], r['phase']): r for r in (baseline or {}).get('results', [])}
+    for result in results:
+        line = (
+            f"{result['benchmark']:<10} {result['phase']:<14} "
+            f"{result['seconds'] * 1000:10.1f} ms {result['peak_bytes'] / 1024 / 1024:10.1f} MB"
+        )
+        old = previous.get((result['benchmark'], result['phase']))
+        if old and old['seconds']:
+            line += f"  time x{result['seconds'] / old['seconds']:.2f}"
+        if old and old['peak_bytes']:
+            line += f"  memory x{result['peak_bytes'] / old['peak_bytes']:.2f}"
+        if result.get('heavy_modules'):
+            line += f"  loads {', '.join(result['heavy_modules'])}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark make_drawio_erd on synthetic metadata and CSV data.')
+    parser.add_argument('--databases', type=int, default=5, help='Number of synthetic databases (default: 5)')
+    parser.add_argument('--tables', type=int, default=100, help='Tables per database (default: 100)')
+    parser.add_argument('--columns', type=int, default=20, help='Columns per table (default: 20)')
+    parser.add_argument('--pk-ratio', type=float, default=0.9, help='Fraction of tables with a primary key (default: 0.9)')
+    parser.add_argument('--fk-ratio', type=float, default=0.1, help='Fraction of other columns that are foreign keys (default: 0.1)')
+    parser.add_argument('--data-files', type=int, default=4, help='Number of synthetic CSV data files, 0 to skip (default: 4)')
+    parser.add_argument('--data-rows', type=int, default=50000, help='Rows per CSV data file (default: 50000)')
+    parser.add_argument('--data-columns', type=int, default=10, help='Columns per CSV data file (default: 10)')
+    parser.add_argument('--sampling', choices=['head', 'reservoir', 'full-scan'], default='head', help='CSVDataParser sampling strategy (default: head)')
+    parser.add_argument('--discover-keys', action='store_true', help='Enable key discovery in CSVDataParser')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per phase; the best is reported (default: 3)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed of the synthetic inputs (default: 0)')
+    parser.add_argument('--startup-only', action='store_true', help='Only measure the import time of the command line')
+    parser.add_argument('--import-budget-ms', type=float, help='Exit with an error if importing the command line takes longer, or loads any of: ' + ', '.join(HEAVY_MODULES))
+    parser.add_argument('--output', help='Write the results as JSON to this file')
+    parser.add_argument('--compare', help='JSON results of an earlier run to compare against')
+    args = parser.parse_args()
+
+    results = run_benchmarks(args)
+    report = {
+        'commit': git_commit(),
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'python': sys.version.split()[0],
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'config': {key: value for key, value in vars(args).items() if key not in ('output', 'compare', 'import_budget_ms')},
+        'results': results,
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.import_budget_ms is not None:
+        startup = results[0]
+        if startup['heavy_modules'] or startup['seconds'] * 1000 > args.import_budget_ms:
+            print(f'Import budget of {args.import_budget_ms:.0f} ms exceeded or heavy modules loaded.', file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
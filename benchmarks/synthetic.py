@@ -0,0 +1,94 @@
+# benchmarks/synthetic.py
+
+# Synthetic inputs for the benchmarks: schema metadata in the format read by
+# MetaDataCSVParser, and CSV data files for CSVDataParser.
+
+import os
+import numpy as np
+import pandas as pd
+
+COLUMN_TYPES = ['INT', 'VARCHAR(255)', 'DECIMAL(10,2)', 'DATE', 'DATETIME', 'BOOLEAN']
+
+
+def make_metadata(
+    num_databases: int,
+    tables_per_database: int,
+    columns_per_table: int,
+    pk_ratio: float = 1.0,
+    fk_ratio: float = 0.1,
+    seed: int = 0
+) -> pd.DataFrame:
+    """Return metadata for num_databases x tables_per_database x columns_per_table columns.
+
+    pk_ratio of the tables get an 'id' primary key as their first column, and
+    fk_ratio of the remaining columns reference the primary key of another
+    table with one in the same database.
+    """
+    rng = np.random.default_rng(seed)
+    num_tables = num_databases * tables_per_database
+    num_rows = num_tables * columns_per_table
+
+    table_numbers = np.repeat(np.arange(num_tables), columns_per_table)
+    database_numbers = table_numbers // tables_per_database
+    column_orders = np.tile(np.arange(1, columns_per_table + 1), num_tables)
+
+    has_primary_key = rng.random(num_tables) < pk_ratio
+    is_primary_key = (column_orders == 1) & has_primary_key[table_numbers]
+
+    # Foreign keys point to a random table with a primary key in the same database
+    is_foreign_key = ~is_primary_key & (rng.random(num_rows) < fk_ratio)
+    offsets = rng.integers(0, tables_per_database, num_rows)
+    referenced_tables = database_numbers * tables_per_database + offsets
+    is_foreign_key &= has_primary_key[referenced_tables] & (referenced_tables != table_numbers)
+
+    databases = np.array([f'db{i}' for i in range(num_databases)], dtype=object)
+    tables = np.array([f'table{i}' for i in range(num_tables)], dtype=object)
+    column_names = np.array([f'column{i}' for i in range(1, columns_per_table + 1)], dtype=object)
+    column_names[0] = 'id'
+    types = np.array(COLUMN_TYPES, dtype=object)[rng.integers(0, len(COLUMN_TYPES), num_rows)]
+    types[is_primary_key | is_foreign_key] = 'INT'
+
+    return pd.DataFrame({
+        'Catalog': 'def',
+        'Database': databases[database_numbers],
+        'Table': tables[table_numbers],
+        'Owner': 'owner',
+        'Creation_Date': '2024-01-01',
+        'Column': column_names[column_orders - 1],
+        'Type': types,
+        'Column_Order': column_orders,
+        'Source_Table': '',
+        'Is_Primary_Key': is_primary_key.astype(int),
+        'Is_Foreign_Key': is_foreign_key.astype(int),
+        'References_Catalog': '',
+        'References_Database': '',
+        'References_Table': np.where(is_foreign_key, tables[referenced_tables], ''),
+        'References_Column': np.where(is_foreign_key, 'id', ''),
+    })
+
+
+def write_data_files(directory: str, num_files: int, rows_per_file: int, columns_per_file: int, seed: int = 0) -> list:
+    """Write CSV data files with an id key, a reference to the previous file's
+    ids and a mix of integer, decimal, date, boolean and text columns.
+    Returns the file paths."""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2000-01-01', periods=3650).strftime('%Y-%m-%d').to_numpy()
+    file_paths = []
+    for file_number in range(num_files):
+        data = {'id': np.arange(1, rows_per_file + 1)}
+        if file_number > 0:
+            data['parent_id'] = rng.integers(1, rows_per_file + 1, rows_per_file)
+        generators = [
+            lambda: rng.integers(0, 1000000, rows_per_file),
+            lambda: np.round(rng.random(rows_per_file) * 1000, 2),
+            lambda: dates[rng.integers(0, len(dates), rows_per_file)],
+            lambda: rng.choice(['true', 'false'], rows_per_file),
+            lambda: np.char.add('text', rng.integers(0, 100000, rows_per_file).astype(str)),
+        ]
+        for column_number in range(len(data), columns_per_file):
+            data[f'column{column_number}'] = generators[column_number % len(generators)]()
+
+        file_path = os.path.join(directory, f'data{file_number}.csv')
+        pd.DataFrame(data).to_csv(file_path, index=False)
+        file_paths.append(file_path)
+    return file_paths
@@ -0,0 +1,16 @@
+# make_drawio_erd/__init__.py
+
+# Generate draw.io ERD diagrams from metadata CSV files, CSV data files and
+# database schemas. ERDGenerator is imported on first use, so that importing
+# the package (e.g. for the command line) does not load pandas.
+
+__version__ = '0.1.0'
+
+__all__ = ['ERDGenerator']
+
+
+def __getattr__(name):
+    if name == 'ERDGenerator':
+        from .erd_drawio import ERDGenerator
+        return ERDGenerator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
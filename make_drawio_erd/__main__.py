@@ -0,0 +1,7 @@
+# make_drawio_erd/__main__.py
+
+# python -m make_drawio_erd <command> ...
+
+from make_drawio_erd.cli import main
+
+main()
@@ -0,0 +1,188 @@
+# make_drawio_erd/cache.py
+
+import hashlib
+import importlib.util
+import logging
+import os
+import pickle
+import pandas as pd
+from .parsers.base_parser import BaseParser
+from .schema import tables_from_dataframe
+
+# Feather needs pyarrow, which pandas imports when it is used
+CACHE_FORMAT = 'feather' if importlib.util.find_spec('pyarrow') is not None else 'pickle'
+
+# Bump when the normalized metadata produced by the parsers changes shape
+CACHE_VERSION = '2'
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+
+def default_cache_dir() -> str:
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'make_drawio_erd')
+
+
+class MetadataCache:
+    """On-disk store of parsed metadata DataFrames, keyed by source fingerprint.
+
+    Entries are written in Feather format when pyarrow is installed and as
+    pickles otherwise. When the directory grows beyond max_bytes the least
+    recently used entries are removed.
+    """
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f'{key}.{CACHE_FORMAT}')
+
+    def get(self, key: str):
+        path = self._path(key)
+        try:
+            if CACHE_FORMAT == 'feather':
+                df = pd.read_feather(path)
+            else:
+                df = pd.read_pickle(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError) as e:
+            # A truncated or unreadable entry, e.g. written by another pyarrow
+            # version, is a miss; pyarrow's ArrowInvalid is a ValueError
+            logger.warning(f'Removing unreadable cache entry {path}: {e}')
+            self._remove(path)
+            return None
+        # Record the use for least-recently-used eviction
+        os.utime(path)
+        return df
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def put(self, key: str, df: pd.DataFrame):
+        path = self._path(key)
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        df = df.reset_index(drop=True)
+        if CACHE_FORMAT == 'feather':
+            df.to_feather(temp_path)
+        else:
+            df.to_pickle(temp_path)
+        # Readers never see a partially written entry
+        os.replace(temp_path, path)
+        self.evict()
+
+    def evict(self):
+        _evict(self.cache_dir, ('.feather', '.pickle'), self.max_bytes)
+
+
+class FragmentCache:
+    """On-disk store of the serialized cells of single tables, keyed by
+    erd_drawio.fragment_key(), in the 'fragments' directory of the cache.
+
+    Like MetadataCache, entries beyond max_bytes are evicted least recently
+    used first, but only when evict() is called, once per diagram.
+    """
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = os.path.join(cache_dir or default_cache_dir(), 'fragments')
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f'{key}.xml')
+
+    def get(self, key: str):
+        path = self._path(key)
+        try:
+            with open(path, encoding='utf-8') as f:
+                fragment = f.read()
+        except FileNotFoundError:
+            return None
+        os.utime(path)
+        return fragment
+
+    def put(self, key: str, fragment: str):
+        path = self._path(key)
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(fragment)
+        os.replace(temp_path, path)
+
+    def evict(self):
+        _evict(self.cache_dir, ('.xml',), self.max_bytes)
+
+
+def _evict(cache_dir, suffixes, max_bytes):
+    # Remove the least recently used files with these suffixes until the
+    # rest take at most max_bytes
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.is_file() and entry.name.endswith(suffixes):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total_bytes = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total_bytes <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total_bytes -= size
+
+
+class CachedParser(BaseParser):
+    """Wrap a parser so parse() results are reused while the source is unchanged.
+
+    The wrapped parser's fingerprint() describes the current state of its
+    source; parsers that return None from it are never cached.
+    """
+
+    def __init__(self, parser: BaseParser, cache: MetadataCache):
+        self.parser = parser
+        self.cache = cache
+
+    def fingerprint(self, **kwargs):
+        return self.parser.fingerprint(**kwargs)
+
+    def parse(self, **kwargs) -> pd.DataFrame:
+        key = self._key(**kwargs)
+        if key is None:
+            return self.parser.parse(**kwargs)
+
+        df = self.cache.get(key)
+        if df is not None:
+            logger.info('Using cached metadata.')
+            return df
+
+        df = self.parser.parse(**kwargs)
+        self.cache.put(key, df)
+        return df
+
+    def iter_tables(self, **kwargs):
+        # A cache hit is read whole; otherwise the tables are streamed from the
+        # source, which leaves no complete frame to store
+        key = self._key(**kwargs)
+        df = self.cache.get(key) if key is not None else None
+        if df is None:
+            yield from self.parser.iter_tables(**kwargs)
+            return
+        logger.info('Using cached metadata.')
+        yield from tables_from_dataframe(df)
+
+    def _key(self, **kwargs):
+        # Cache key of the source's current state, or None when it cannot be cached
+        fingerprint = self.parser.fingerprint(**kwargs)
+        if fingerprint is None:
+            return None
+        key_source = '\n'.join([CACHE_VERSION, type(self.parser).__name__, fingerprint])
+        return hashlib.sha256(key_source.encode('utf-8')).hexdigest()
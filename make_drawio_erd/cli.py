@@ -0,0 +1,347 @@
+# make_drawio_erd/cli.py
+
+# The make-drawio-erd command, with one subcommand per kind of input:
+#
+#   make-drawio-erd metadata metadata.csv erd.drawio
+#   make-drawio-erd csvdata data/*.csv erd.drawio
+#   make-drawio-erd mysql erd.drawio --database-matching 'shop*'
+#   make-drawio-erd postgres erd.drawio --schema-matching 'public'
+#   make-drawio-erd sqlite app.db erd.drawio
+#   make-drawio-erd serve --port 8080 mysql --database-matching 'shop*'
+#
+# pandas, the parsers and database drivers are imported by the subcommand
+# that needs them, so starting the command stays fast.
+
+import argparse
+import itertools
+import logging
+import sys
+from make_drawio_erd.cli_options import (
+    add_cache_arguments, add_output_arguments, add_profile_arguments, cached, generator_options,
+    make_profiler, write_erd, write_profile
+)
+
+# Kept in sync with csv_data_parser.SAMPLING_STRATEGIES, which needs pandas
+SAMPLING_STRATEGIES = ('head', 'reservoir', 'full-scan')
+
+# Modules that must not be loaded just to start the command line
+HEAVY_MODULES = ('pandas', 'numpy', 'sqlalchemy', 'pyarrow')
+
+logger = logging.getLogger(__name__)
+
+
+def add_metadata_command(subparsers, output=True):
+    parser = subparsers.add_parser(
+        'metadata', help='Diagram the tables described in a metadata CSV file',
+        description='Generate draw.io ERD diagrams from a metadata CSV file.'
+    )
+    parser.add_argument('input_csv', help='Path to the input metadata CSV file')
+    if output:
+        parser.add_argument('output_drawio', help='Path to the output draw.io diagram file')
+    parser.add_argument('--matching', action='append', help="Unix-style glob pattern to match 'Catalog.Database.Table' names (repeatable)")
+    parser.add_argument('--exclude', action='append', help="Unix-style glob pattern of 'Catalog.Database.Table' names to leave out (repeatable)")
+    parser.add_argument('--regex', action='store_true', help='Treat --matching and --exclude patterns as regular expressions')
+    parser.set_defaults(load=load_metadata, source=metadata_source)
+    return parser
+
+
+def metadata_source(args, profiler=None):
+    # Return the parser selected by the arguments and its parse() arguments;
+    # rows of tables that do not match the patterns are dropped while the
+    # file is read, timed as the profiler's filter phase
+    from make_drawio_erd.filters import TableFilter
+    from make_drawio_erd.parsers.metadata_csv_parser import MetaDataCSVParser
+
+    table_filter = TableFilter(args.matching, args.exclude, regex=args.regex, profiler=profiler)
+    return cached(MetaDataCSVParser(args.input_csv, table_filter=table_filter), args), {}
+
+
+def load_metadata(args, profiler):
+    logger.info('Parsing the CSV file...')
+    csv_parser, _ = metadata_source(args, profiler)
+    filtered = bool(args.matching or args.exclude)
+    if args.stream:
+        tables = csv_parser.iter_tables()
+        return require_tables(tables, "No tables match the given patterns.") if filtered else tables
+    with profiler.phase('parse'):
+        df = csv_parser.parse()
+
+    if filtered and df.empty:
+        raise ValueError("No tables match the given patterns.")
+    return df
+
+
+def add_csvdata_command(subparsers, output=True):
+    parser = subparsers.add_parser(
+        'csvdata', help='Diagram CSV data files, one table per file',
+        description='Generate draw.io ERD diagram from CSV data files, one table per file.'
+    )
+    parser.add_argument('input_csv', nargs='+', help='Paths, glob patterns or directories of input CSV data files')
+    if output:
+        parser.add_argument('output_drawio', help='Path to the output draw.io diagram file')
+    else:
+        # Otherwise added with the output options
+        parser.add_argument('--jobs', type=int, default=None, help='Number of worker processes (default: number of CPUs)')
+    parser.add_argument('--sample-size', type=int, default=10000, help='Number of rows to sample for data type inference (default: 10000)')
+    parser.add_argument('--sampling', choices=SAMPLING_STRATEGIES, default='head', help="Rows used for type inference: the first --sample-size rows ('head'), a random sample of --sample-size rows from the whole file ('reservoir'), or every row ('full-scan') (default: head)")
+    parser.add_argument('--chunksize', type=int, default=100000, help='Rows read per chunk for reservoir and full-scan sampling (default: 100000)')
+    parser.add_argument('--seed', type=int, help='Random seed for reservoir sampling')
+    parser.add_argument('--discover-keys', action='store_true', help='Detect primary and foreign key candidates from the sampled rows. Foreign keys are in practice only found with --sampling full-scan: a sample of the referenced key rarely holds the sampled references')
+    parser.add_argument('--pk-threshold', type=float, default=0.99, help='Minimum estimated distinct values per row for a primary key candidate (default: 0.99)')
+    parser.add_argument('--fk-threshold', type=float, default=0.95, help="Minimum estimated share of a column's distinct values found in another file's primary key for a foreign key candidate (default: 0.95)")
+    parser.set_defaults(load=load_csvdata, source=csvdata_source)
+    return parser
+
+
+def csvdata_source(args):
+    from make_drawio_erd.parsers.csv_data_parser import CSVDataParser
+
+    parser_instance = CSVDataParser(
+        args.input_csv,
+        sample_size=args.sample_size,
+        sampling=args.sampling,
+        chunksize=args.chunksize,
+        random_seed=args.seed,
+        jobs=args.jobs,
+        discover_keys=args.discover_keys,
+        pk_threshold=args.pk_threshold,
+        fk_threshold=args.fk_threshold
+    )
+    return cached(parser_instance, args), {}
+
+
+def load_csvdata(args, profiler):
+    logger.info('Parsing the CSV data files...')
+    # Parse the CSV data files using CSVDataParser
+    parser_instance, _ = csvdata_source(args)
+    if args.stream:
+        return parser_instance.iter_tables()
+    with profiler.phase('parse'):
+        return parser_instance.parse()
+
+
+def add_mysql_command(subparsers, output=True):
+    parser = subparsers.add_parser(
+        'mysql', help='Diagram the schemas of a MySQL server',
+        description='Generate draw.io ERD diagram from a MySQL database schema. '
+                    'Connection details are read from MYSQL_* environment variables or a .env file.'
+    )
+    if output:
+        parser.add_argument('output_drawio', help='Path to the output draw.io diagram file')
+    parser.add_argument('--database-matching', action='append', help='Unix-style glob pattern to match database names (repeatable)')
+    parser.add_argument('--table-matching', action='append', help='Unix-style glob pattern to match table names (repeatable)')
+    parser.add_argument('--database-exclude', action='append', help='Unix-style glob pattern of database names to leave out (repeatable)')
+    parser.add_argument('--table-exclude', action='append', help='Unix-style glob pattern of table names to leave out (repeatable)')
+    parser.add_argument('--max-connections', type=int, default=1, help='Extract schemas concurrently over up to this many connections (default: 1, a single query)')
+    parser.set_defaults(load=load_mysql, source=mysql_source)
+    return parser
+
+
+def mysql_source(args):
+    # The database and table patterns are applied by the server as part of
+    # the query
+    from make_drawio_erd.parsers.mysql_schema_parser import MySQLSchemaParser
+
+    parser_instance = MySQLSchemaParser(max_connections=args.max_connections)
+    patterns = {
+        'include_databases': args.database_matching,
+        'exclude_databases': args.database_exclude,
+        'include_tables': args.table_matching,
+        'exclude_tables': args.table_exclude,
+    }
+    return cached(parser_instance, args), patterns
+
+
+def load_mysql(args, profiler):
+    logger.info('Parsing the MySQL database schema...')
+    # Parse the schema using MySQLSchemaParser
+    parser_instance, patterns = mysql_source(args)
+    message = "No tables match the given database and table patterns."
+    if args.stream:
+        return require_tables(parser_instance.iter_tables(**patterns), message)
+    with profiler.phase('parse'):
+        df = parser_instance.parse(**patterns)
+
+    if df.empty:
+        raise ValueError(message)
+    return df
+
+
+def add_postgres_command(subparsers, output=True):
+    parser = subparsers.add_parser(
+        'postgres', help='Diagram the schemas of a PostgreSQL database',
+        description='Generate draw.io ERD diagram from the schemas of a PostgreSQL database. '
+                    'Connection details are read from POSTGRES_* environment variables '
+                    '(HOST, PORT, USER, PASSWORD, DB) or a .env file.'
+    )
+    if output:
+        parser.add_argument('output_drawio', help='Path to the output draw.io diagram file')
+    parser.add_argument('--schema-matching', action='append', help='Unix-style glob pattern to match schema names (repeatable)')
+    parser.add_argument('--table-matching', action='append', help='Unix-style glob pattern to match table names (repeatable)')
+    parser.add_argument('--schema-exclude', action='append', help='Unix-style glob pattern of schema names to leave out (repeatable)')
+    parser.add_argument('--table-exclude', action='append', help='Unix-style glob pattern of table names to leave out (repeatable)')
+    parser.set_defaults(load=load_postgres, source=postgres_source)
+    return parser
+
+
+def postgres_source(args):
+    # The schema and table patterns are applied by the server as part of
+    # the query
+    from make_drawio_erd.parsers.postgres_schema_parser import PostgresSchemaParser
+
+    patterns = {
+        'include_schemas': args.schema_matching,
+        'exclude_schemas': args.schema_exclude,
+        'include_tables': args.table_matching,
+        'exclude_tables': args.table_exclude,
+    }
+    return cached(PostgresSchemaParser(), args), patterns
+
+
+def load_postgres(args, profiler):
+    logger.info('Parsing the PostgreSQL database schema...')
+    parser_instance, patterns = postgres_source(args)
+    message = "No tables match the given schema and table patterns."
+    if args.stream:
+        return require_tables(parser_instance.iter_tables(**patterns), message)
+    with profiler.phase('parse'):
+        df = parser_instance.parse(**patterns)
+
+    if df.empty:
+        raise ValueError(message)
+    return df
+
+
+def add_sqlite_command(subparsers, output=True):
+    parser = subparsers.add_parser(
+        'sqlite', help='Diagram the tables of a SQLite database file',
+        description='Generate draw.io ERD diagram from the tables of a SQLite database file, opened read-only.'
+    )
+    parser.add_argument('input_sqlite', help='Path to the SQLite database file')
+    if output:
+        parser.add_argument('output_drawio', help='Path to the output draw.io diagram file')
+    parser.add_argument('--database-name', help='Name shown as the database of the tables (default: the file name without extension)')
+    parser.add_argument('--table-matching', action='append', help='Unix-style glob pattern to match table names (repeatable)')
+    parser.add_argument('--table-exclude', action='append', help='Unix-style glob pattern of table names to leave out (repeatable)')
+    parser.set_defaults(load=load_sqlite, source=sqlite_source)
+    return parser
+
+
+def sqlite_source(args):
+    from make_drawio_erd.parsers.sqlite_schema_parser import SQLiteSchemaParser
+
+    patterns = {'include_tables': args.table_matching, 'exclude_tables': args.table_exclude}
+    return cached(SQLiteSchemaParser(args.input_sqlite, database=args.database_name), args), patterns
+
+
+def load_sqlite(args, profiler):
+    logger.info('Parsing the SQLite database schema...')
+    parser_instance, patterns = sqlite_source(args)
+    message = "No tables match the given table patterns."
+    if args.stream:
+        return require_tables(parser_instance.iter_tables(**patterns), message)
+    with profiler.phase('parse'):
+        df = parser_instance.parse(**patterns)
+
+    if df.empty:
+        raise ValueError(message)
+    return df
+
+
+def require_tables(tables, message):
+    # Raise ValueError(message) if an iterator of tables is empty; otherwise
+    # return an equivalent iterator
+    tables = iter(tables)
+    first = next(tables, None)
+    if first is None:
+        raise ValueError(message)
+    return itertools.chain([first], tables)
+
+
+# Subcommands that read one kind of input
+SOURCE_COMMANDS = (add_metadata_command, add_csvdata_command, add_mysql_command, add_postgres_command, add_sqlite_command)
+
+
+def add_serve_command(subparsers):
+    parser = subparsers.add_parser(
+        'serve', help='Serve diagrams of one source over HTTP',
+        description='Load the schema of one source once, refresh it when the source changes, '
+                    'and serve diagrams of the matching tables over HTTP. '
+                    'GET /erd?database=shop*&table=order*&layout=shelf returns draw.io XML '
+                    '(other parameters: match, exclude, regex, edges, render, show_types, compress); '
+                    'GET /metrics returns cache and schema statistics as JSON.'
+    )
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8080, help='Port to listen on (default: 8080)')
+    parser.add_argument('--refresh-interval', type=float, default=60, help="Seconds between checks of the source's fingerprint; the schema is reloaded when it changed, or every time for sources without one (default: 60)")
+    parser.add_argument('--render-cache-size', type=int, default=128, help='Number of rendered diagrams kept in memory (default: 128)')
+    sources = parser.add_subparsers(dest='source_command', required=True, metavar='SOURCE')
+    for add_command in SOURCE_COMMANDS:
+        source_parser = add_command(sources, output=False)
+        source_parser.add_argument('-v', '--verbose', action='store_true', help='Increase output verbosity')
+        add_cache_arguments(source_parser)
+    return parser
+
+
+def run_serve(args):
+    from make_drawio_erd.server import serve
+
+    parser_instance, parse_kwargs = args.source(args)
+    serve(
+        parser_instance, parse_kwargs,
+        host=args.host,
+        port=args.port,
+        refresh_interval=args.refresh_interval,
+        render_cache_size=args.render_cache_size
+    )
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='make-drawio-erd',
+        description='Generate draw.io ERD diagrams from metadata CSV files, CSV data files, '
+                    'or MySQL, PostgreSQL and SQLite schemas.'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True, metavar='COMMAND')
+    for add_command in SOURCE_COMMANDS:
+        command_parser = add_command(subparsers)
+        command_parser.add_argument('-v', '--verbose', action='store_true', help='Increase output verbosity')
+        command_parser.add_argument('--stream', action='store_true', help='Read and draw the tables one at a time, so memory grows with the largest table rather than the whole schema. Metadata CSV rows must be grouped by table. Paged and --update output still read every table first; parsing is timed as part of the spool stage.')
+        add_cache_arguments(command_parser)
+        add_output_arguments(command_parser)
+        add_profile_arguments(command_parser)
+    add_serve_command(subparsers)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    # Set up logging
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+
+    try:
+        if args.command == 'serve':
+            run_serve(args)
+            return
+
+        profiler = make_profiler(args)
+        df = args.load(args, profiler)
+
+        from make_drawio_erd.erd_drawio import ERDGenerator
+
+        logger.info('Generating the ERD diagram and saving it to the output file...')
+        # Stream the ERD diagram to the output file table by table
+        erd_generator = ERDGenerator(df, profiler=profiler, **generator_options(args))
+        write_erd(erd_generator, args)
+        write_profile(profiler, args)
+
+        print(f"ERD diagram has been generated and saved to {args.output_drawio}")
+
+    except Exception as e:
+        logger.error(f"An error occurred: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+# make_drawio_erd/cli_options.py
+
+# Parsing and diagram output options shared by the command line tools.
+# Modules that need pandas are imported when used, not when the options are
+# added, so that --help and argument errors stay fast.
+
+import os
+import sys
+import tempfile
+from make_drawio_erd.layout import LAYOUTS
+from make_drawio_erd.profiling import NullProfiler, PhaseProfiler
+
+
+def add_cache_arguments(parser):
+    """Add the parsed-metadata cache options to an argparse parser."""
+    parser.add_argument('--cache-dir', help='Directory of the parsed metadata cache (default: ~/.cache/make_drawio_erd)')
+    parser.add_argument('--no-cache', action='store_true', help='Always parse the source, without reading or writing the cache')
+    parser.add_argument('--cache-max-size', type=int, default=1024, help='Evict least recently used cache entries beyond this many MB (default: 1024)')
+
+
+def cached(parser_instance, args):
+    """Wrap a parser in the metadata cache selected by the cache options."""
+    if args.no_cache:
+        return parser_instance
+    from make_drawio_erd.cache import CachedParser, MetadataCache
+    cache = MetadataCache(args.cache_dir, max_bytes=args.cache_max_size * 1024 * 1024)
+    return CachedParser(parser_instance, cache)
+
+
+def add_profile_arguments(parser):
+    """Add the --profile option to an argparse parser."""
+    parser.add_argument('--profile', nargs='?', const='-', metavar='REPORT_JSON', help='Record time, peak memory and counts per stage and write them as JSON to this file (default: stderr)')
+
+
+def make_profiler(args):
+    """Return a PhaseProfiler with --profile, or a profiler that records nothing."""
+    return PhaseProfiler() if args.profile else NullProfiler()
+
+
+def write_profile(profiler, args):
+    """Write the --profile report, if one was requested."""
+    if not args.profile:
+        return
+    profiler.stop()
+    if args.profile == '-':
+        profiler.write_report(sys.stderr)
+    else:
+        with open(args.profile, 'w', encoding='utf-8') as f:
+            profiler.write_report(f)
+
+
+def add_output_arguments(parser):
+    """Add the diagram output options to an argparse parser."""
+    parser.add_argument('--layout', choices=sorted(LAYOUTS), default='row', help='Table layout: a single row, or packed shelves/skyline (default: row)')
+    parser.add_argument('--no-edges', dest='edges', action='store_false', help='Do not draw foreign key relationship edges')
+    parser.add_argument('--render', choices=['full', 'compact'], default='full', help='Draw a cell per column (full), or each table as one cell listing its columns (compact); with edges, tables they connect stay full (default: full)')
+    parser.add_argument('--show-types', action='store_true', help='List column types in compact tables')
+    parser.add_argument('--compress', action='store_true', help='Write a compressed .drawio file (mxfile with deflate+base64 diagram)')
+    parser.add_argument('--page-by', help='Write one diagram page per value of this column, e.g. Database')
+    parser.add_argument('--max-tables-per-page', type=int, help='Split pages holding more than this many tables')
+    parser.add_argument('--jobs', type=int, default=None, help='Number of worker processes (default: number of CPUs)')
+    parser.add_argument('--fragments', action='store_true', help='Render each table as an independent XML fragment in --jobs worker processes, reusing the fragments of unchanged tables from the cache (single-page output; not with --page-by, --max-tables-per-page or --update)')
+    parser.add_argument('--update', metavar='EXISTING_DRAWIO', help='Update this previously generated diagram, keeping the layout of unchanged tables (may be the output file)')
+
+
+def generator_options(args):
+    """Return the ERDGenerator keyword arguments selected by the output options."""
+    options = {'layout': args.layout, 'edges': args.edges, 'render': args.render, 'show_types': args.show_types}
+    if args.fragments:
+        if args.page_by or args.max_tables_per_page or args.update:
+            raise ValueError('--fragments only supports single-page diagrams without --update.')
+        options.update(fragments=True, jobs=args.jobs)
+        if not args.no_cache:
+            from make_drawio_erd.cache import FragmentCache
+            options['fragment_cache'] = FragmentCache(args.cache_dir, max_bytes=args.cache_max_size * 1024 * 1024)
+    return options
+
+
+def write_erd(erd_generator, args):
+    """Write the diagram to args.output_drawio according to the output options."""
+    from make_drawio_erd.drawio_file import read_drawio
+    from make_drawio_erd.update import update_drawio
+
+    existing_model = None
+    if args.update:
+        if args.page_by or args.max_tables_per_page:
+            raise ValueError('--update only supports single-page diagrams.')
+        # Read the existing diagram first: it may be the file being overwritten
+        models = read_drawio(args.update)
+        if len(models) != 1:
+            raise ValueError(f'{args.update} has {len(models)} pages; --update only supports single-page diagrams.')
+        existing_model = models[0]
+
+    # Write next to the output and replace it only once the whole diagram is
+    # written, so that an error leaves the previous diagram in place
+    output_dir = os.path.dirname(os.path.abspath(args.output_drawio))
+    f = tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=output_dir, suffix='.drawio.tmp', delete=False)
+    try:
+        with f:
+            if existing_model is not None:
+                update_drawio(erd_generator, existing_model, f, compress=args.compress)
+            elif args.page_by or args.max_tables_per_page:
+                erd_generator.write_drawio_pages(
+                    f,
+                    page_by=args.page_by,
+                    max_tables_per_page=args.max_tables_per_page,
+                    compress=args.compress,
+                    jobs=args.jobs
+                )
+            else:
+                erd_generator.write_drawio(f, compress=args.compress)
+        _copy_permissions(args.output_drawio, f.name)
+        os.replace(f.name, args.output_drawio)
+    except BaseException:
+        os.unlink(f.name)
+        raise
+    erd_generator.profiler.count('output_bytes', os.path.getsize(args.output_drawio))
+
+
+def _copy_permissions(existing_path, path):
+    # NamedTemporaryFile creates files readable only by their owner; give the
+    # new diagram the mode of the file it replaces, or the umask's default
+    try:
+        mode = os.stat(existing_path).st_mode & 0o777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+    os.chmod(path, mode)
@@ -0,0 +1,94 @@
+# make_drawio_erd/drawio_file.py
+
+import base64
+import zlib
+import xml.etree.ElementTree as ET
+from urllib.parse import quote, unquote
+
+# Characters left untouched by JavaScript's encodeURIComponent, which draw.io
+# applies to the model XML before deflating it
+_URI_SAFE_CHARS = "-_.!~*'()"
+
+
+class CompressedDiagramWriter:
+    """File-like writer that encodes diagram XML the way draw.io compresses it.
+
+    Text written to it is URI-encoded, raw-deflated and base64 encoded in a
+    streaming fashion, so the uncompressed model is never held in memory.
+    """
+
+    def __init__(self, fp):
+        self.fp = fp
+        self._compressor = zlib.compressobj(9, zlib.DEFLATED, -15)
+        self._pending = b''
+
+    def write(self, text: str):
+        encoded = quote(text, safe=_URI_SAFE_CHARS).encode('ascii')
+        self._write_base64(self._compressor.compress(encoded))
+
+    def close(self):
+        self._write_base64(self._compressor.flush())
+        # Flush the final, possibly padded, base64 group
+        self.fp.write(base64.b64encode(self._pending).decode('ascii'))
+        self._pending = b''
+
+    def _write_base64(self, data: bytes):
+        # base64 works on 3-byte groups; keep the remainder for the next write
+        data = self._pending + data
+        cut = len(data) - len(data) % 3
+        self.fp.write(base64.b64encode(data[:cut]).decode('ascii'))
+        self._pending = data[cut:]
+
+
+def write_drawio_document(fp, write_model, compress=False):
+    """Write a single-page draw.io document to a text file handle.
+
+    write_model(out) writes the <mxGraphModel> XML to `out`. With compress=True
+    the model is wrapped in <mxfile><diagram> and compressed as it is written.
+    """
+    fp.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+    if not compress:
+        write_model(fp)
+        return
+
+    fp.write('<mxfile host="make_drawio_erd">')
+    fp.write('<diagram id="page-1" name="Page-1">')
+    writer = CompressedDiagramWriter(fp)
+    write_model(writer)
+    writer.close()
+    fp.write('</diagram></mxfile>')
+
+
+def compress_diagram(xml_str: str) -> str:
+    """Encode mxGraphModel XML as the text content of a compressed <diagram>."""
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -15)
+    encoded = quote(xml_str, safe=_URI_SAFE_CHARS).encode('ascii')
+    data = compressor.compress(encoded) + compressor.flush()
+    return base64.b64encode(data).decode('ascii')
+
+
+def decompress_diagram(text: str) -> str:
+    """Decode the text content of a compressed <diagram> back to model XML."""
+    data = zlib.decompress(base64.b64decode(text.strip()), -15)
+    return unquote(data.decode('ascii'))
+
+
+def read_drawio(source) -> list:
+    """Read a draw.io file and return the mxGraphModel element of each page.
+
+    Accepts a path or a file handle. Handles bare <mxGraphModel> documents as
+    well as <mxfile> documents with compressed or inline <diagram> pages.
+    """
+    root = ET.parse(source).getroot()
+    if root.tag == 'mxGraphModel':
+        return [root]
+    if root.tag != 'mxfile':
+        raise ValueError(f"Unexpected root element '{root.tag}' in draw.io file.")
+
+    models = []
+    for diagram in root.findall('diagram'):
+        model = diagram.find('mxGraphModel')
+        if model is None:
+            model = ET.fromstring(decompress_diagram(diagram.text or ''))
+        models.append(model)
+    return models
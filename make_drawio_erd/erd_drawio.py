@@ -2,32 +2,103 @@
 
 import pandas as pd
 import xml.etree.ElementTree as ET
+import hashlib
 import html
+import io
+import itertools
+import pickle
+import tempfile
+from collections import deque
+from .drawio_file import compress_diagram, write_drawio_document
+from .layout import get_layout
+from .parallel import ordered_process_map
+from .profiling import NullProfiler
+from .schema import tables_from_dataframe
+
+# Metadata columns identifying a table, in Table record order
+TABLE_KEY_COLUMNS = ['Catalog', 'Database', 'Table']
+
+# 'full' draws a row cell per column, which edges can connect to; 'compact'
+# draws each table as a single cell with an HTML label
+RENDER_MODES = ('full', 'compact')
+
+# Height of a column line in compact tables
+COMPACT_ROW_HEIGHT = 20
+
+# Bump when the cells rendered for a table change, to invalidate cached fragments
+FRAGMENT_VERSION = '1'
+
+# Tables rendered per worker task in fragment mode
+FRAGMENT_BATCH_SIZE = 64
+
+# Fragments are rendered at this position, which _place_fragment() replaces,
+# so that moving a table does not invalidate its cached fragment
+FRAGMENT_POSITION = ('X_POSITION', 'Y_POSITION')
+FRAGMENT_GEOMETRY = 'x="X_POSITION" y="Y_POSITION"'
+
+
+def _stable_hash(*parts) -> str:
+    # Short digest of the parts, the same on every run and machine
+    return hashlib.sha1('\x1f'.join(str(part) for part in parts).encode('utf-8')).hexdigest()[:12]
+
+
+def table_cell_id(catalog, database, table_name) -> str:
+    """Cell id of a table, derived from its qualified name."""
+    return f'tbl-{_stable_hash(catalog, database, table_name)}'
+
+
+def column_cell_id(table_id, column_name, occurrence=0) -> str:
+    """Row cell id of a column; its label cells append '-key' and '-name'."""
+    row_id = f'{table_id}-{_stable_hash(column_name)}'
+    # Only repeated column names (invalid, but possible in metadata) need the suffix
+    return f'{row_id}-{occurrence}' if occurrence else row_id
 
 class ERDGenerator:
+    """Build a draw.io ERD from metadata: a DataFrame in the standardized
+    format returned by the parsers, a list of schema.Table records, or an
+    iterator of them such as BaseParser.iter_tables().
+
+    An iterator is consumed once, by the first diagram written. write_drawio()
+    streams it, holding one table at a time; the other outputs read it whole.
+    """
+
     def __init__(
         self,
-        df: pd.DataFrame,
+        df,
         table_width=550,          # Increased default table width
         between_table_width=50,  # Space between tables
         column_font_size=12,      # Font size for column names
-        title_font_size=20        # Font size for table titles
+        title_font_size=20,       # Font size for table titles
+        layout='row',             # Layout name ('row', 'shelf', 'skyline') or layout object
+        edges=True,               # Draw foreign key edges from the References_* columns
+        render='full',            # 'full' or 'compact', see RENDER_MODES
+        show_types=False,         # List column types in compact tables
+        fragments=False,          # Render tables as independent XML fragments, see _iter_table_fragments
+        jobs=None,                # Worker processes rendering fragments (default: number of CPUs)
+        fragment_cache=None,      # cache.FragmentCache reused across runs in fragment mode
+        profiler=None             # Receives stage timings and counts, see profiling.PhaseProfiler
     ):
-        self.df = df.copy()
-
-        # Fill NaN values in string columns with empty strings
-        object_cols = self.df.select_dtypes(include=['object']).columns
-        self.df[object_cols] = self.df[object_cols].fillna('')
-
-        # Ensure numeric columns are filled with appropriate default values
-        numeric_cols = ['Is_Primary_Key', 'Is_Foreign_Key', 'Column_Order']
-        for col in numeric_cols:
-            if col in self.df.columns:
-                self.df[col] = pd.to_numeric(self.df[col], errors='coerce').fillna(0).astype(int)
+        if render not in RENDER_MODES:
+            raise ValueError(f"Unknown render mode {render!r}; choose from {', '.join(RENDER_MODES)}.")
+        self.profiler = profiler or NullProfiler()
+        with self.profiler.phase('normalize'):
+            self.table_stream = None
+            if isinstance(df, pd.DataFrame):
+                self.schema = tables_from_dataframe(df)
+            elif isinstance(df, (list, tuple)):
+                self.schema = list(df)
+            else:
+                self.schema = None
+                self.table_stream = iter(df)
 
+        # Hash indexes of emitted cells, used to resolve foreign key edges:
+        # (catalog, database, table) -> table cell id and
+        # (catalog, database, table, column) -> row cell id
         self.tables = {}
         self.cells = {}
-        self.cell_id = 2  # Starting from 2 because 0 and 1 are reserved in draw.io
+        self.pending_edges = []
+        # Column keys whose row ids self.cells keeps, or None for all of them
+        self.edge_targets = None
         self.mxGraphModel = None
         self.root = None
 
@@ -36,13 +107,173 @@ class ERDGenerator:
         self.between_table_width = between_table_width
         self.column_font_size = column_font_size
         self.title_font_size = title_font_size
+        self.layout = get_layout(layout)
+        self.edges = edges
+        self.render = render
+        self.show_types = show_types
+        self.fragments = fragments
+        self.jobs = jobs
+        self.fragment_cache = fragment_cache
+        # Keys of the tables drawn with a row cell per column, see _table_sizes
+        self.full_tables = set()
 
     def generate_drawio_xml(self) -> str:
         self._initialize_xml()
         self._create_tables()
-        xml_str = ET.tostring(self.mxGraphModel, encoding='utf-8', method='xml').decode('utf-8')
+        with self.profiler.phase('serialize'):
+            xml_str = ET.tostring(self.mxGraphModel, encoding='utf-8', method='xml').decode('utf-8')
         return f'<?xml version="1.0" encoding="UTF-8"?>\n{xml_str}'
 
+    def write_drawio(self, fp, compress=False):
+        """Stream the draw.io XML to a text file handle, one table at a time.
+
+        Produces the same document as generate_drawio_xml(), but each table's
+        cells are serialized and written as soon as they are created, so the
+        full element tree is never held in memory.
+
+        With compress=True the model is wrapped in <mxfile><diagram>, the
+        format draw.io saves, using its raw-deflate + base64 encoding.
+
+        When the generator was given an iterator of tables, they are spooled to
+        a temporary file, so memory grows with the largest table rather than
+        the whole schema.
+
+        With fragments=True each table's cells are serialized on their own,
+        in a pool of `jobs` worker processes, and fragments of tables whose
+        definition is unchanged are read from the fragment cache.
+        """
+        write_drawio_document(fp, self._write_graph_model, compress)
+
+    def write_drawio_pages(self, fp, page_by='Database', max_tables_per_page=None,
+                           compress=False, jobs=None):
+        """Write one <diagram> page per group of tables inside a single mxfile.
+
+        Tables are grouped by the `page_by` column(s), any of Catalog,
+        Database and Table (None puts all tables in one group), and groups
+        larger than `max_tables_per_page` are split into several pages. Each
+        page is an independent model with its own id space.
+        Pages are rendered in a process pool of `jobs` workers and written in
+        a deterministic order: groups in order of first appearance. Foreign
+        key edges are only drawn between tables on the same page. The
+        profiler only sees the writing of pages, not their rendering.
+        """
+        fp.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        fp.write('<mxfile host="make_drawio_erd">')
+        options = self._generator_options()
+        page_names = []
+
+        def page_args():
+            for page_name, page_tables in self._iter_pages(page_by, max_tables_per_page):
+                page_names.append(page_name)
+                yield page_tables, options, compress
+
+        pages = ordered_process_map(_render_page, page_args(), jobs=jobs)
+        for page_number, page_content in enumerate(pages, start=1):
+            diagram = ET.Element('diagram', {'id': f'page-{page_number}', 'name': page_names[page_number - 1]})
+            with self.profiler.phase('write'):
+                fp.write(_open_tag(diagram))
+                fp.write(page_content)
+                fp.write('</diagram>')
+            self.profiler.count('pages')
+        fp.write('</mxfile>')
+
+    def _iter_pages(self, page_by, max_tables_per_page):
+        # Yield (page name, tables of the page) in a deterministic order
+        groups = {}
+        if page_by is None:
+            groups['Page'] = self._group_tables()
+        else:
+            page_columns = [page_by] if isinstance(page_by, str) else list(page_by)
+            unknown = [column for column in page_columns if column not in TABLE_KEY_COLUMNS]
+            if unknown:
+                raise ValueError(f"Cannot page by {', '.join(unknown)}; choose from {', '.join(TABLE_KEY_COLUMNS)}.")
+            positions = [TABLE_KEY_COLUMNS.index(column) for column in page_columns]
+            for table in self._group_tables():
+                group_name = '.'.join(table.key[i] for i in positions if table.key[i]) or 'Page'
+                groups.setdefault(group_name, []).append(table)
+
+        for group_name, group_tables in groups.items():
+            if not max_tables_per_page:
+                yield group_name, group_tables
+                continue
+
+            for start in range(0, len(group_tables), max_tables_per_page):
+                chunk_number = start // max_tables_per_page
+                page_name = group_name if chunk_number == 0 else f'{group_name} ({chunk_number + 1})'
+                yield page_name, group_tables[start:start + max_tables_per_page]
+
+    def _generator_options(self):
+        # Constructor options needed to rebuild an equivalent generator
+        return {
+            'table_width': self.table_width,
+            'between_table_width': self.between_table_width,
+            'column_font_size': self.column_font_size,
+            'title_font_size': self.title_font_size,
+            'layout': self.layout,
+            'edges': self.edges,
+            'render': self.render,
+            'show_types': self.show_types,
+        }
+
+    def _write_graph_model(self, out):
+        if self.schema is None:
+            self._write_streamed_graph_model(out)
+            return
+        self._initialize_xml()
+        tables = self._group_tables()
+        positions = self._layout_tables(tables)
+        self._write_model_cells(out, tables, positions)
+
+    def _write_streamed_graph_model(self, out):
+        # Two passes over a temporary spool of pickled tables: the first keeps
+        # only what the layout and the edges need from each table, the second
+        # renders the tables one at a time
+        self._initialize_xml()
+        keys, num_columns, references = [], [], []
+        with tempfile.TemporaryFile() as spool:
+            with self.profiler.phase('spool'):
+                for table in self.table_stream:
+                    pickle.dump(table, spool, pickle.HIGHEST_PROTOCOL)
+                    keys.append(table.key)
+                    num_columns.append(len(table.columns))
+                    references.extend(_table_references(table))
+            self.table_stream = iter(())
+
+            with self.profiler.phase('layout'):
+                self.full_tables = self._connected_tables(keys, references)
+                sizes = [self._table_size(key, count) for key, count in zip(keys, num_columns)]
+            positions = self._place_tables(sizes)
+
+            # Only the row ids of referenced columns are needed for the edges
+            self.edge_targets = {target for _, target in references}
+            spool.seek(0)
+            tables = (pickle.load(spool) for _ in keys)
+            self._write_model_cells(out, tables, positions)
+
+    def _write_model_cells(self, out, tables, positions):
+        # The reserved cells, then each table as soon as it is rendered, then the edges
+        out.write(_open_tag(self.mxGraphModel))
+        out.write('<root>')
+        for reserved_cell in self.root:
+            out.write(ET.tostring(reserved_cell, encoding='unicode'))
+        if self.fragments:
+            for fragment in self._iter_table_fragments(tables, positions):
+                with self.profiler.phase('write'):
+                    out.write(fragment)
+        else:
+            for cells in self._iter_table_cells(tables, positions):
+                self._write_cells(out, cells)
+        with self.profiler.phase('cells'):
+            edge_cells = list(self._iter_edge_cells())
+        self._write_cells(out, edge_cells)
+        out.write('</root></mxGraphModel>')
+
+    def _write_cells(self, out, cells):
+        with self.profiler.phase('serialize'):
+            xml_str = ''.join(ET.tostring(cell, encoding='unicode') for cell in cells)
+        with self.profiler.phase('write'):
+            out.write(xml_str)
+
     def _initialize_xml(self):
         # Initialize mxGraphModel with default attributes
         self.mxGraphModel = ET.Element('mxGraphModel', {
@@ -70,162 +301,399 @@ class ERDGenerator:
 
         self.root = root
 
-    # In make_drawio_erd/erd_drawio.py
-
-    # ... (rest of the class)
-
     def _create_tables(self):
-        # Get unique combinations of Catalog, Database, and Table
-        tables = self.df[['Catalog', 'Database', 'Table']].drop_duplicates()
-        num_tables = len(tables)
-        x_offset = 80  # Start with some offset
-        y_offset = 40
-        x_step = self.table_width + self.between_table_width  # Width of each table plus spacing
-
-        # Calculate total diagram width
-        total_width = x_offset + (x_step * num_tables)
-
-        # Update diagram width attributes
+        tables = self._group_tables()
+        positions = self._layout_tables(tables)
+        for cells in self._iter_table_cells(tables, positions):
+            self.root.extend(cells)
+        self.root.extend(self._iter_edge_cells())
+
+    def _group_tables(self):
+        # Tables in order of first appearance, each with its sorted columns
+        if self.schema is None:
+            self.schema = list(self.table_stream)
+        return self.schema
+
+    def _layout_tables(self, tables):
+        with self.profiler.phase('layout'):
+            sizes = self._table_sizes(tables)
+        return self._place_tables(sizes)
+
+    def _place_tables(self, sizes):
+        # Place every table and size the page to the resulting bounding box
+        with self.profiler.phase('layout'):
+            positions, (total_width, total_height) = self.layout.place(sizes, self.between_table_width)
+
+        # Update diagram size attributes
         self.mxGraphModel.set('dx', str(total_width))
         self.mxGraphModel.set('pageWidth', str(total_width + 100))  # Add some margin
+        self.mxGraphModel.set('pageHeight', str(max(1100, total_height + 100)))
+        return positions
+
+    def _table_sizes(self, tables):
+        # (width, height) of each table; also decides which tables are
+        # drawn in full
+        references = [reference for table in tables for reference in _table_references(table)]
+        self.full_tables = self._connected_tables([table.key for table in tables], references)
+        return [self._table_size(table.key, len(table.columns)) for table in tables]
+
+    def _table_size(self, key, num_columns):
+        row_height = 30 if key in self.full_tables else COMPACT_ROW_HEIGHT
+        return (self.table_width, self._table_height(num_columns, row_height))
+
+    def _connected_tables(self, keys, references):
+        # Keys of the tables drawn in full: all of them, or in compact mode the
+        # ends of foreign key edges, whose rows the edges connect. `references`
+        # holds (table key, referenced column key) pairs.
+        keys = set(keys)
+        if self.render == 'full':
+            return keys
+        connected = set()
+        if self.edges:
+            for key, target in references:
+                if target[:3] in keys:
+                    connected.add(key)
+                    connected.add(target[:3])
+        return connected
+
+    @staticmethod
+    def _table_height(num_columns, row_height=30):
+        return 30 + num_columns * row_height  # Header + rows
+
+    @staticmethod
+    def _key_marker(column, is_foreign_key=False):
+        # 'PK', 'FK' or '' for a column
+        if column.is_primary_key:
+            return 'PK'
+        if column.is_foreign_key or is_foreign_key:
+            return 'FK'
+        return ''
+
+    def _iter_table_cells(self, tables, positions):
+        # Yield the top-level mxCell elements of one table at a time
+        for table, position in zip(tables, positions):
+            with self.profiler.phase('cells'):
+                self._register_table(table)
+                cells = self._create_table_cells(table, position)
+            yield cells
+
+    def _iter_table_fragments(self, tables, positions):
+        # Yield the serialized cells of one table at a time, in table order.
+        # Batches of tables are rendered in worker processes; tables found in
+        # the fragment cache are left out of their batch, and batches found
+        # whole are not sent to the pool.
+        options = self._fragment_options()
+        cache = self.fragment_cache
+        batches = deque()
+
+        def batch_args():
+            table_positions = zip(tables, positions)
+            while True:
+                batch = list(itertools.islice(table_positions, FRAGMENT_BATCH_SIZE))
+                if not batch:
+                    return
+                entries = []
+                missing = []
+                with self.profiler.phase('cells'):
+                    for table, position in batch:
+                        self._register_table(table)
+                        full = table.key in self.full_tables
+                        self._count_table(table, full)
+                        key = fragment_key(table, full, options) if cache is not None else None
+                        fragment = cache.get(key) if key is not None else None
+                        if fragment is None:
+                            missing.append((table, full))
+                        entries.append((fragment, key, position))
+                batches.append(entries)
+                yield (missing, options) if missing else None
+
+        for rendered in ordered_process_map(_render_fragments, batch_args(), jobs=self.jobs):
+            rendered = iter(rendered or ())
+            for fragment, key, position in batches.popleft():
+                if fragment is None:
+                    fragment = next(rendered)
+                    if cache is not None:
+                        cache.put(key, fragment)
+                    self.profiler.count('fragments_rendered')
+                else:
+                    self.profiler.count('fragments_cached')
+                yield _place_fragment(fragment, position)
+        if cache is not None:
+            cache.evict()
+
+    def _count_table(self, table, full):
+        # Profiler counts of a table, as _create_table_cells() records them
+        num_columns = len(table.columns)
+        self.profiler.count('tables')
+        self.profiler.count('columns', num_columns)
+        # A full table has a row and two label cells per column
+        self.profiler.count('cells', 1 + 3 * num_columns if full else 1)
+
+    def _fragment_options(self):
+        # Constructor options that affect the cells of a table, but not its position
+        return {
+            'table_width': self.table_width,
+            'column_font_size': self.column_font_size,
+            'title_font_size': self.title_font_size,
+            'edges': self.edges,
+            'render': self.render,
+            'show_types': self.show_types,
+        }
+
+    def _register_table(self, table):
+        # Record the cell ids that foreign key edges need: the table's, and for
+        # tables drawn in full each column's row and foreign key
+        if not self.edges:
+            return
+        table_id = table_cell_id(*table.key)
+        self.tables[table.key] = table_id
+        if table.key not in self.full_tables:
+            return
+        column_occurrences = {}
+        for column in table.columns:
+            occurrence = column_occurrences.get(column.name, 0)
+            column_occurrences[column.name] = occurrence + 1
+            row_id = column_cell_id(table_id, column.name, occurrence)
+            column_key = table.key + (column.name,)
+            if self.edge_targets is None or column_key in self.edge_targets:
+                self.cells[column_key] = row_id
+            if column.references:
+                self.pending_edges.append((row_id, column.references))
+
+    def _create_table_cells(self, table, position):
+        # Return the table cell followed by its row and label cells
+        if table.key not in self.full_tables:
+            return self._create_compact_table_cells(table, position)
+        x_offset, y_offset = position
+        cells = []
+
+        table_id = table_cell_id(*table.key)
+        num_columns = len(table.columns)
+
+        # Table height adjustments
+        row_height = 30
+        table_height = self._table_height(num_columns, row_height)
+
+        # Create table cell (shape=table)
+        table_cell = ET.Element('mxCell', {
+            'id': table_id,
+            'value': f'<span style="text-wrap: nowrap;">{html.escape(table.full_name)}</span>',
+            'style': f'shape=table;startSize=30;container=1;collapsible=1;childLayout=tableLayout;'
+                    f'fixedRows=1;rowLines=0;fontStyle=1;align=center;resizeLast=1;html=1;whiteSpace=wrap;'
+                    f'fontSize={self.title_font_size};',
+            'vertex': '1',
+            'parent': '1'
+        })
+        table_geometry = ET.SubElement(table_cell, 'mxGeometry', {
+            'x': str(x_offset),
+            'y': str(y_offset),
+            'width': str(self.table_width),
+            'height': str(table_height),
+            'as': 'geometry'
+        })
+        cells.append(table_cell)
 
-        for idx, table_row in tables.iterrows():
-            catalog = table_row['Catalog']
-            database = table_row['Database']
-            table_name = table_row['Table']
 
-            # If Catalog and Database are empty, use only the Table name
-            if not catalog and not database:
-                full_table_name = table_name
-            else:
-                # Construct full_table_name based on available fields
-                name_parts = [part for part in [catalog, database, table_name] if part]
-                full_table_name = '.'.join(name_parts)
-
-            table_id = str(self.cell_id)
-            self.cell_id += 1
-
-            # Get columns for the table
-            columns_df = self.df[
-                (self.df['Catalog'] == catalog) &
-                (self.df['Database'] == database) &
-                (self.df['Table'] == table_name)
-            ].sort_values('Column_Order')
-
-            num_columns = len(columns_df)
-
-            # Table height adjustments
-            row_height = 30
-            table_height = 30 + num_columns * row_height  # Header + rows
-
-            # Create table cell (shape=table)
-            table_cell = ET.SubElement(self.root, 'mxCell', {
-                'id': table_id,
-                'value': f'<span style="text-wrap: nowrap;">{html.escape(full_table_name)}</span>',
-                'style': f'shape=table;startSize=30;container=1;collapsible=1;childLayout=tableLayout;'
-                        f'fixedRows=1;rowLines=0;fontStyle=1;align=center;resizeLast=1;html=1;whiteSpace=wrap;'
-                        f'fontSize={self.title_font_size};',
+        y_position = 30  # Start position for rows (after header)
+        column_occurrences = {}
+
+        # Create rows for each column
+        for column in table.columns:
+            occurrence = column_occurrences.get(column.name, 0)
+            column_occurrences[column.name] = occurrence + 1
+            row_id = column_cell_id(table_id, column.name, occurrence)
+
+            # Determine PK/FK indicator
+            pk_fk_value = self._key_marker(column, self.edges and column.references)
+
+            # Create row cell
+            row_cell = ET.Element('mxCell', {
+                'id': row_id,
+                'value': '',
+                'style': 'shape=tableRow;horizontal=0;startSize=0;swimlaneHead=0;swimlaneBody=0;'
+                         'fillColor=none;collapsible=0;dropTarget=0;points=[[0,0.5],[1,0.5]];'
+                         'portConstraint=eastwest;top=0;left=0;right=0;bottom=0;html=1;',
                 'vertex': '1',
-                'parent': '1'
+                'parent': table_id
             })
-            table_geometry = ET.SubElement(table_cell, 'mxGeometry', {
-                'x': str(x_offset),
-                'y': str(y_offset),
+            row_geometry = ET.SubElement(row_cell, 'mxGeometry', {
+                'y': str(y_position),
                 'width': str(self.table_width),
-                'height': str(table_height),
+                'height': str(row_height),
                 'as': 'geometry'
             })
+            cells.append(row_cell)
 
+            # PK/FK indicator cell
+            indicator_id = f'{row_id}-key'
+
+            indicator_cell = ET.Element('mxCell', {
+                'id': indicator_id,
+                'value': pk_fk_value,
+                'style': 'shape=partialRectangle;connectable=0;fillColor=none;top=0;left=0;'
+                         'bottom=0;right=0;fontStyle=1;overflow=hidden;html=1;whiteSpace=wrap;',
+                'vertex': '1',
+                'parent': row_id
+            })
+            indicator_geometry = ET.SubElement(indicator_cell, 'mxGeometry', {
+                'width': '60',
+                'height': str(row_height),
+                'as': 'geometry'
+            })
+            ET.SubElement(indicator_geometry, 'mxRectangle', {
+                'width': '60',
+                'height': str(row_height),
+                'as': 'alternateBounds'
+            })
+            cells.append(indicator_cell)
 
-            y_position = 30  # Start position for rows (after header)
-
-            # Create rows for each column
-            for idx2, row in columns_df.iterrows():
-                row_id = str(self.cell_id)
-                self.cell_id += 1
-
-                # Determine PK/FK indicator
-                is_primary_key = int(row.get('Is_Primary_Key', 0) or 0) == 1
-                is_foreign_key = int(row.get('Is_Foreign_Key', 0) or 0) == 1
-
-                pk_fk_value = ''
-                if is_primary_key:
-                    pk_fk_value = 'PK'
-                elif is_foreign_key:
-                    pk_fk_value = 'FK'
-
-                # Create row cell
-                row_cell = ET.SubElement(self.root, 'mxCell', {
-                    'id': row_id,
-                    'value': '',
-                    'style': 'shape=tableRow;horizontal=0;startSize=0;swimlaneHead=0;swimlaneBody=0;'
-                             'fillColor=none;collapsible=0;dropTarget=0;points=[[0,0.5],[1,0.5]];'
-                             'portConstraint=eastwest;top=0;left=0;right=0;bottom=0;html=1;',
-                    'vertex': '1',
-                    'parent': table_id
-                })
-                row_geometry = ET.SubElement(row_cell, 'mxGeometry', {
-                    'y': str(y_position),
-                    'width': str(self.table_width),
-                    'height': str(row_height),
-                    'as': 'geometry'
-                })
-
-                # PK/FK indicator cell
-                indicator_id = str(self.cell_id)
-                self.cell_id += 1
-
-                indicator_cell = ET.SubElement(self.root, 'mxCell', {
-                    'id': indicator_id,
-                    'value': pk_fk_value,
-                    'style': 'shape=partialRectangle;connectable=0;fillColor=none;top=0;left=0;'
-                             'bottom=0;right=0;fontStyle=1;overflow=hidden;html=1;whiteSpace=wrap;',
-                    'vertex': '1',
-                    'parent': row_id
-                })
-                indicator_geometry = ET.SubElement(indicator_cell, 'mxGeometry', {
-                    'width': '60',
-                    'height': str(row_height),
-                    'as': 'geometry'
-                })
-                ET.SubElement(indicator_geometry, 'mxRectangle', {
-                    'width': '60',
-                    'height': str(row_height),
-                    'as': 'alternateBounds'
-                })
-
-                # Column name cell
-                column_id = str(self.cell_id)
-                self.cell_id += 1
-
-                column_name = row['Column']
-                data_type = row.get('Type', '')
-                column_display = f"{column_name}"  # Optionally include data type
-
-                column_cell = ET.SubElement(self.root, 'mxCell', {
-                    'id': column_id,
-                    'value': html.escape(column_display),
-                    'style': f'shape=partialRectangle;connectable=0;fillColor=none;top=0;left=0;'
-                             f'bottom=0;right=0;align=left;spacingLeft=6;fontStyle=5;overflow=hidden;'
-                             f'html=1;whiteSpace=wrap;fontSize={self.column_font_size};',
-                    'vertex': '1',
-                    'parent': row_id
-                })
-                column_geometry = ET.SubElement(column_cell, 'mxGeometry', {
-                    'x': '60',
-                    'width': str(self.table_width - 60),
-                    'height': str(row_height),
-                    'as': 'geometry'
-                })
-                ET.SubElement(column_geometry, 'mxRectangle', {
-                    'width': str(self.table_width - 60),
-                    'height': str(row_height),
-                    'as': 'alternateBounds'
-                })
-
-                y_position += row_height  # Move to the next row position
-
-            # Update x_offset for the next table
-            x_offset += x_step
-
-    # Relationships are omitted as per your request
+            # Column name cell
+            column_id = f'{row_id}-name'
+
+            column_display = f"{column.name}"  # Optionally include column.type
+
+            column_cell = ET.Element('mxCell', {
+                'id': column_id,
+                'value': html.escape(column_display),
+                'style': f'shape=partialRectangle;connectable=0;fillColor=none;top=0;left=0;'
+                         f'bottom=0;right=0;align=left;spacingLeft=6;fontStyle=5;overflow=hidden;'
+                         f'html=1;whiteSpace=wrap;fontSize={self.column_font_size};',
+                'vertex': '1',
+                'parent': row_id
+            })
+            column_geometry = ET.SubElement(column_cell, 'mxGeometry', {
+                'x': '60',
+                'width': str(self.table_width - 60),
+                'height': str(row_height),
+                'as': 'geometry'
+            })
+            ET.SubElement(column_geometry, 'mxRectangle', {
+                'width': str(self.table_width - 60),
+                'height': str(row_height),
+                'as': 'alternateBounds'
+            })
+            cells.append(column_cell)
+
+            y_position += row_height  # Move to the next row position
+
+        self.profiler.count('tables')
+        self.profiler.count('columns', num_columns)
+        self.profiler.count('cells', len(cells))
+        return cells
+
+    def _create_compact_table_cells(self, table, position):
+        # Return a single cell whose HTML label lists the columns. Edges can
+        # only attach to the whole table, which is why tables at the ends of
+        # edges are drawn in full.
+        x_offset, y_offset = position
+        table_id = table_cell_id(*table.key)
+        lines = []
+        for column in table.columns:
+            marker = self._key_marker(column, self.edges and column.references)
+            line = f'<b>{marker}</b>&nbsp;' if marker else ''
+            line += html.escape(column.name)
+            if self.show_types and column.type:
+                line += f'&nbsp;<i style="color:#808080;">{html.escape(column.type)}</i>'
+            lines.append(line)
+        label = (
+            f'<div style="text-align:center;font-weight:bold;font-size:{self.title_font_size}px;">'
+            f'{html.escape(table.full_name)}</div><hr size="1"/>'
+            f'<div style="padding-left:6px;">{"<br/>".join(lines)}</div>'
+        )
+
+        table_cell = ET.Element('mxCell', {
+            'id': table_id,
+            'value': label,
+            'style': f'verticalAlign=top;align=left;overflow=fill;html=1;whiteSpace=nowrap;'
+                     f'fontSize={self.column_font_size};',
+            'vertex': '1',
+            'parent': '1'
+        })
+        ET.SubElement(table_cell, 'mxGeometry', {
+            'x': str(x_offset),
+            'y': str(y_offset),
+            'width': str(self.table_width),
+            'height': str(self._table_height(len(table.columns), COMPACT_ROW_HEIGHT)),
+            'as': 'geometry'
+        })
+
+        self.profiler.count('tables')
+        self.profiler.count('columns', len(table.columns))
+        self.profiler.count('cells')
+        return [table_cell]
+
+    def _iter_edge_cells(self):
+        # Resolve foreign keys recorded while creating the tables. References
+        # to columns that are not in the diagram fall back to the table cell,
+        # references to tables that are not in the diagram are skipped.
+        for source_id, target_key in self.pending_edges:
+            target_id = self.cells.get(target_key) or self.tables.get(target_key[:3])
+            if target_id is None:
+                continue
+
+            # A column has at most one reference, so its row id names the edge
+            edge_id = f'fk-{source_id}'
+
+            edge_cell = ET.Element('mxCell', {
+                'id': edge_id,
+                'value': '',
+                'style': 'edgeStyle=entityRelationEdgeStyle;fontSize=12;html=1;endArrow=ERmandOne;'
+                         'startArrow=ERmany;rounded=0;',
+                'edge': '1',
+                'parent': '1',
+                'source': source_id,
+                'target': target_id
+            })
+            ET.SubElement(edge_cell, 'mxGeometry', {'relative': '1', 'as': 'geometry'})
+            self.profiler.count('edges')
+            self.profiler.count('cells')
+            yield edge_cell
+        self.pending_edges = []
+
+
+def fragment_key(table, full, options) -> str:
+    """Fragment cache key of a table: a hash of its definition, whether it is
+    drawn in full, and the render options."""
+    columns = [
+        (column.name, column.type, column.order, column.is_primary_key, column.is_foreign_key, column.references)
+        for column in table.columns
+    ]
+    definition = (FRAGMENT_VERSION, sorted(options.items()), full, table.key, columns)
+    return hashlib.sha256(repr(definition).encode('utf-8')).hexdigest()
+
+
+def _render_fragments(tables, options):
+    # Serialize the cells of (table, drawn in full) pairs in a worker process
+    generator = ERDGenerator([], **options)
+    fragments = []
+    for table, full in tables:
+        generator.full_tables = {table.key} if full else set()
+        cells = generator._create_table_cells(table, FRAGMENT_POSITION)
+        fragments.append(''.join(ET.tostring(cell, encoding='unicode') for cell in cells))
+    return fragments
+
+
+def _place_fragment(fragment, position) -> str:
+    # The table cell's geometry is the first one in its fragment
+    x_offset, y_offset = position
+    return fragment.replace(FRAGMENT_GEOMETRY, f'x="{x_offset}" y="{y_offset}"', 1)
+
+
+def _table_references(table):
+    # (table key, referenced column key) of each foreign key of a table
+    return [(table.key, column.references) for column in table.columns if column.references]
+
+
+def _render_page(page_tables, options, compress):
+    # Render one page's model in a worker process
+    out = io.StringIO()
+    ERDGenerator(page_tables, **options)._write_graph_model(out)
+    xml_str = out.getvalue()
+    return compress_diagram(xml_str) if compress else xml_str
+
+
+def _open_tag(element) -> str:
+    # Serialize only the opening tag of an element, with ET's attribute escaping
+    shallow = ET.Element(element.tag, element.attrib)
+    xml_str = ET.tostring(shallow, encoding='unicode', short_empty_elements=False)
+    return xml_str[:-len(f'</{element.tag}>')]
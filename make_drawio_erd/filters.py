@@ -0,0 +1,152 @@
+# make_drawio_erd/filters.py
+
+# Include/exclude filtering of tables by name, with Unix-style globs or
+# regular expressions. All patterns of a filter are compiled into a single
+# regular expression, which is matched once per distinct table.
+
+import re
+import pandas as pd
+from .profiling import NullProfiler
+
+# Escape character for LIKE patterns; '!' behaves the same on every server,
+# unlike the backslash
+LIKE_ESCAPE = '!'
+
+
+def glob_to_like(pattern: str) -> str:
+    """Translate a glob without character classes into a SQL LIKE pattern."""
+    escaped = ''.join(LIKE_ESCAPE + char if char in ('%', '_', LIKE_ESCAPE) else char for char in pattern)
+    return escaped.replace('*', '%').replace('?', '_')
+
+
+def glob_to_regexp(pattern: str) -> str:
+    """Translate a glob, including [...] classes, into an anchored regular
+    expression that both Python and MySQL's REGEXP accept."""
+    parts = ['^']
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '*':
+            parts.append('.*')
+        elif char == '?':
+            parts.append('.')
+        elif char == '[' and ']' in pattern[i + 2:]:
+            end = pattern.index(']', i + 2)
+            char_class = pattern[i + 1:end]
+            if char_class.startswith('!'):
+                char_class = '^' + char_class[1:]
+            parts.append(f'[{char_class}]')
+            i = end
+        else:
+            parts.append(re.escape(char))
+        i += 1
+    parts.append('$')
+    return ''.join(parts)
+
+
+def sql_pattern_predicates(column, patterns, name, params, negate=False, regexp_operator='REGEXP') -> str:
+    """Build "AND (col LIKE :p0 OR col REGEXP :p1 ...)" for globs, filling in
+    params. Globs with [...] classes need the server's regular expression
+    operator, e.g. '~' for PostgreSQL."""
+    if not patterns:
+        return ''
+    if isinstance(patterns, str):
+        patterns = [patterns]
+
+    conditions = []
+    for i, pattern in enumerate(patterns):
+        param = f'{name}_{i}'
+        if '[' in pattern:
+            conditions.append(f'{column} {regexp_operator} :{param}')
+            params[param] = glob_to_regexp(pattern)
+        else:
+            conditions.append(f"{column} LIKE :{param} ESCAPE '{LIKE_ESCAPE}'")
+            params[param] = glob_to_like(pattern)
+    combined = ' OR '.join(conditions)
+    return f"\n                    AND {'NOT ' if negate else ''}({combined})"
+
+
+def compile_patterns(patterns, regex: bool = False):
+    """Compile globs (or regular expressions) into one expression that matches
+    a whole name when any of them does, or None when there are no patterns."""
+    if not patterns:
+        return None
+    if isinstance(patterns, str):
+        patterns = [patterns]
+    if regex:
+        alternatives = [f'(?:{pattern})' for pattern in patterns]
+    else:
+        alternatives = [glob_to_regexp(pattern)[1:-1] for pattern in patterns]
+    # DOTALL is set inline, so that the pattern's source carries it
+    return re.compile(f"(?s)(?:{'|'.join(alternatives)})\\Z")
+
+
+class TableFilter:
+    """Keep tables whose qualified name 'Catalog.Database.Table' matches any
+    include pattern (all tables when there are none) and no exclude pattern.
+
+    Patterns are globs, or regular expressions with regex=True; either way
+    they must match the whole name. apply() is timed as the 'filter' phase
+    of `profiler`.
+    """
+
+    def __init__(self, include=None, exclude=None, regex: bool = False, profiler=None):
+        self.include = [include] if isinstance(include, str) else list(include or [])
+        self.exclude = [exclude] if isinstance(exclude, str) else list(exclude or [])
+        self.regex = regex
+        self.profiler = profiler or NullProfiler()
+        self._include = compile_patterns(self.include, regex)
+        self._exclude = compile_patterns(self.exclude, regex)
+
+    def __bool__(self):
+        return bool(self.include or self.exclude)
+
+    def __repr__(self):
+        return f'TableFilter(include={self.include!r}, exclude={self.exclude!r}, regex={self.regex!r})'
+
+    def match_names(self, names: pd.Series) -> pd.Series:
+        """Return a boolean Series: whether each name passes the filter."""
+        keep = pd.Series(True, index=names.index)
+        if self._include is not None:
+            keep &= _match_names(names, self._include)
+        if self._exclude is not None:
+            keep &= ~_match_names(names, self._exclude)
+        return keep
+
+    def match(self, name: str) -> bool:
+        """Return whether one name passes the filter."""
+        if self._include is not None and not self._include.match(name):
+            return False
+        return self._exclude is None or not self._exclude.match(name)
+
+    def filter_tables(self, tables) -> list:
+        """Return the schema.Table records whose name passes the filter."""
+        return [table for table in tables if self.match('.'.join(table.key))]
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Return the rows of metadata in the standardized format whose table
+        passes the filter. The caller's DataFrame is not modified."""
+        if not self or df.empty:
+            return df
+        with self.profiler.phase('filter'):
+            return self._apply(df)
+
+    def _apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        key_columns = [column for column in ('Catalog', 'Database', 'Table') if column in df.columns]
+        # Match each distinct table once, then map the result back to the rows
+        table_numbers = df.groupby(key_columns, sort=False, dropna=False, observed=True).ngroup().to_numpy()
+        tables = df[key_columns].drop_duplicates()
+        parts = [
+            tables[column].astype(object).fillna('').astype(str) if column in tables.columns else ''
+            for column in ('Catalog', 'Database', 'Table')
+        ]
+        names = parts[0] + '.' + parts[1] + '.' + parts[2]
+        keep = self.match_names(names).to_numpy()
+        return df[keep[table_numbers]]
+
+
+def _match_names(names: pd.Series, pattern) -> pd.Series:
+    # Series.str.match() takes the source of the compiled pattern: pandas 3
+    # rejects compiled patterns with flags. Object dtype keeps Python's re
+    # semantics, where pyarrow strings would use RE2.
+    return names.astype(object).str.match(pattern.pattern).astype(bool)
@@ -0,0 +1,101 @@
+# make_drawio_erd/layout.py
+
+import heapq
+import math
+
+# Margin between the page origin and the first table
+X_OFFSET = 80
+Y_OFFSET = 40
+
+
+class RowLayout:
+    """Place all tables left to right on a single row."""
+
+    def place(self, sizes, spacing):
+        """Return ([(x, y) per table], (width, height)) for (width, height) sizes."""
+        positions = []
+        x_offset = X_OFFSET
+        max_height = 0
+        for width, height in sizes:
+            positions.append((x_offset, Y_OFFSET))
+            x_offset += width + spacing
+            max_height = max(max_height, height)
+        return positions, (x_offset, Y_OFFSET + max_height)
+
+
+class ShelfLayout:
+    """Pack tables into shelves of a near-square area, tallest tables first."""
+
+    def place(self, sizes, spacing):
+        positions = [None] * len(sizes)
+        if not sizes:
+            return positions, (X_OFFSET, Y_OFFSET)
+
+        shelf_width = _target_width(sizes, spacing)
+        order = sorted(range(len(sizes)), key=lambda i: -sizes[i][1])
+
+        x_offset, y_offset = X_OFFSET, Y_OFFSET
+        shelf_height = 0
+        max_x = X_OFFSET
+        for i in order:
+            width, height = sizes[i]
+            # Start a new shelf when the table does not fit on the current one
+            if x_offset > X_OFFSET and x_offset - X_OFFSET + width > shelf_width:
+                x_offset = X_OFFSET
+                y_offset += shelf_height + spacing
+                shelf_height = 0
+            positions[i] = (x_offset, y_offset)
+            x_offset += width + spacing
+            shelf_height = max(shelf_height, height)
+            max_x = max(max_x, x_offset)
+        return positions, (max_x, y_offset + shelf_height)
+
+
+class SkylineLayout:
+    """Drop each table, tallest first, into the currently lowest column.
+
+    Tables share a single width, so the skyline reduces to fixed-width
+    columns kept in a heap by their current height.
+    """
+
+    def place(self, sizes, spacing):
+        positions = [None] * len(sizes)
+        if not sizes:
+            return positions, (X_OFFSET, Y_OFFSET)
+
+        column_width = max(width for width, _ in sizes) + spacing
+        num_columns = max(1, min(len(sizes), round(_target_width(sizes, spacing) / column_width)))
+        skyline = [(Y_OFFSET, column) for column in range(num_columns)]
+        order = sorted(range(len(sizes)), key=lambda i: -sizes[i][1])
+
+        for i in order:
+            y_offset, column = heapq.heappop(skyline)
+            positions[i] = (X_OFFSET + column * column_width, y_offset)
+            heapq.heappush(skyline, (y_offset + sizes[i][1] + spacing, column))
+
+        max_y = max(y_offset for y_offset, _ in skyline) - spacing
+        return positions, (X_OFFSET + num_columns * column_width, max_y)
+
+
+LAYOUTS = {
+    'row': RowLayout,
+    'shelf': ShelfLayout,
+    'skyline': SkylineLayout,
+}
+
+
+def get_layout(layout):
+    """Return a layout instance from a layout name or an existing instance."""
+    if isinstance(layout, str):
+        try:
+            return LAYOUTS[layout]()
+        except KeyError:
+            raise ValueError(f"Unknown layout '{layout}'. Choose from: {', '.join(LAYOUTS)}.")
+    return layout
+
+
+def _target_width(sizes, spacing):
+    # Side of a square holding the total area of all tables and their spacing
+    total_area = sum((width + spacing) * (height + spacing) for width, height in sizes)
+    widest = max(width for width, _ in sizes)
+    return max(widest, math.sqrt(total_area))
@@ -0,0 +1,35 @@
+# make_drawio_erd/parallel.py
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+
+def ordered_process_map(func, arg_tuples, jobs=None):
+    """Yield func(*args) for each tuple in arg_tuples, in input order.
+
+    Work runs in a process pool of `jobs` workers (default: CPU count). Only a
+    bounded window of tasks is in flight, so results are consumed as they
+    complete instead of accumulating. With jobs=1 everything runs in-process.
+
+    None in place of an argument tuple submits no task and yields None in
+    its place.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1:
+        for args in arg_tuples:
+            yield func(*args) if args is not None else None
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending = deque()
+        for args in arg_tuples:
+            pending.append(executor.submit(func, *args) if args is not None else None)
+            if len(pending) >= jobs * 2:
+                yield _result(pending.popleft())
+        while pending:
+            yield _result(pending.popleft())
+
+
+def _result(future):
+    return future.result() if future is not None else None
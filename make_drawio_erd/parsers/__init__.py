@@ -1,7 +1,24 @@
 # make_drawio_erd/parsers/__init__.py
 
-from .base_parser import BaseParser
-from .metadata_csv_parser import MetaDataCSVParser
-from .csv_data_parser import CSVDataParser
-from .mysql_schema_parser import MySQLSchemaParser  # Include the new parser
+# Parsers are imported on first use, so that e.g. a CSV-only run does not
+# load SQLAlchemy for MySQLSchemaParser.
 
+import importlib
+
+_PARSER_MODULES = {
+    'BaseParser': '.base_parser',
+    'MetaDataCSVParser': '.metadata_csv_parser',
+    'CSVDataParser': '.csv_data_parser',
+    'MySQLSchemaParser': '.mysql_schema_parser',
+    'PostgresSchemaParser': '.postgres_schema_parser',
+    'SQLiteSchemaParser': '.sqlite_schema_parser',
+}
+
+__all__ = list(_PARSER_MODULES)
+
+
+def __getattr__(name):
+    if name not in _PARSER_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(_PARSER_MODULES[name], __name__)
+    return getattr(module, name)
@@ -1,10 +1,37 @@
 # erd_generator/parsers/base_parser.py
 
 from abc import ABC, abstractmethod
+import os
 import pandas as pd
+from ..schema import tables_from_dataframe
 
 class BaseParser(ABC):
     @abstractmethod
     def parse(self) -> pd.DataFrame:
         """Parse data and return a standardized DataFrame."""
-        pass
\ No newline at end of file
+        pass
+
+    def parse_tables(self, **parse_kwargs) -> list:
+        """Parse data and return schema.Table records, which ERDGenerator
+        accepts in place of the DataFrame."""
+        return tables_from_dataframe(self.parse(**parse_kwargs))
+
+    def iter_tables(self, **parse_kwargs):
+        """Yield schema.Table records one at a time, which ERDGenerator can
+        consume without holding the whole schema in memory.
+
+        Parsers that can read their source table by table override this; by
+        default the source is parsed as a whole first.
+        """
+        yield from self.parse_tables(**parse_kwargs)
+
+    def fingerprint(self, **parse_kwargs):
+        """Return a string that changes whenever parse() would return something
+        different, or None when the source cannot be fingerprinted cheaply."""
+        return None
+
+
+def file_fingerprint(file_path) -> str:
+    """Fingerprint a file by its absolute path, size and modification time."""
+    stat = os.stat(file_path)
+    return f'{os.path.abspath(file_path)}|{stat.st_size}|{stat.st_mtime_ns}'
@@ -1,70 +1,261 @@
 # make_drawio_erd/parsers/csv_data_parser.py
 
+import glob
+import numpy as np
 import pandas as pd
 import os
-from .base_parser import BaseParser
+from .base_parser import BaseParser, file_fingerprint
+from ..schema import tables_from_dataframe
+from ..parallel import ordered_process_map
+from .type_inference import ColumnTypeState, infer_column_type
+from .key_discovery import ColumnSketch, find_foreign_keys, find_primary_key
+
+# How rows are chosen for type inference:
+#   head      - the first sample_size rows
+#   reservoir - a uniform random sample of sample_size rows from the whole file
+#   full-scan - every row, with running per-column type state
+SAMPLING_STRATEGIES = ('head', 'reservoir', 'full-scan')
+
+def expand_csv_paths(paths) -> list:
+    """Expand file paths, glob patterns and directories into a list of CSV files.
+
+    Directories contribute their *.csv files and globs their matches, both in
+    sorted order; otherwise the order of `paths` is kept and duplicates dropped.
+    """
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+
+    file_paths = []
+    for path in paths:
+        path = os.fspath(path)
+        if os.path.isdir(path):
+            matches = sorted(glob.glob(os.path.join(path, '*.csv')))
+        elif glob.has_magic(path):
+            matches = sorted(glob.glob(path))
+        else:
+            matches = [path]
+        file_paths.extend(match for match in matches if match not in file_paths)
+
+    if not file_paths:
+        raise ValueError(f"No CSV files found in {', '.join(map(str, paths))}.")
+    return file_paths
+
+def csv_table_names(file_paths) -> list:
+    """Return the table name of each CSV file: its base name (including the
+    extension), or, when base names repeat, its path relative to the common
+    directory of the files, e.g. 'a/part.csv' and 'b/part.csv'.
+    """
+    names = [os.path.basename(path) for path in file_paths]
+    if len(set(names)) == len(names):
+        return names
+
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in file_paths])
+    names = [os.path.relpath(os.path.abspath(path), root).replace(os.sep, '/') for path in file_paths]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Several input files have the table name {', '.join(duplicates)}.")
+    return names
 
 class CSVDataParser(BaseParser):
-    def __init__(self, file_path: str, sample_size: int = 10000):
-        self.file_path = file_path
+    def __init__(
+        self,
+        file_path,
+        sample_size: int = 10000,
+        sampling: str = 'head',
+        chunksize: int = 100000,
+        random_seed=None,
+        jobs=None,
+        discover_keys: bool = False,
+        pk_threshold: float = 0.99,
+        fk_threshold: float = 0.95
+    ):
+        if sampling not in SAMPLING_STRATEGIES:
+            raise ValueError(f"Unknown sampling strategy '{sampling}'. Choose from: {', '.join(SAMPLING_STRATEGIES)}.")
+        self.file_path = file_path  # A path, glob or directory, or a list of them
         self.sample_size = sample_size
+        self.sampling = sampling
+        self.chunksize = chunksize  # Rows per chunk for reservoir and full-scan sampling
+        self.random_seed = random_seed
+        self.jobs = jobs  # Worker processes used when parsing several files
+
+        # Key discovery: a primary key candidate must have at least pk_threshold
+        # distinct values per row, and a foreign key candidate at least
+        # fk_threshold of its distinct values present in another file's key.
+        # Only the sampled rows are sketched, so with 'head' and 'reservoir'
+        # sampling foreign keys are rarely found.
+        self.discover_keys = discover_keys
+        self.pk_threshold = pk_threshold
+        self.fk_threshold = fk_threshold
+
+    def fingerprint(self) -> str:
+        # The files and every option that affects the inferred metadata
+        files = [file_fingerprint(path) for path in expand_csv_paths(self.file_path)]
+        return '\n'.join(files + [repr(sorted(self._options().items())), repr(self.fk_threshold)])
+
+    def _options(self):
+        # Options passed to the per-file workers
+        return {
+            'sample_size': self.sample_size,
+            'sampling': self.sampling,
+            'chunksize': self.chunksize,
+            'random_seed': self.random_seed,
+            'discover_keys': self.discover_keys,
+            'pk_threshold': self.pk_threshold,
+        }
 
     def parse(self) -> pd.DataFrame:
-        # Use the base name of the file (including extension) as the table name
-        table_name = os.path.basename(self.file_path)
-        # Do not remove the extension
-        # table_name = os.path.splitext(table_name)[0]
-
-        # Read the first 'sample_size' rows of the CSV file
-        df = pd.read_csv(self.file_path, nrows=self.sample_size, dtype=str)
-        column_names = df.columns.tolist()
-
-        # Initialize lists to store metadata
-        catalogs = []
-        databases = []
-        tables = []
-        columns = []
-        types = []
-        column_orders = []
-        is_primary_keys = []
-        is_foreign_keys = []
-
-        # Infer data types for each column
-        for idx, col in enumerate(column_names):
-            col_data = df[col].dropna()
-            inferred_type = 'VARCHAR'  # Default type
-            if not col_data.empty:
-                if col_data.apply(self.is_integer).all():
-                    inferred_type = 'INT'
-                elif col_data.apply(self.is_decimal).all():
-                    inferred_type = 'DECIMAL'
-
-            # Append metadata for each column
-            catalogs.append('')  # Assuming no catalog
-            databases.append('')  # Assuming no database
-            tables.append(table_name)
-            columns.append(col)
-            types.append(inferred_type)
-            column_orders.append(idx + 1)  # Column order starts from 1
-            is_primary_keys.append(0)  # Default to not a primary key
-            is_foreign_keys.append(0)  # Default to not a foreign key
+        # Parse each file into one table, concurrently when there are several,
+        # and merge them in the order of expand_csv_paths()
+        file_paths = expand_csv_paths(self.file_path)
+        results = list(self._map_files(file_paths))
+        metadata_df = pd.concat([frame for frame, _ in results], ignore_index=True)
+
+        if self.discover_keys:
+            key_profiles = [key_profile for _, key_profile in results]
+            self._mark_foreign_keys(metadata_df, find_foreign_keys(key_profiles, self.fk_threshold))
+        return metadata_df
+
+    def iter_tables(self):
+        """Yield one table per file, in the order of expand_csv_paths().
+
+        Foreign keys are only known once every file has been read, so with
+        key discovery the files are parsed as a whole first.
+        """
+        if self.discover_keys:
+            yield from super().iter_tables()
+            return
+        for frame, _ in self._map_files(expand_csv_paths(self.file_path)):
+            yield from tables_from_dataframe(frame)
+
+    def _map_files(self, file_paths):
+        # Parse the files concurrently when there are several, in order
+        options = self._options()
+        jobs = self.jobs if len(file_paths) > 1 else 1
+        file_args = ((path, table_name, options) for path, table_name in zip(file_paths, csv_table_names(file_paths)))
+        return ordered_process_map(_parse_csv_file, file_args, jobs=jobs)
+
+    def parse_file(self, file_path: str) -> pd.DataFrame:
+        """Parse a single CSV data file into the metadata of one table."""
+        return self._parse_file(file_path)[0]
+
+    def _parse_file(self, file_path, table_name=None):
+        # Return the table's metadata and, with key discovery, its key profile:
+        # (table, primary key, columns, types, column sketches)
+        # By default the base name of the file (including extension) is the
+        # table name; see csv_table_names()
+        table_name = table_name or os.path.basename(file_path)
+
+        sketches = None
+        if self.sampling == 'full-scan':
+            column_names, types, sketches = self._scan_file(file_path)
+        else:
+            if self.sampling == 'head':
+                # Read the first 'sample_size' rows of the CSV file
+                df = pd.read_csv(file_path, nrows=self.sample_size, dtype=str)
+            else:
+                df = self._reservoir_sample(file_path)
+            column_names = df.columns.tolist()
+
+            # Infer data types for each column, one vectorized pass per column
+            types = [infer_column_type(df[col]) for col in column_names]
+
+            if self.discover_keys:
+                sketches = [ColumnSketch(len(df)) for _ in column_names]
+                for sketch, col in zip(sketches, column_names):
+                    sketch.update(df[col], self.pk_threshold)
 
         # Construct the DataFrame expected by ERDGenerator
         metadata_df = pd.DataFrame({
-            'Catalog': catalogs,
-            'Database': databases,
-            'Table': tables,
+            'Catalog': '',  # Assuming no catalog
+            'Database': '',  # Assuming no database
+            'Table': table_name,
             'Owner': '',  # No owner information
             'Creation_Date': '',  # No creation date information
-            'Column': columns,
+            'Column': column_names,
             'Type': types,
-            'Column_Order': column_orders,
+            'Column_Order': range(1, len(column_names) + 1),  # Column order starts from 1
             'Source_Table': '',  # No source table information
-            'Is_Primary_Key': is_primary_keys,
-            'Is_Foreign_Key': is_foreign_keys
+            'Is_Primary_Key': 0,  # Default to not a primary key
+            'Is_Foreign_Key': 0,  # Default to not a foreign key
+            'References_Catalog': '',  # No foreign key information
+            'References_Database': '',
+            'References_Table': '',
+            'References_Column': ''
         })
 
-        return metadata_df
+        if sketches is None:
+            return metadata_df, None
+
+        primary_key = find_primary_key(column_names, types, sketches, self.pk_threshold)
+        metadata_df['Is_Primary_Key'] = (metadata_df['Column'] == primary_key).astype(int)
+        # Only the primary key's Bloom filter is needed to find foreign keys
+        for col, sketch in zip(column_names, sketches):
+            if col != primary_key:
+                sketch.bloom = None
+        return metadata_df, (table_name, primary_key, column_names, types, sketches)
+
+    @staticmethod
+    def _mark_foreign_keys(metadata_df, foreign_keys):
+        if not foreign_keys:
+            return
+        keys = pd.MultiIndex.from_frame(metadata_df[['Table', 'Column']])
+        positions = keys.get_indexer(list(foreign_keys))
+        references = list(foreign_keys.values())
+        metadata_df.loc[positions, 'Is_Foreign_Key'] = 1
+        metadata_df.loc[positions, 'References_Table'] = [table for table, _ in references]
+        metadata_df.loc[positions, 'References_Column'] = [column for _, column in references]
+
+    def _iter_chunks(self, file_path):
+        return pd.read_csv(file_path, dtype=str, chunksize=self.chunksize)
+
+    def _scan_file(self, file_path):
+        # Stream the whole file, keeping only per-column type state (and key
+        # discovery sketches) between chunks
+        column_names = pd.read_csv(file_path, nrows=0).columns.tolist()
+        states = [ColumnTypeState() for _ in column_names]
+        sketches = None
+        if self.discover_keys:
+            # Every row takes at least one character and a delimiter per column
+            expected_rows = os.path.getsize(file_path) // (2 * max(1, len(column_names)))
+            sketches = [ColumnSketch(expected_rows) for _ in column_names]
+        with self._iter_chunks(file_path) as chunks:
+            for chunk in chunks:
+                for state, col in zip(states, column_names):
+                    state.update(chunk[col])
+                if sketches is not None:
+                    for sketch, col in zip(sketches, column_names):
+                        sketch.update(chunk[col], self.pk_threshold)
+        return column_names, [state.inferred_type for state in states], sketches
+
+    def _reservoir_sample(self, file_path) -> pd.DataFrame:
+        # Algorithm R over the chunks of the file: row i (0-based) replaces a
+        # random reservoir slot with probability sample_size / (i + 1)
+        rng = np.random.default_rng(self.random_seed)
+        reservoir = pd.read_csv(file_path, nrows=0, dtype=str)
+        rows_seen = 0
+        with self._iter_chunks(file_path) as chunks:
+            for chunk in chunks:
+                # Fill the reservoir first
+                free_slots = self.sample_size - len(reservoir)
+                if free_slots > 0:
+                    reservoir = pd.concat([reservoir, chunk.iloc[:free_slots]], ignore_index=True)
+                    rows_seen += min(free_slots, len(chunk))
+                    chunk = chunk.iloc[free_slots:]
+                if chunk.empty:
+                    continue
+
+                row_numbers = np.arange(rows_seen, rows_seen + len(chunk))
+                slots = rng.integers(0, row_numbers + 1)
+                accepted = np.flatnonzero(slots < self.sample_size)
+                rows_seen += len(chunk)
+                if not len(accepted):
+                    continue
+
+                # When several rows of a chunk hit the same slot the last one wins
+                replacements = pd.Series(accepted, index=slots[accepted])
+                replacements = replacements[~replacements.index.duplicated(keep='last')]
+                reservoir.iloc[replacements.index.to_numpy()] = chunk.iloc[replacements.to_numpy()].to_numpy()
+        return reservoir
 
     @staticmethod
     def is_integer(value):
@@ -83,3 +274,8 @@ class CSVDataParser(BaseParser):
             return True
         except (ValueError, TypeError):
             return False
+
+
+def _parse_csv_file(file_path, table_name, options):
+    # Parse one file in a worker process
+    return CSVDataParser(file_path, **options)._parse_file(file_path, table_name)
@@ -0,0 +1,192 @@
+# make_drawio_erd/parsers/key_discovery.py
+
+import math
+import numpy as np
+import pandas as pd
+
+# Types that can hold a key; decimals, booleans and timestamps are not
+# considered as primary or foreign keys
+KEY_TYPES = ('INT', 'VARCHAR')
+
+# Bloom filter sizing: bits per expected value, and the largest filter per column
+BLOOM_BITS_PER_VALUE = 10
+MAX_BLOOM_BITS = 1 << 26
+
+
+def hash_values(values: pd.Series) -> np.ndarray:
+    """Hash string values to uint64, consistently across files and processes."""
+    return pd.util.hash_array(values.to_numpy(dtype=object))
+
+
+class HyperLogLog:
+    """Distinct-count sketch with 2**precision one-byte registers."""
+
+    def __init__(self, precision: int = 14):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update(self, hashes: np.ndarray):
+        p = np.uint64(self.precision)
+        index = (hashes >> (np.uint64(64) - p)).astype(np.intp)
+        # The sentinel bit caps the rank when all remaining bits are zero
+        rest = (hashes << p) | (np.uint64(1) << (p - np.uint64(1)))
+        # frexp's exponent is the bit length, so 65 - exponent is the 1-based
+        # position of the leftmost one bit
+        _, exponent = np.frexp(rest.astype(np.float64))
+        np.maximum.at(self.registers, index, (65 - exponent).astype(np.uint8))
+
+    def count(self) -> float:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is more accurate for small cardinalities
+            estimate = m * math.log(m / zeros)
+        return float(estimate)
+
+
+class BloomFilter:
+    """Set membership sketch over hashed values, using double hashing."""
+
+    def __init__(self, num_bits: int = 1 << 20, num_hashes: int = 5):
+        if num_bits & (num_bits - 1):
+            raise ValueError('The number of Bloom filter bits must be a power of two.')
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = np.zeros(num_bits // 8, dtype=np.uint8)
+
+    def _positions(self, hashes: np.ndarray):
+        mask = np.uint64(self.num_bits - 1)
+        h1 = hashes & np.uint64(0xFFFFFFFF)
+        h2 = (hashes >> np.uint64(32)) | np.uint64(1)
+        for i in range(self.num_hashes):
+            yield (h1 + np.uint64(i) * h2) & mask
+
+    def add(self, hashes: np.ndarray):
+        for positions in self._positions(hashes):
+            bit_values = np.left_shift(1, positions & np.uint64(7)).astype(np.uint8)
+            np.bitwise_or.at(self.bits, (positions >> np.uint64(3)).astype(np.intp), bit_values)
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        found = np.ones(len(hashes), dtype=bool)
+        for positions in self._positions(hashes):
+            stored = self.bits[(positions >> np.uint64(3)).astype(np.intp)]
+            found &= ((stored >> (positions & np.uint64(7)).astype(np.uint8)) & 1).astype(bool)
+        return found
+
+
+def bloom_filter_bits(expected_values: int) -> int:
+    """Power-of-two filter size for about 1% false positives, within bounds."""
+    bits = max(1024, min(MAX_BLOOM_BITS, expected_values * BLOOM_BITS_PER_VALUE))
+    return 1 << math.ceil(math.log2(bits))
+
+
+class KMinValues:
+    """The k smallest distinct hashes: a uniform sample of the distinct values."""
+
+    def __init__(self, k: int = 256):
+        self.k = k
+        self.hashes = np.empty(0, dtype=np.uint64)
+
+    def update(self, hashes: np.ndarray):
+        self.hashes = np.unique(np.concatenate([self.hashes, hashes]))[:self.k]
+
+
+class ColumnSketch:
+    """Bounded-memory summary of one column for key discovery.
+
+    The Bloom filter is only kept while the column can still be a primary
+    key: as soon as it has nulls or clearly repeated values it is dropped.
+    """
+
+    __slots__ = ('row_count', 'null_count', 'distinct', 'sample', 'bloom')
+
+    def __init__(self, expected_rows: int):
+        self.row_count = 0
+        self.null_count = 0
+        self.distinct = HyperLogLog()
+        self.sample = KMinValues()
+        self.bloom = BloomFilter(bloom_filter_bits(expected_rows))
+
+    def update(self, values: pd.Series, pk_threshold: float):
+        non_null = values.dropna()
+        self.row_count += len(values)
+        self.null_count += len(values) - len(non_null)
+        hashes = hash_values(non_null)
+        self.distinct.update(hashes)
+        self.sample.update(hashes)
+
+        if self.bloom is not None and not self._may_be_unique(pk_threshold):
+            self.bloom = None
+        if self.bloom is not None:
+            self.bloom.add(hashes)
+
+    def _may_be_unique(self, pk_threshold: float) -> bool:
+        # Allow for the estimator's error before giving up on the column
+        return self.null_count == 0 and self.distinct.count() >= pk_threshold * self.row_count * 0.95
+
+    def is_unique(self, pk_threshold: float) -> bool:
+        return (
+            self.bloom is not None
+            and self.row_count > 0
+            and self.null_count == 0
+            and self.distinct.count() >= pk_threshold * self.row_count
+        )
+
+    def containment_in(self, other: 'ColumnSketch') -> float:
+        """Estimated fraction of this column's distinct values found in `other`."""
+        if other.bloom is None or not len(self.sample.hashes):
+            return 0.0
+        return float(other.bloom.contains(self.sample.hashes).mean())
+
+
+def _is_key_type(type_name: str) -> bool:
+    return type_name.startswith(KEY_TYPES)
+
+
+def find_primary_key(columns, types, sketches, pk_threshold: float):
+    """Return the left-most unique, non-null column of a table, or None."""
+    for column, type_name, sketch in zip(columns, types, sketches):
+        if _is_key_type(type_name) and sketch.is_unique(pk_threshold):
+            return column
+    return None
+
+
+def find_foreign_keys(tables, fk_threshold: float) -> dict:
+    """Find inclusion dependencies from any column to primary keys of other tables.
+
+    `tables` is a list of (table, primary key or None, columns, types, sketches).
+    Returns {(table, column): (referenced table, referenced column)}, keeping
+    for each column the primary key that contains most of its values.
+    """
+    targets = [
+        (table, primary_key, _key_kind(types[columns.index(primary_key)]), sketches[columns.index(primary_key)])
+        for table, primary_key, columns, types, sketches in tables
+        if primary_key is not None
+    ]
+    target_counts = [target_sketch.distinct.count() for _, _, _, target_sketch in targets]
+
+    foreign_keys = {}
+    for table, primary_key, columns, types, sketches in tables:
+        for column, type_name, sketch in zip(columns, types, sketches):
+            if column == primary_key or not _is_key_type(type_name) or not len(sketch.sample.hashes):
+                continue
+            distinct_count = sketch.distinct.count()
+            best = None
+            for (target_table, target_column, target_kind, target_sketch), target_count in zip(targets, target_counts):
+                if target_table == table or target_kind != _key_kind(type_name):
+                    continue
+                # A column cannot be contained in a key with fewer distinct values
+                if distinct_count > target_count * 1.05:
+                    continue
+                containment = sketch.containment_in(target_sketch)
+                if containment >= fk_threshold and (best is None or containment > best[0]):
+                    best = (containment, target_table, target_column)
+            if best is not None:
+                foreign_keys[(table, column)] = best[1:]
+    return foreign_keys
+
+
+def _key_kind(type_name: str) -> str:
+    return 'INT' if type_name == 'INT' else 'VARCHAR'
@@ -1,48 +1,146 @@
 # make_drawio_erd/parsers/metadata_csv_parser.py
 
+import csv
+import importlib.util
+from collections import defaultdict
 import pandas as pd
-from .base_parser import BaseParser
+from .base_parser import BaseParser, file_fingerprint
+from ..schema import iter_grouped_tables
+
+# pyarrow is imported when its reader is used
+HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
+# Columns of the standardized metadata format
+EXPECTED_COLUMNS = [
+    'Catalog', 'Database', 'Table', 'Owner', 'Creation_Date',
+    'Column', 'Type', 'Column_Order', 'Source_Table',
+    'Is_Primary_Key', 'Is_Foreign_Key',
+    # Optional: the column a foreign key points to
+    'References_Catalog', 'References_Database', 'References_Table', 'References_Column'
+]
+
+# Few distinct values repeated on every row of a table: stored as categories
+CATEGORY_COLUMNS = ['Catalog', 'Database', 'Table', 'Type', 'Owner', 'Source_Table']
+FLAG_COLUMNS = ['Is_Primary_Key', 'Is_Foreign_Key']
+
+# Bytes per chunk read by the pyarrow engine
+PYARROW_BLOCK_SIZE = 16 * 1024 * 1024
 
 class MetaDataCSVParser(BaseParser):
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, table_filter=None, chunksize: int = 100000, engine: str = None):
         self.file_path = file_path
+        # With a filters.TableFilter, rows of other tables are dropped from
+        # each chunk while the file is read
+        self.table_filter = table_filter
+        self.chunksize = chunksize  # Rows per chunk with the pandas engine
+        # 'pyarrow' (streaming CSV reader, the default when installed) or 'pandas'
+        self.engine = engine or ('pyarrow' if HAS_PYARROW else 'pandas')
+
+    def fingerprint(self) -> str:
+        return f'{file_fingerprint(self.file_path)}|{self.table_filter!r}'
 
     def parse(self) -> pd.DataFrame:
-        df = pd.read_csv(self.file_path)
-        # Ensure the DataFrame conforms to the expected structure
-        expected_columns = [
-            'Catalog', 'Database', 'Table', 'Owner', 'Creation_Date',
-            'Column', 'Type', 'Column_Order', 'Source_Table',
-            'Is_Primary_Key', 'Is_Foreign_Key'
-        ]
+        # Chunks are converted to compact dtypes as they are read, so the peak
+        # memory is about twice that of the final frame
+        chunks = [self._prepare_chunk(chunk) for chunk in self._iter_chunks()]
+        df = _concat_chunks(chunks) if chunks else self._prepare_chunk(self._read_header())
+
         # Check for missing columns and add them with default values
-        for col in expected_columns:
+        for col in EXPECTED_COLUMNS:
             if col not in df.columns:
-                if col in ['Is_Primary_Key', 'Is_Foreign_Key']:
-                    df[col] = 0  # Default to 0 for numeric columns
+                if col in FLAG_COLUMNS:
+                    df[col] = pd.Series(0, index=df.index, dtype='int8')  # Default to 0 for numeric columns
                 elif col == 'Column_Order':
-                    df[col] = pd.NA  # Use NA for missing Column_Order
+                    df[col] = float('nan')  # Filled in below
                 else:
                     df[col] = ''  # Default empty string for other columns
 
-        # Convert 'Is_Primary_Key' and 'Is_Foreign_Key' to integers
-        numeric_columns = ['Is_Primary_Key', 'Is_Foreign_Key']
-        for col in numeric_columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype(int)
+        # Fill missing 'Column_Order' with the position of the row within its table
+        column_order = df['Column_Order']
+        if column_order.isna().any():
+            row_number = df.groupby(['Catalog', 'Database', 'Table'], sort=False, dropna=False, observed=True).cumcount() + 1
+            column_order = column_order.fillna(row_number)
+        df['Column_Order'] = column_order.astype('int32')
 
-        # Convert 'Column_Order' to numeric, but do not fill missing values yet
-        df['Column_Order'] = pd.to_numeric(df['Column_Order'], errors='coerce')
+        return df
 
-        # Generate sequential numbers within each group (table)
-        df['Row_Number'] = df.groupby(['Catalog', 'Database', 'Table']).cumcount() + 1
+    def iter_tables(self):
+        """Yield the tables one at a time while the file is read. The rows of
+        each table must be contiguous, as in files sorted by table; otherwise
+        a ValueError is raised when a table's rows reappear."""
+        yield from iter_grouped_tables(self._prepare_chunk(chunk) for chunk in self._iter_chunks())
 
-        # Fill missing 'Column_Order' with 'Row_Number'
-        df['Column_Order'] = df['Column_Order'].fillna(df['Row_Number'])
+    def _read_header(self) -> pd.DataFrame:
+        with open(self.file_path, newline='', encoding='utf-8') as f:
+            names = next(csv.reader(f), [])
+        return pd.DataFrame({name: pd.Series(dtype=object) for name in names})
 
-        # Convert 'Column_Order' to integers
-        df['Column_Order'] = df['Column_Order'].astype(int)
+    def _iter_chunks(self):
+        # Yield DataFrames of raw rows, with text columns as strings and the
+        # category columns already categorical
+        if self.engine == 'pyarrow':
+            yield from self._iter_pyarrow_chunks()
+            return
+        dtypes = defaultdict(lambda: str, {col: 'category' for col in CATEGORY_COLUMNS})
+        with pd.read_csv(self.file_path, dtype=dtypes, chunksize=self.chunksize) as chunks:
+            yield from chunks
 
-        # Drop the temporary 'Row_Number' column
-        df.drop(columns=['Row_Number'], inplace=True)
+    def _iter_pyarrow_chunks(self):
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
 
-        return df
+        # Every column gets an explicit type: inferring types from the first
+        # block fails on later blocks that do not fit them
+        names = list(self._read_header().columns)
+        column_types = {
+            name: pa.dictionary(pa.int32(), pa.string()) if name in CATEGORY_COLUMNS else pa.string()
+            for name in names
+        }
+        reader = pa_csv.open_csv(
+            self.file_path,
+            read_options=pa_csv.ReadOptions(block_size=PYARROW_BLOCK_SIZE),
+            convert_options=pa_csv.ConvertOptions(column_types=column_types, strings_can_be_null=True)
+        )
+        numeric_columns = [name for name in names if name in FLAG_COLUMNS or name == 'Column_Order']
+        text_columns = [name for name in names if name not in CATEGORY_COLUMNS and name not in numeric_columns]
+        for batch in reader:
+            # Parse clean numeric columns in Arrow; others are coerced in
+            # _prepare_chunk
+            columns = dict(zip(batch.schema.names, batch.columns))
+            for name in numeric_columns:
+                try:
+                    columns[name] = columns[name].cast(pa.float64())
+                except pa.ArrowInvalid:
+                    pass
+            chunk = pa.RecordBatch.from_pydict(columns).to_pandas()
+            # Missing text is None in Arrow and NaN with the pandas engine
+            for name in text_columns:
+                chunk[name] = chunk[name].where(chunk[name].notna(), float('nan'))
+            yield chunk
+
+    def _prepare_chunk(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        if self.table_filter:
+            chunk = self.table_filter.apply(chunk).copy()
+        for col in CATEGORY_COLUMNS:
+            if col in chunk.columns and not isinstance(chunk[col].dtype, pd.CategoricalDtype):
+                chunk[col] = chunk[col].astype('category')
+        # Convert 'Is_Primary_Key' and 'Is_Foreign_Key' to small integers
+        for col in FLAG_COLUMNS:
+            if col in chunk.columns:
+                chunk[col] = pd.to_numeric(chunk[col], errors='coerce').fillna(0).astype('int8')
+        # Convert 'Column_Order' to numeric, but do not fill missing values yet
+        if 'Column_Order' in chunk.columns:
+            chunk['Column_Order'] = pd.to_numeric(chunk['Column_Order'], errors='coerce')
+        return chunk
+
+
+def _concat_chunks(chunks) -> pd.DataFrame:
+    # pd.concat turns categoricals with different categories into objects, so
+    # give every chunk the union of the categories first
+    if len(chunks) > 1:
+        for col in chunks[0].columns:
+            if isinstance(chunks[0][col].dtype, pd.CategoricalDtype):
+                categories = pd.api.types.union_categoricals([chunk[col] for chunk in chunks]).categories
+                for chunk in chunks:
+                    chunk[col] = chunk[col].cat.set_categories(categories)
+    return pd.concat(chunks, ignore_index=True)
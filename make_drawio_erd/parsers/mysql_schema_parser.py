@@ -1,15 +1,29 @@
 # make_drawio_erd/parsers/mysql_schema_parser.py
 
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.engine import Engine
 from dotenv import load_dotenv
 import os
 from .base_parser import BaseParser
+from ..schema import iter_grouped_tables
+from ..filters import sql_pattern_predicates
+
+# Schemas that are never part of the diagram
+SYSTEM_SCHEMAS = ('information_schema', 'mysql', 'performance_schema', 'sys')
+
+# Rows fetched per round trip from server-side cursors
+FETCH_SIZE = 10000
 
 class MySQLSchemaParser(BaseParser):
-    def __init__(self):
-        self.engine = self._create_engine()
+    def __init__(self, max_connections: int = 1, engine: Engine = None):
+        # With max_connections > 1, schemas are extracted concurrently, one
+        # query per schema, over a pool of at most that many connections.
+        # An existing engine (e.g. a stand-in for tests) can be passed instead
+        # of the one configured from the environment.
+        self.max_connections = max_connections
+        self.engine = engine if engine is not None else self._create_engine()
 
     def _create_engine(self) -> Engine:
         # Load environment variables from .env file
@@ -26,47 +40,247 @@ class MySQLSchemaParser(BaseParser):
 
         # Create the SQLAlchemy engine without specifying a default database
         connection_string = f"mysql+pymysql://{mysql_user}:{mysql_password}@{mysql_host}:{mysql_port}/"
-        engine = create_engine(connection_string)
+        engine = create_engine(connection_string, pool_size=self.max_connections, max_overflow=0)
         return engine
 
-    def parse(self) -> pd.DataFrame:
-        # Query to get column information from all databases except system databases
-        query = """
+    def fingerprint(
+        self,
+        include_databases=None,
+        exclude_databases=None,
+        include_tables=None,
+        exclude_tables=None
+    ) -> str:
+        """Cheap digest of the matching tables from information_schema.TABLES.
+
+        Covers the table count and the latest CREATE_TIME/UPDATE_TIME, so added,
+        dropped and rebuilt tables are noticed. DDL that the server applies in
+        place without touching these times is not; bypass the cache after it.
+        """
+        params = {}
+        filters = ''.join([
+            sql_pattern_predicates('TABLE_SCHEMA', include_databases, 'include_db', params),
+            sql_pattern_predicates('TABLE_SCHEMA', exclude_databases, 'exclude_db', params, negate=True),
+            sql_pattern_predicates('TABLE_NAME', include_tables, 'include_table', params),
+            sql_pattern_predicates('TABLE_NAME', exclude_tables, 'exclude_table', params, negate=True),
+        ])
+        system_schemas = ', '.join(f"'{schema}'" for schema in SYSTEM_SCHEMAS)
+        query = f"""
+        SELECT COUNT(*), MAX(CREATE_TIME), MAX(UPDATE_TIME)
+        FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA NOT IN ({system_schemas}){filters}
+        """
+        with self.engine.connect() as connection:
+            digest = tuple(connection.execute(text(query), params).one())
+        server = self.engine.url.render_as_string(hide_password=True)
+        return repr((server, sorted(params.items()), digest))
+
+    def parse(
+        self,
+        include_databases=None,
+        exclude_databases=None,
+        include_tables=None,
+        exclude_tables=None
+    ) -> pd.DataFrame:
+        """Return the columns of all matching tables, one row per column.
+
+        Each filter is a Unix-style glob or a list of them. They are translated
+        into parameterized LIKE/REGEXP predicates so the server does the
+        filtering; matching follows the server's collation.
+        """
+        if self.max_connections > 1:
+            return self._parse_per_schema(include_databases, exclude_databases, include_tables, exclude_tables)
+
+        query, params = self._columns_query(include_databases, exclude_databases, include_tables, exclude_tables)
+        df = pd.read_sql(text(query), self.engine, params=params)
+        return _build_metadata(df)
+
+    def iter_tables(
+        self,
+        include_databases=None,
+        exclude_databases=None,
+        include_tables=None,
+        exclude_tables=None
+    ):
+        """Yield the matching tables one at a time.
+
+        Runs the single query of parse() through a server-side cursor, whose
+        rows come ordered by table, whatever max_connections is.
+        """
+        query, params = self._columns_query(include_databases, exclude_databases, include_tables, exclude_tables)
+        with self.engine.connect() as connection:
+            result = connection.execution_options(stream_results=True).execute(text(query), params)
+            columns = list(result.keys())
+            chunks = (_build_metadata(pd.DataFrame(rows, columns=columns)) for rows in result.partitions(FETCH_SIZE))
+            yield from iter_grouped_tables(chunks)
+
+    def _columns_query(self, include_databases, exclude_databases, include_tables, exclude_tables):
+        # Return the query of every matching column, ordered by table, and its parameters
+        params = {}
+        filters = ''.join([
+            sql_pattern_predicates('{alias}.TABLE_SCHEMA', include_databases, 'include_db', params),
+            sql_pattern_predicates('{alias}.TABLE_SCHEMA', exclude_databases, 'exclude_db', params, negate=True),
+            sql_pattern_predicates('{alias}.TABLE_NAME', include_tables, 'include_table', params),
+            sql_pattern_predicates('{alias}.TABLE_NAME', exclude_tables, 'exclude_table', params, negate=True),
+        ])
+        system_schemas = ', '.join(f"'{schema}'" for schema in SYSTEM_SCHEMAS)
+
+        # Query to get column information from all matching databases. Key usage
+        # is aggregated per column first, so a column that takes part in several
+        # constraints still yields a single row; of several foreign keys on one
+        # column the one with the smallest constraint name is shown.
+        query = f"""
         SELECT
             C.TABLE_SCHEMA AS `Database`,
             C.TABLE_NAME AS `Table`,
             C.COLUMN_NAME AS `Column`,
             C.DATA_TYPE AS `Type`,
             C.ORDINAL_POSITION AS `Column_Order`,
-            CASE WHEN KCU.CONSTRAINT_NAME = 'PRIMARY' THEN 1 ELSE 0 END AS `Is_Primary_Key`,
-            CASE WHEN KCU.REFERENCED_TABLE_NAME IS NOT NULL THEN 1 ELSE 0 END AS `Is_Foreign_Key`
+            COALESCE(KCU.IS_PRIMARY_KEY, 0) AS `Is_Primary_Key`,
+            COALESCE(KCU.IS_FOREIGN_KEY, 0) AS `Is_Foreign_Key`,
+            FK.REFERENCED_TABLE_SCHEMA AS `References_Database`,
+            FK.REFERENCED_TABLE_NAME AS `References_Table`,
+            FK.REFERENCED_COLUMN_NAME AS `References_Column`
         FROM
             information_schema.COLUMNS C
-            LEFT JOIN information_schema.KEY_COLUMN_USAGE KCU
+            LEFT JOIN (
+                SELECT
+                    K.TABLE_SCHEMA,
+                    K.TABLE_NAME,
+                    K.COLUMN_NAME,
+                    MAX(CASE WHEN K.CONSTRAINT_NAME = 'PRIMARY' THEN 1 ELSE 0 END) AS IS_PRIMARY_KEY,
+                    MAX(CASE WHEN K.REFERENCED_TABLE_NAME IS NOT NULL THEN 1 ELSE 0 END) AS IS_FOREIGN_KEY,
+                    MIN(CASE WHEN K.REFERENCED_TABLE_NAME IS NOT NULL THEN K.CONSTRAINT_NAME END) AS FK_CONSTRAINT_NAME
+                FROM
+                    information_schema.KEY_COLUMN_USAGE K
+                WHERE
+                    K.TABLE_SCHEMA NOT IN ({system_schemas}){filters.format(alias='K')}
+                GROUP BY
+                    K.TABLE_SCHEMA, K.TABLE_NAME, K.COLUMN_NAME
+            ) KCU
                 ON C.TABLE_SCHEMA = KCU.TABLE_SCHEMA
                 AND C.TABLE_NAME = KCU.TABLE_NAME
                 AND C.COLUMN_NAME = KCU.COLUMN_NAME
+            LEFT JOIN information_schema.KEY_COLUMN_USAGE FK
+                ON KCU.TABLE_SCHEMA = FK.TABLE_SCHEMA
+                AND KCU.TABLE_NAME = FK.TABLE_NAME
+                AND KCU.COLUMN_NAME = FK.COLUMN_NAME
+                AND KCU.FK_CONSTRAINT_NAME = FK.CONSTRAINT_NAME
         WHERE
-            C.TABLE_SCHEMA NOT IN ('information_schema', 'mysql', 'performance_schema', 'sys')
+            C.TABLE_SCHEMA NOT IN ({system_schemas}){filters.format(alias='C')}
         ORDER BY
             C.TABLE_SCHEMA, C.TABLE_NAME, C.ORDINAL_POSITION;
         """
+        return query, params
+
+    def _parse_per_schema(self, include_databases, exclude_databases, include_tables, exclude_tables):
+        # List the matching schemas first, then extract each one concurrently
+        params = {}
+        filters = ''.join([
+            sql_pattern_predicates('SCHEMA_NAME', include_databases, 'include_db', params),
+            sql_pattern_predicates('SCHEMA_NAME', exclude_databases, 'exclude_db', params, negate=True),
+        ])
+        system_schemas = ', '.join(f"'{schema}'" for schema in SYSTEM_SCHEMAS)
+        query = f"""
+        SELECT SCHEMA_NAME
+        FROM information_schema.SCHEMATA
+        WHERE SCHEMA_NAME NOT IN ({system_schemas}){filters}
+        ORDER BY SCHEMA_NAME
+        """
+        with self.engine.connect() as connection:
+            schemas = [row[0] for row in connection.execute(text(query), params)]
+
+        with ThreadPoolExecutor(max_workers=self.max_connections) as executor:
+            frames = [
+                frame for frame in executor.map(
+                    lambda schema: self._fetch_schema(schema, include_tables, exclude_tables),
+                    schemas
+                )
+                if not frame.empty
+            ]
+
+        columns = ['Database', 'Table', 'Column', 'Type', 'Column_Order', 'Is_Primary_Key', 'Is_Foreign_Key',
+                   'References_Database', 'References_Table', 'References_Column']
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+        return _build_metadata(df)
+
+    def _fetch_schema(self, schema, include_tables, exclude_tables) -> pd.DataFrame:
+        # Fetch one schema's key usage and columns over a single pooled
+        # connection, reading both through server-side cursors in batches
+        params = {'schema': schema}
+        filters = ''.join([
+            sql_pattern_predicates('TABLE_NAME', include_tables, 'include_table', params),
+            sql_pattern_predicates('TABLE_NAME', exclude_tables, 'exclude_table', params, negate=True),
+        ])
+        key_query = f"""
+        SELECT TABLE_NAME, COLUMN_NAME, CONSTRAINT_NAME,
+               REFERENCED_TABLE_SCHEMA, REFERENCED_TABLE_NAME, REFERENCED_COLUMN_NAME
+        FROM information_schema.KEY_COLUMN_USAGE
+        WHERE TABLE_SCHEMA = :schema{filters}
+        """
+        column_query = f"""
+        SELECT TABLE_NAME, COLUMN_NAME, DATA_TYPE, ORDINAL_POSITION
+        FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = :schema{filters}
+        ORDER BY TABLE_NAME, ORDINAL_POSITION
+        """
+
+        primary_keys = set()
+        foreign_keys = {}  # (table, column) -> (constraint name, schema, table, column)
+        data = {col: [] for col in ['Table', 'Column', 'Type', 'Column_Order', 'Is_Primary_Key', 'Is_Foreign_Key',
+                                    'References_Database', 'References_Table', 'References_Column']}
+
+        with self.engine.connect() as connection:
+            connection = connection.execution_options(stream_results=True)
+
+            result = connection.execute(text(key_query), params)
+            for rows in result.partitions(FETCH_SIZE):
+                for table, column, constraint, ref_schema, ref_table, ref_column in rows:
+                    if constraint == 'PRIMARY':
+                        primary_keys.add((table, column))
+                    elif ref_table is not None:
+                        # Of several foreign keys on one column keep the
+                        # smallest constraint name, as the single query does
+                        current = foreign_keys.get((table, column))
+                        if current is None or constraint < current[0]:
+                            foreign_keys[(table, column)] = (constraint, ref_schema, ref_table, ref_column)
+
+            result = connection.execute(text(column_query), params)
+            for rows in result.partitions(FETCH_SIZE):
+                for table, column, data_type, ordinal_position in rows:
+                    reference = foreign_keys.get((table, column))
+                    data['Table'].append(table)
+                    data['Column'].append(column)
+                    data['Type'].append(data_type)
+                    data['Column_Order'].append(ordinal_position)
+                    data['Is_Primary_Key'].append(int((table, column) in primary_keys))
+                    data['Is_Foreign_Key'].append(int(reference is not None))
+                    data['References_Database'].append(reference[1] if reference else '')
+                    data['References_Table'].append(reference[2] if reference else '')
+                    data['References_Column'].append(reference[3] if reference else '')
+
+        df = pd.DataFrame(data)
+        df.insert(0, 'Database', schema)
+        return df
+
+
+def _build_metadata(df) -> pd.DataFrame:
+    # Construct the DataFrame expected by ERDGenerator
+    metadata_df = pd.DataFrame({
+        'Catalog': '',  # MySQL does not use catalogs
+        'Database': df['Database'],
+        'Table': df['Table'],
+        'Owner': '',  # Owner information not available
+        'Creation_Date': '',  # Creation date not available
+        'Column': df['Column'],
+        'Type': df['Type'],
+        'Column_Order': df['Column_Order'],
+        'Source_Table': '',  # No source table information
+        'Is_Primary_Key': df['Is_Primary_Key'],
+        'Is_Foreign_Key': df['Is_Foreign_Key'],
+        'References_Catalog': '',
+        'References_Database': df['References_Database'].fillna(''),
+        'References_Table': df['References_Table'].fillna(''),
+        'References_Column': df['References_Column'].fillna('')
+    })
 
-        df = pd.read_sql(query, self.engine)
-
-        # Construct the DataFrame expected by ERDGenerator
-        metadata_df = pd.DataFrame({
-            'Catalog': '',  # MySQL does not use catalogs
-            'Database': df['Database'],
-            'Table': df['Table'],
-            'Owner': '',  # Owner information not available
-            'Creation_Date': '',  # Creation date not available
-            'Column': df['Column'],
-            'Type': df['Type'],
-            'Column_Order': df['Column_Order'],
-            'Source_Table': '',  # No source table information
-            'Is_Primary_Key': df['Is_Primary_Key'],
-            'Is_Foreign_Key': df['Is_Foreign_Key']
-        })
-
-        return metadata_df
+    return metadata_df
@@ -0,0 +1,169 @@
+# make_drawio_erd/parsers/postgres_schema_parser.py
+
+import pandas as pd
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import URL, Engine
+from dotenv import load_dotenv
+import os
+from .base_parser import BaseParser
+from ..filters import sql_pattern_predicates
+from ..schema import iter_grouped_tables
+
+# Schemas that are never part of the diagram
+SYSTEM_SCHEMAS = ('pg_catalog', 'information_schema')
+
+# Rows fetched per round trip from server-side cursors
+FETCH_SIZE = 10000
+
+# Appended to the columns query where rows must come grouped by table
+ORDER_BY_TABLE = """
+        ORDER BY
+            N.nspname, C.relname, A.attnum
+        """
+
+class PostgresSchemaParser(BaseParser):
+    def __init__(self, engine: Engine = None):
+        # Schemas of the connected database become the Database column and
+        # the database itself the Catalog. An existing engine can be passed
+        # instead of the one configured from the environment.
+        self.engine = engine if engine is not None else self._create_engine()
+
+    def _create_engine(self) -> Engine:
+        # Load environment variables from .env file
+        load_dotenv()
+
+        # Get PostgreSQL connection details from environment variables
+        postgres_user = os.getenv('POSTGRES_USER')
+        postgres_password = os.getenv('POSTGRES_PASSWORD')
+        if not all([postgres_user, postgres_password]):
+            raise ValueError("PostgreSQL credentials are not fully set in the .env file.")
+
+        url = URL.create(
+            'postgresql+psycopg2',
+            username=postgres_user,
+            password=postgres_password,
+            host=os.getenv('POSTGRES_HOST', 'localhost'),
+            port=int(os.getenv('POSTGRES_PORT', '5432')),
+            database=os.getenv('POSTGRES_DB', 'postgres')
+        )
+        return create_engine(url)
+
+    def fingerprint(
+        self,
+        include_schemas=None,
+        exclude_schemas=None,
+        include_tables=None,
+        exclude_tables=None
+    ) -> str:
+        """Digest of the rows parse() would return, computed by the server.
+
+        The catalogs are still scanned, but only one short row comes back.
+        """
+        query, params = self._columns_query(include_schemas, exclude_schemas, include_tables, exclude_tables)
+        digest_query = f"""
+        SELECT COUNT(*), md5(string_agg(CAST(Q AS text), ',' ORDER BY CAST(Q AS text)))
+        FROM ({query}) Q
+        """
+        with self.engine.connect() as connection:
+            digest = tuple(connection.execute(text(digest_query), params).one())
+        server = self.engine.url.render_as_string(hide_password=True)
+        return repr((server, sorted(params.items()), digest))
+
+    def parse(
+        self,
+        include_schemas=None,
+        exclude_schemas=None,
+        include_tables=None,
+        exclude_tables=None
+    ) -> pd.DataFrame:
+        """Return the columns of all matching tables, one row per column.
+
+        Each filter is a Unix-style glob or a list of them, matched by the
+        server. Columns, primary keys and foreign keys come from a single
+        query over pg_catalog.
+        """
+        query, params = self._columns_query(include_schemas, exclude_schemas, include_tables, exclude_tables)
+        return pd.read_sql(text(query + ORDER_BY_TABLE), self.engine, params=params)
+
+    def iter_tables(
+        self,
+        include_schemas=None,
+        exclude_schemas=None,
+        include_tables=None,
+        exclude_tables=None
+    ):
+        """Yield the matching tables one at a time, reading the query of
+        parse() through a server-side cursor."""
+        query, params = self._columns_query(include_schemas, exclude_schemas, include_tables, exclude_tables)
+        with self.engine.connect() as connection:
+            result = connection.execution_options(stream_results=True).execute(text(query + ORDER_BY_TABLE), params)
+            columns = list(result.keys())
+            yield from iter_grouped_tables(pd.DataFrame(rows, columns=columns) for rows in result.partitions(FETCH_SIZE))
+
+    def _columns_query(self, include_schemas, exclude_schemas, include_tables, exclude_tables):
+        # Return the query of every matching column, without ORDER_BY_TABLE, and its parameters
+        params = {}
+        filters = ''.join([
+            sql_pattern_predicates('N.nspname', include_schemas, 'include_schema', params, regexp_operator='~'),
+            sql_pattern_predicates('N.nspname', exclude_schemas, 'exclude_schema', params, negate=True, regexp_operator='~'),
+            sql_pattern_predicates('C.relname', include_tables, 'include_table', params, regexp_operator='~'),
+            sql_pattern_predicates('C.relname', exclude_tables, 'exclude_table', params, negate=True, regexp_operator='~'),
+        ])
+        system_schemas = ', '.join(f"'{schema}'" for schema in SYSTEM_SCHEMAS)
+
+        # Tables, partitioned tables (but not their partitions), views,
+        # materialized views and foreign tables. Of several foreign keys on
+        # one column the one with the smallest constraint name is shown.
+        query = f"""
+        SELECT
+            current_database() AS "Catalog",
+            N.nspname AS "Database",
+            C.relname AS "Table",
+            pg_catalog.pg_get_userbyid(C.relowner) AS "Owner",
+            '' AS "Creation_Date",
+            A.attname AS "Column",
+            pg_catalog.format_type(A.atttypid, A.atttypmod) AS "Type",
+            A.attnum AS "Column_Order",
+            '' AS "Source_Table",
+            CASE WHEN PK.conname IS NULL THEN 0 ELSE 1 END AS "Is_Primary_Key",
+            CASE WHEN FK.conname IS NULL THEN 0 ELSE 1 END AS "Is_Foreign_Key",
+            CASE WHEN FK.conname IS NULL THEN '' ELSE current_database() END AS "References_Catalog",
+            COALESCE(FN.nspname, '') AS "References_Database",
+            COALESCE(FC.relname, '') AS "References_Table",
+            COALESCE(FA.attname, '') AS "References_Column"
+        FROM
+            pg_catalog.pg_class C
+            JOIN pg_catalog.pg_namespace N ON N.oid = C.relnamespace
+            JOIN pg_catalog.pg_attribute A
+                ON A.attrelid = C.oid
+                AND A.attnum > 0
+                AND NOT A.attisdropped
+            LEFT JOIN pg_catalog.pg_constraint PK
+                ON PK.conrelid = C.oid
+                AND PK.contype = 'p'
+                AND A.attnum = ANY (PK.conkey)
+            LEFT JOIN LATERAL (
+                SELECT
+                    K.conname,
+                    K.confrelid,
+                    K.confkey[array_position(K.conkey, A.attnum)] AS confattnum
+                FROM pg_catalog.pg_constraint K
+                WHERE K.conrelid = C.oid
+                    AND K.contype = 'f'
+                    AND A.attnum = ANY (K.conkey)
+                ORDER BY K.conname
+                LIMIT 1
+            ) FK ON TRUE
+            LEFT JOIN pg_catalog.pg_class FC ON FC.oid = FK.confrelid
+            LEFT JOIN pg_catalog.pg_namespace FN ON FN.oid = FC.relnamespace
+            LEFT JOIN pg_catalog.pg_attribute FA
+                ON FA.attrelid = FK.confrelid
+                AND FA.attnum = FK.confattnum
+        WHERE
+            C.relkind IN ('r', 'p', 'v', 'm', 'f')
+            AND NOT C.relispartition
+            AND N.nspname NOT IN ({system_schemas})
+            AND N.nspname NOT LIKE 'pg!_toast%' ESCAPE '!'
+            AND N.nspname NOT LIKE 'pg!_temp!_%' ESCAPE '!'{filters}
+        """
+        return query, params
@@ -0,0 +1,110 @@
+# make_drawio_erd/parsers/sqlite_schema_parser.py
+
+from contextlib import closing
+import os
+import pathlib
+import re
+import sqlite3
+import pandas as pd
+from .base_parser import BaseParser, file_fingerprint
+from ..filters import sql_pattern_predicates
+from ..schema import iter_grouped_tables
+
+# Rows fetched per call when streaming tables
+FETCH_SIZE = 10000
+
+class SQLiteSchemaParser(BaseParser):
+    def __init__(self, file_path: str, database: str = None):
+        # The file is opened read-only; its tables are placed in `database`,
+        # by default the file name without its extension
+        self.file_path = file_path
+        self.database = database or os.path.splitext(os.path.basename(file_path))[0]
+
+    def fingerprint(self, include_tables=None, exclude_tables=None) -> str:
+        files = [self.file_path]
+        # Writes in WAL mode reach the database file only at checkpoints
+        if os.path.exists(self.file_path + '-wal'):
+            files.append(self.file_path + '-wal')
+        return '\n'.join([file_fingerprint(path) for path in files] + [repr((self.database, include_tables, exclude_tables))])
+
+    def parse(self, include_tables=None, exclude_tables=None) -> pd.DataFrame:
+        """Return the columns of all matching tables and views, one row per column.
+
+        Each filter is a Unix-style glob or a list of them. Columns, primary
+        keys and foreign keys of every table come from a single query over
+        the pragma_table_info() and pragma_foreign_key_list() table-valued
+        functions.
+        """
+        query, params = self._columns_query(include_tables, exclude_tables)
+        with closing(self._connect()) as connection:
+            return pd.read_sql_query(query, connection, params=params)
+
+    def iter_tables(self, include_tables=None, exclude_tables=None):
+        """Yield the matching tables one at a time, from the same query as parse()."""
+        query, params = self._columns_query(include_tables, exclude_tables)
+        with closing(self._connect()) as connection:
+            cursor = connection.execute(query, params)
+            columns = [description[0] for description in cursor.description]
+            chunks = iter(lambda: cursor.fetchmany(FETCH_SIZE), [])
+            yield from iter_grouped_tables(pd.DataFrame(rows, columns=columns) for rows in chunks)
+
+    def _connect(self) -> sqlite3.Connection:
+        # A missing file is an error rather than a new, empty database
+        uri = pathlib.Path(self.file_path).resolve().as_uri() + '?mode=ro'
+        connection = sqlite3.connect(uri, uri=True)
+        # Globs with [...] classes are matched with REGEXP, which SQLite
+        # leaves to the application
+        connection.create_function('REGEXP', 2, _regexp, deterministic=True)
+        return connection
+
+    def _columns_query(self, include_tables, exclude_tables):
+        # Return the query of every matching column, ordered by table, and its parameters
+        params = {'database': self.database}
+        filters = ''.join([
+            sql_pattern_predicates('T.name', include_tables, 'include_table', params),
+            sql_pattern_predicates('T.name', exclude_tables, 'exclude_table', params, negate=True),
+        ])
+
+        # Of several foreign keys on one column the first declared (SQLite
+        # numbers them from the last) is shown. A foreign key without target
+        # columns points to the primary key of the referenced table.
+        query = f"""
+        SELECT
+            '' AS "Catalog",
+            :database AS "Database",
+            T.name AS "Table",
+            '' AS "Owner",
+            '' AS "Creation_Date",
+            C.name AS "Column",
+            C.type AS "Type",
+            C.cid + 1 AS "Column_Order",
+            '' AS "Source_Table",
+            CASE WHEN C.pk > 0 THEN 1 ELSE 0 END AS "Is_Primary_Key",
+            CASE WHEN FK."table" IS NULL THEN 0 ELSE 1 END AS "Is_Foreign_Key",
+            '' AS "References_Catalog",
+            CASE WHEN FK."table" IS NULL THEN '' ELSE :database END AS "References_Database",
+            COALESCE(FK."table", '') AS "References_Table",
+            COALESCE(
+                FK."to",
+                (SELECT P.name FROM pragma_table_info(FK."table") P WHERE P.pk = FK.seq + 1),
+                ''
+            ) AS "References_Column"
+        FROM
+            sqlite_master T
+            JOIN pragma_table_info(T.name) C
+            LEFT JOIN pragma_foreign_key_list(T.name) FK
+                ON FK."from" = C.name
+                AND FK.id = (
+                    SELECT MAX(K.id) FROM pragma_foreign_key_list(T.name) K WHERE K."from" = C.name
+                )
+        WHERE
+            T.type IN ('table', 'view')
+            AND T.name NOT LIKE 'sqlite!_%' ESCAPE '!'{filters}
+        ORDER BY
+            T.name, C.cid
+        """
+        return query, params
+
+
+def _regexp(pattern, value) -> bool:
+    return value is not None and re.search(pattern, value) is not None
@@ -0,0 +1,124 @@
+# make_drawio_erd/parsers/type_inference.py
+
+import pandas as pd
+
+# Whole-value patterns, applied with Series.str.fullmatch
+INTEGER_PATTERN = r'\s*[+-]?\d+\s*'
+BOOLEAN_PATTERN = r'\s*(?i:true|false|yes|no|t|f|y|n)\s*'
+DATE_PATTERN = r'\s*\d{4}-\d{2}-\d{2}\s*'
+DATETIME_PATTERN = r'\s*\d{4}-\d{2}-\d{2}(?:[ T]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?)?\s*'
+
+# Number of leading values checked before running a test over a whole column
+PREFILTER_SIZE = 16
+
+# Candidate types from most to least specific
+NUMERIC_TYPES = ['INT', 'DECIMAL']
+TEXT_TYPES = ['BOOLEAN', 'DATE', 'DATETIME']
+
+
+def _numeric_type(values: pd.Series):
+    # Return 'INT' or 'DECIMAL' when every value parses as a number, else None.
+    # pd.to_numeric stops at the first value it cannot parse.
+    try:
+        numbers = pd.to_numeric(values)
+    except (ValueError, TypeError):
+        numbers = None
+    if numbers is not None and numbers.dtype.kind in 'iu':
+        return 'INT'
+    if numbers is not None and numbers.dtype.kind == 'f':
+        return 'DECIMAL'
+
+    # Integers too large for int64/uint64, alone or among decimals
+    head = values.iloc[:PREFILTER_SIZE]
+    if _is_integer(head) and _is_integer(values):
+        return 'INT'
+    try:
+        values.astype(float)
+    except (ValueError, TypeError):
+        return None
+    return 'DECIMAL'
+
+
+def _is_integer(values: pd.Series) -> bool:
+    return bool(values.str.fullmatch(INTEGER_PATTERN).all())
+
+
+def _is_valid_datetime(values: pd.Series) -> bool:
+    # The patterns accept impossible dates such as 2024-13-45; let pandas decide
+    return bool(pd.to_datetime(values.str.strip(), format='ISO8601', errors='coerce', utc=True).notna().all())
+
+
+def _is_boolean(values: pd.Series) -> bool:
+    return bool(values.str.fullmatch(BOOLEAN_PATTERN).all())
+
+
+def _is_date(values: pd.Series) -> bool:
+    return bool(values.str.fullmatch(DATE_PATTERN).all()) and _is_valid_datetime(values)
+
+
+def _is_datetime(values: pd.Series) -> bool:
+    return bool(values.str.fullmatch(DATETIME_PATTERN).all()) and _is_valid_datetime(values)
+
+
+TEXT_TYPE_CHECKS = {
+    'BOOLEAN': _is_boolean,
+    'DATE': _is_date,
+    'DATETIME': _is_datetime,
+}
+
+
+class ColumnTypeState:
+    """Running type inference state for one column.
+
+    update() can be called repeatedly with successive batches of string values
+    (e.g. the chunks of a large file); each call drops the candidate types that
+    some value rules out. Every test is a vectorized operation over the whole
+    batch, so the Python overhead per batch is constant per column.
+    """
+
+    __slots__ = ('candidates', 'max_length', 'non_null_count')
+
+    def __init__(self):
+        self.candidates = NUMERIC_TYPES + TEXT_TYPES
+        self.max_length = 0
+        self.non_null_count = 0
+
+    def update(self, values: pd.Series):
+        values = values.dropna()
+        if values.empty:
+            return
+        self.non_null_count += len(values)
+        self.max_length = max(self.max_length, int(values.str.len().max()))
+        if not self.candidates:
+            return
+
+        numeric_type = None
+        if any(type_name in NUMERIC_TYPES for type_name in self.candidates):
+            numeric_type = _numeric_type(values)
+
+        if numeric_type == 'INT':
+            # Integers also satisfy DECIMAL; text types cannot hold numbers
+            self.candidates = [t for t in self.candidates if t in NUMERIC_TYPES]
+        elif numeric_type == 'DECIMAL':
+            self.candidates = [t for t in self.candidates if t == 'DECIMAL']
+        else:
+            head = values.iloc[:PREFILTER_SIZE]
+            self.candidates = [
+                t for t in self.candidates
+                if t in TEXT_TYPE_CHECKS and TEXT_TYPE_CHECKS[t](head) and TEXT_TYPE_CHECKS[t](values)
+            ]
+
+    @property
+    def inferred_type(self) -> str:
+        if not self.non_null_count:
+            return 'VARCHAR'  # Default type when there are no values at all
+        if self.candidates:
+            return self.candidates[0]
+        return f'VARCHAR({self.max_length})'
+
+
+def infer_column_type(values: pd.Series) -> str:
+    """Infer the SQL type of a column of string values."""
+    state = ColumnTypeState()
+    state.update(values)
+    return state.inferred_type
@@ -0,0 +1,83 @@
+# make_drawio_erd/profiling.py
+
+import contextlib
+import json
+import time
+import tracemalloc
+
+
+class NullProfiler:
+    """Profiler that records nothing; the default of ERDGenerator."""
+
+    def phase(self, name: str):
+        return contextlib.nullcontext()
+
+    def count(self, name: str, value: int = 1):
+        pass
+
+
+class PhaseProfiler:
+    """Collect wall time, peak memory and counts for the stages of a run.
+
+    Any object with the same phase() and count() methods can be passed to
+    ERDGenerator(profiler=...) to receive its measurements. A stage can be
+    entered many times (e.g. once per table); its time is summed and its
+    peak_bytes is the most memory allocated above the level at entry, over
+    all its calls. Phases can be nested, e.g. filter within parse; the outer
+    phase's time and memory include the inner one's.
+    """
+
+    def __init__(self, trace_memory: bool = True):
+        self.trace_memory = trace_memory
+        self.phases = {}
+        self.counts = {}
+        self._started = time.perf_counter()
+        # [traced bytes at entry, highest traced peak seen] of each open phase
+        self._open_phases = []
+        self._owns_tracing = trace_memory and not tracemalloc.is_tracing()
+        if self._owns_tracing:
+            tracemalloc.start()
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._open_phases:
+                # The peak is reset below; keep the enclosing phase's so far
+                self._open_phases[-1][1] = max(self._open_phases[-1][1], peak)
+            self._open_phases.append([current, 0])
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            stats = self.phases.setdefault(name, {'seconds': 0.0, 'calls': 0, 'peak_bytes': 0})
+            stats['seconds'] += elapsed
+            stats['calls'] += 1
+            if self.trace_memory:
+                entry, nested_peak = self._open_phases.pop()
+                peak = max(nested_peak, tracemalloc.get_traced_memory()[1])
+                stats['peak_bytes'] = max(stats['peak_bytes'], peak - entry)
+                if self._open_phases:
+                    self._open_phases[-1][1] = max(self._open_phases[-1][1], peak)
+
+    def count(self, name: str, value: int = 1):
+        self.counts[name] = self.counts.get(name, 0) + value
+
+    def report(self) -> dict:
+        return {
+            'total_seconds': time.perf_counter() - self._started,
+            'peak_bytes': max((stats['peak_bytes'] for stats in self.phases.values()), default=0),
+            'phases': self.phases,
+            'counts': self.counts,
+        }
+
+    def write_report(self, fp):
+        json.dump(self.report(), fp, indent=2)
+        fp.write('\n')
+
+    def stop(self):
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
@@ -0,0 +1,144 @@
+# make_drawio_erd/schema.py
+
+# Compact in-memory schema model used by ERDGenerator: one Table record per
+# table holding its Column records, in diagram order.
+
+import pandas as pd
+
+# Metadata columns read into Column records, with their defaults
+TEXT_COLUMNS = ['Catalog', 'Database', 'Table', 'Column', 'Type',
+                'References_Catalog', 'References_Database', 'References_Table', 'References_Column']
+NUMERIC_COLUMNS = ['Column_Order', 'Is_Primary_Key', 'Is_Foreign_Key']
+
+
+class Column:
+    """One column of a table. `references` is the (catalog, database, table,
+    column) a foreign key points to, or None."""
+
+    __slots__ = ('name', 'type', 'order', 'is_primary_key', 'is_foreign_key', 'references')
+
+    def __init__(self, name: str, type: str = '', order: int = 0, is_primary_key: bool = False,
+                 is_foreign_key: bool = False, references: tuple = None):
+        self.name = name
+        self.type = type
+        self.order = order
+        self.is_primary_key = is_primary_key
+        self.is_foreign_key = is_foreign_key
+        self.references = references
+
+    def __repr__(self):
+        return f'Column({self.name!r}, {self.type!r})'
+
+
+class Table:
+    """A table and its columns, sorted by column order."""
+
+    __slots__ = ('catalog', 'database', 'name', 'columns')
+
+    def __init__(self, catalog: str, database: str, name: str, columns=None):
+        self.catalog = catalog
+        self.database = database
+        self.name = name
+        self.columns = list(columns) if columns is not None else []
+
+    @property
+    def key(self) -> tuple:
+        return (self.catalog, self.database, self.name)
+
+    @property
+    def full_name(self) -> str:
+        # The table name, qualified by whichever of catalog and database are set
+        return '.'.join(part for part in self.key if part)
+
+    def __repr__(self):
+        return f'Table({self.full_name!r}, {len(self.columns)} columns)'
+
+
+def _text_values(df: pd.DataFrame, column: str) -> list:
+    # Column values as strings, with '' for missing values or a missing column
+    if column not in df.columns:
+        return [''] * len(df)
+    values = df[column]
+    return values.astype(object).where(values.notna(), '').astype(str).tolist()
+
+
+def _int_values(df: pd.DataFrame, column: str, missing=0) -> list:
+    # Column values as ints, with `missing` for missing or non-numeric values
+    if column not in df.columns:
+        return [missing] * len(df)
+    values = pd.to_numeric(df[column], errors='coerce')
+    ints = values.fillna(0).astype(int)
+    if missing == 0:
+        return ints.tolist()
+    return ints.astype(object).where(values.notna(), missing).tolist()
+
+
+def _iter_columns(df: pd.DataFrame, missing_order=0):
+    # Yield ((catalog, database, table), Column) for each metadata row.
+    # Only the columns the diagram needs are read, one at a time, so the
+    # frame is never copied as a whole.
+    catalogs, databases, table_names, names, types, ref_catalogs, ref_databases, ref_tables, ref_columns = (
+        _text_values(df, column) for column in TEXT_COLUMNS
+    )
+    orders = _int_values(df, 'Column_Order', missing_order)
+    primary_keys = _int_values(df, 'Is_Primary_Key')
+    foreign_keys = _int_values(df, 'Is_Foreign_Key')
+
+    for catalog, database, table_name, name, type_name, order, primary_key, foreign_key, \
+            ref_catalog, ref_database, ref_table, ref_column in zip(
+                catalogs, databases, table_names, names, types, orders, primary_keys, foreign_keys,
+                ref_catalogs, ref_databases, ref_tables, ref_columns):
+        references = None
+        if ref_table:
+            # Unqualified references point into the same catalog and database
+            references = (ref_catalog or catalog, ref_database or database, ref_table, ref_column)
+        yield (catalog, database, table_name), Column(
+            name, type_name, order, primary_key == 1, foreign_key == 1, references
+        )
+
+
+def _sort_columns(table: Table) -> Table:
+    table.columns.sort(key=lambda column: column.order)
+    return table
+
+
+def tables_from_dataframe(df: pd.DataFrame) -> list:
+    """Build Table records from metadata in the standardized DataFrame format.
+
+    Tables keep their order of first appearance and their columns are sorted
+    by Column_Order (ties keep row order).
+    """
+    tables = {}
+    for key, column in _iter_columns(df):
+        table = tables.get(key)
+        if table is None:
+            table = tables[key] = Table(*key)
+        table.columns.append(column)
+    return [_sort_columns(table) for table in tables.values()]
+
+
+def iter_grouped_tables(chunks):
+    """Yield Table records, one at a time, from DataFrame chunks of metadata
+    whose rows are grouped by table (e.g. sorted by it).
+
+    Only the table being read is held in memory. A missing Column_Order is the
+    position of the row within its table, as MetaDataCSVParser.parse() fills
+    it. Raises ValueError when a table's rows are not contiguous.
+    """
+    emitted = set()
+    current = None
+    for chunk in chunks:
+        for key, column in _iter_columns(chunk, missing_order=None):
+            if current is None or key != current.key:
+                if current is not None:
+                    emitted.add(current.key)
+                    yield _sort_columns(current)
+                if key in emitted:
+                    name = '.'.join(part for part in key if part)
+                    raise ValueError(f"The rows of table '{name}' are not contiguous; group the input by table to stream it.")
+                current = Table(*key)
+            if column.order is None:
+                column.order = len(current.columns) + 1
+            current.columns.append(column)
+    if current is not None:
+        yield _sort_columns(current)
@@ -0,0 +1,273 @@
+# make_drawio_erd/server.py
+
+# A long-running local service that parses a schema once and renders
+# diagrams of parts of it on request:
+#
+#   GET /erd?database=shop*&table=order*&layout=shelf   draw.io XML
+#   GET /metrics                                        statistics as JSON
+#
+# The schema is reloaded in the background when the source's fingerprint
+# changes, and rendered diagrams are kept in an LRU cache keyed by the schema
+# version, the table filter and the diagram options.
+
+import datetime
+import io
+import json
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from .erd_drawio import ERDGenerator
+from .filters import TableFilter
+from .layout import LAYOUTS
+from .schema import tables_from_dataframe
+
+logger = logging.getLogger(__name__)
+
+
+class SchemaStore:
+    """The tables parsed from one source, reloaded by a background thread
+    when the source's fingerprint changes. Sources without a fingerprint are
+    reloaded on every check."""
+
+    def __init__(self, parser, parse_kwargs=None, refresh_interval: float = 60):
+        self.parser = parser
+        self.parse_kwargs = parse_kwargs or {}
+        self.refresh_interval = refresh_interval
+        self.tables = []
+        self.fingerprint = None
+        self.version = 0  # Incremented by every load
+        self.loaded_at = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def load(self):
+        # Take the fingerprint first, so a change during parsing is seen by
+        # the next check
+        fingerprint = self.parser.fingerprint(**self.parse_kwargs)
+        tables = tables_from_dataframe(self.parser.parse(**self.parse_kwargs))
+        with self._lock:
+            self.tables = tables
+            self.fingerprint = fingerprint
+            self.version += 1
+            self.loaded_at = time.time()
+        logger.info(f'Loaded {len(tables)} tables (schema version {self.version}).')
+
+    def refresh(self) -> bool:
+        """Reload the schema if the source changed; return whether it did."""
+        fingerprint = self.parser.fingerprint(**self.parse_kwargs)
+        if fingerprint is not None and fingerprint == self.fingerprint:
+            return False
+        self.load()
+        return True
+
+    def snapshot(self):
+        """Return (version, tables) of the current schema."""
+        with self._lock:
+            return self.version, self.tables
+
+    def start(self):
+        """Check for changes every refresh_interval seconds until stop()."""
+        self._thread = threading.Thread(target=self._refresh_loop, name='schema-refresh', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _refresh_loop(self):
+        while not self._stopped.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception('Reloading the schema failed; serving the previous one.')
+
+
+class RenderCache:
+    """Thread-safe LRU cache of rendered diagrams, counting hits and misses."""
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'bytes': sum(len(value) for value in self._entries.values()),
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+class ERDService:
+    """Render diagrams of the tables of a SchemaStore for query parameters."""
+
+    def __init__(self, store: SchemaStore, render_cache_size: int = 128):
+        self.store = store
+        self.cache = RenderCache(render_cache_size)
+        self.renders = 0
+        self.render_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def render(self, params: dict) -> bytes:
+        """Return the draw.io XML for parse_qs()-style query parameters.
+
+        Raises ValueError for invalid parameters and LookupError when no
+        table matches.
+        """
+        table_filter, options, compress = request_options(params)
+        version, tables = self.store.snapshot()
+        key = (version, repr(table_filter), tuple(sorted(options.items())), compress)
+        body = self.cache.get(key)
+        if body is not None:
+            return body
+
+        start = time.perf_counter()
+        tables = table_filter.filter_tables(tables)
+        if not tables:
+            raise LookupError('No tables match the given patterns.')
+        out = io.StringIO()
+        ERDGenerator(tables, **options).write_drawio(out, compress=compress)
+        body = out.getvalue().encode('utf-8')
+        self.cache.put(key, body)
+        with self._lock:
+            self.renders += 1
+            self.render_seconds += time.perf_counter() - start
+        return body
+
+    def metrics(self) -> dict:
+        version, tables = self.store.snapshot()
+        loaded_at = self.store.loaded_at
+        with self._lock:
+            renders = {'count': self.renders, 'seconds': self.render_seconds}
+        return {
+            'schema': {
+                'version': version,
+                'tables': len(tables),
+                'loaded_at': datetime.datetime.fromtimestamp(loaded_at, datetime.timezone.utc).isoformat() if loaded_at else None,
+            },
+            'render_cache': self.cache.stats(),
+            'renders': renders,
+        }
+
+
+def request_options(params: dict):
+    """Return (TableFilter, ERDGenerator options, compress) for query parameters.
+
+    `match` and `exclude` are patterns of 'Catalog.Database.Table' names, and
+    `database` and `table` patterns of those parts; all are repeatable globs,
+    or regular expressions with regex=1.
+    """
+    def last(name, default):
+        values = params.get(name)
+        return values[-1] if values else default
+
+    regex = _flag(last('regex', '0'))
+    include = list(params.get('match', []))
+    databases, tables = params.get('database', []), params.get('table', [])
+    if databases or tables:
+        any_name = '.*' if regex else '*'
+        for database in databases or [any_name]:
+            for table in tables or [any_name]:
+                include.append(rf'.*\.(?:{database})\.(?:{table})' if regex else f'*.{database}.{table}')
+    try:
+        table_filter = TableFilter(include, params.get('exclude'), regex=regex)
+    except re.error as e:
+        raise ValueError(f'Invalid regular expression: {e}')
+
+    layout = last('layout', 'row')
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout '{layout}'. Choose from: {', '.join(LAYOUTS)}.")
+    options = {
+        'layout': layout,
+        'edges': _flag(last('edges', '1')),
+        'render': last('render', 'full'),
+        'show_types': _flag(last('show_types', '0')),
+    }
+    return table_filter, options, _flag(last('compress', '0'))
+
+
+def _flag(value: str) -> bool:
+    return value.lower() not in ('', '0', 'false', 'no', 'off')
+
+
+class ERDRequestHandler(BaseHTTPRequestHandler):
+    server_version = 'make_drawio_erd'
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        service = self.server.service
+        if url.path == '/erd':
+            try:
+                body = service.render(parse_qs(url.query))
+            except ValueError as e:
+                self._send(400, 'text/plain; charset=utf-8', str(e).encode('utf-8'))
+            except LookupError as e:
+                self._send(404, 'text/plain; charset=utf-8', str(e).encode('utf-8'))
+            else:
+                self._send(200, 'application/xml; charset=utf-8', body)
+        elif url.path == '/metrics':
+            self._send(200, 'application/json', json.dumps(service.metrics(), indent=2).encode('utf-8'))
+        else:
+            self._send(404, 'text/plain; charset=utf-8', b'Not found; use /erd or /metrics.')
+
+    def _send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.info('%s - %s', self.address_string(), format % args)
+
+
+def make_server(service: ERDService, host: str = '127.0.0.1', port: int = 8080) -> ThreadingHTTPServer:
+    """Return an HTTP server for the service, handling each request in a thread."""
+    server = ThreadingHTTPServer((host, port), ERDRequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+
+def serve(parser, parse_kwargs=None, host='127.0.0.1', port=8080, refresh_interval=60, render_cache_size=128):
+    """Load the parser's schema and serve diagrams of it until interrupted."""
+    store = SchemaStore(parser, parse_kwargs, refresh_interval)
+    store.load()
+    store.start()
+    server = make_server(ERDService(store, render_cache_size), host, port)
+    print(f'Serving ERD diagrams on http://{host}:{server.server_port}/erd')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        store.stop()
@@ -0,0 +1,191 @@
+# make_drawio_erd/update.py
+
+# Incremental update of an existing diagram: tables are matched by their
+# content-derived cell ids, so positions and edits survive a regeneration.
+
+import logging
+import xml.etree.ElementTree as ET
+from .drawio_file import write_drawio_document
+from .erd_drawio import table_cell_id, _open_tag
+from .layout import Y_OFFSET
+
+TABLE_ID_PREFIX = 'tbl-'
+EDGE_ID_PREFIX = 'fk-'
+
+logger = logging.getLogger(__name__)
+
+
+class ExistingDiagram:
+    """The cells of a previously generated diagram, grouped by table.
+
+    tables maps each table cell id to its cells (the table, its rows and their
+    labels) in document order, edges maps the ids of generated foreign key
+    edges to their cells, and other_cells keeps everything else the user added.
+    """
+
+    def __init__(self, model: ET.Element):
+        self.model = model
+        root = model.find('root')
+        cells = list(root) if root is not None else []
+        by_id = {cell.get('id'): cell for cell in cells}
+
+        self.tables = {}
+        self.edges = {}
+        self.other_cells = []
+        for cell in cells:
+            cell_id = cell.get('id')
+            if cell_id in ('0', '1'):
+                continue
+            owner = self._owner_table(cell, by_id)
+            if owner is not None:
+                self.tables.setdefault(owner, []).append(cell)
+            elif cell.get('edge') == '1' and cell_id.startswith(EDGE_ID_PREFIX):
+                self.edges[cell_id] = cell
+            else:
+                self.other_cells.append(cell)
+
+        if not self.tables and any((cell.get('style') or '').startswith('shape=table;') for cell in cells):
+            raise ValueError(
+                'The existing diagram has tables without stable cell ids; '
+                'it was made by an older version and must be regenerated once without --update.'
+            )
+
+    @staticmethod
+    def _owner_table(cell, by_id):
+        # Follow the parent chain up to a top-level generated table cell
+        seen = set()
+        while cell is not None and cell.get('id') not in seen:
+            cell_id = cell.get('id')
+            if cell_id.startswith(TABLE_ID_PREFIX) and cell.get('vertex') == '1' and cell.get('parent') == '1':
+                return cell_id
+            seen.add(cell_id)
+            cell = by_id.get(cell.get('parent'))
+        return None
+
+    def table_geometry(self, table_id):
+        """Return (x, y, width, height) of a table cell."""
+        geometry = self.tables[table_id][0].find('mxGeometry')
+        return tuple(
+            _number(geometry.get(name) if geometry is not None else None)
+            for name in ('x', 'y', 'width', 'height')
+        )
+
+
+def update_drawio(erd_generator, existing_model: ET.Element, fp, compress=False) -> dict:
+    """Write the generator's diagram, reusing what is unchanged from an existing one.
+
+    Tables are matched by cell id. Unchanged tables are copied as they are,
+    changed tables are regenerated at their old position, new tables are laid
+    out below the existing ones and removed tables are dropped. Generated edges
+    whose ends did not change keep their routing, and cells the user added are
+    kept unless they are attached to a removed cell.
+    Returns the number of added, changed, unchanged and removed tables.
+    """
+    existing = ExistingDiagram(existing_model)
+
+    erd_generator._initialize_xml()
+    tables = erd_generator._group_tables()
+    table_ids = [table_cell_id(*table.key) for table in tables]
+    sizes = erd_generator._table_sizes(tables)
+
+    # Kept tables stay where they are; new tables go below all of them
+    positions = [
+        existing.table_geometry(table_id)[:2] if table_id in existing.tables else None
+        for table_id in table_ids
+    ]
+    kept_bottoms = [
+        position[1] + height
+        for position, (width, height) in zip(positions, sizes)
+        if position is not None
+    ]
+    added = [i for i, position in enumerate(positions) if position is None]
+    if added:
+        added_positions, _ = erd_generator.layout.place([sizes[i] for i in added], erd_generator.between_table_width)
+        y_shift = 0
+        if kept_bottoms:
+            y_shift = max(kept_bottoms) + erd_generator.between_table_width - Y_OFFSET
+        for i, (x, y) in zip(added, added_positions):
+            positions[i] = (x, y + y_shift)
+
+    # Size the page to the bounding box, as ERDGenerator._layout_tables does
+    total_width = max((x + width for (x, y), (width, height) in zip(positions, sizes)), default=0)
+    total_height = max((y + height for (x, y), (width, height) in zip(positions, sizes)), default=0)
+    model = erd_generator.mxGraphModel
+    model.set('dx', str(total_width + erd_generator.between_table_width))
+    model.set('pageWidth', str(total_width + erd_generator.between_table_width + 100))
+    model.set('pageHeight', str(max(1100, total_height + 100)))
+
+    counts = {'added': len(added), 'changed': 0, 'unchanged': 0, 'removed': 0}
+    current_ids = set(table_ids)
+    removed_ids = set()
+    for table_id, cells in existing.tables.items():
+        if table_id not in current_ids:
+            counts['removed'] += 1
+            removed_ids.update(cell.get('id') for cell in cells)
+
+    def write_model(out):
+        out.write(_open_tag(model))
+        out.write('<root>')
+        for reserved_cell in erd_generator.root:
+            out.write(ET.tostring(reserved_cell, encoding='unicode'))
+
+        for table_id, cells in zip(table_ids, erd_generator._iter_table_cells(tables, positions)):
+            old_cells = existing.tables.get(table_id)
+            if old_cells is not None:
+                if _table_signature(old_cells) == _table_signature(cells):
+                    counts['unchanged'] += 1
+                    cells = old_cells
+                else:
+                    counts['changed'] += 1
+                    removed_ids.update(cell.get('id') for cell in old_cells)
+                    removed_ids.difference_update(cell.get('id') for cell in cells)
+            for cell in cells:
+                out.write(ET.tostring(cell, encoding='unicode'))
+
+        for cell in erd_generator._iter_edge_cells():
+            old_cell = existing.edges.get(cell.get('id'))
+            if old_cell is not None and _same_ends(old_cell, cell):
+                cell = old_cell
+            out.write(ET.tostring(cell, encoding='unicode'))
+
+        for cell in existing.other_cells:
+            if not removed_ids.intersection((cell.get('parent'), cell.get('source'), cell.get('target'))):
+                out.write(ET.tostring(cell, encoding='unicode'))
+        out.write('</root></mxGraphModel>')
+
+    write_drawio_document(fp, write_model, compress)
+    logger.info(
+        f"Updated diagram: {counts['added']} added, {counts['changed']} changed, "
+        f"{counts['unchanged']} unchanged and {counts['removed']} removed tables."
+    )
+    return counts
+
+
+def _table_signature(cells):
+    # Everything about a table's cells except where the table is placed.
+    # Attributes are sorted since draw.io may reorder them when saving.
+    tag, attributes, children = _element_signature(cells[0])
+    children = tuple(
+        (child_tag, tuple(item for item in child_attributes if item[0] not in ('x', 'y')), grandchildren)
+        if child_tag == 'mxGeometry' else (child_tag, child_attributes, grandchildren)
+        for child_tag, child_attributes, grandchildren in children
+    )
+    return [(tag, attributes, children)] + [_element_signature(cell) for cell in cells[1:]]
+
+
+def _element_signature(element):
+    return (
+        element.tag,
+        tuple(sorted(element.attrib.items())),
+        tuple(_element_signature(child) for child in element),
+    )
+
+
+def _same_ends(old_cell, new_cell):
+    return all(old_cell.get(name) == new_cell.get(name) for name in ('source', 'target'))
+
+
+def _number(text):
+    # Geometry values as int where possible, so they are written back unchanged
+    value = float(text or 0)
+    return int(value) if value.is_integer() else value
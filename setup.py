@@ -5,16 +5,23 @@ from setuptools import setup, find_packages
 setup(
     name='make_drawio_erd',
     version='0.1.0',
-    packages=find_packages(),
+    packages=find_packages(exclude=['benchmarks', 'benchmarks.*']),
     install_requires=[
-        'pandas',
+        # requirements.txt pins the version tested; pandas 3 works as well
+        'pandas>=2.2.3',
         # Include other dependencies
     ],
+    extras_require={
+        # Only needed by the mysql command
+        'mysql': ['SQLAlchemy', 'PyMySQL', 'python-dotenv'],
+        # Only needed by the postgres command
+        'postgres': ['SQLAlchemy', 'psycopg2-binary', 'python-dotenv'],
+    },
     entry_points={
         'console_scripts': [
-            'make_drawio_erd=make_drawio_erd.cli:main',
+            'make-drawio-erd=make_drawio_erd.cli:main',
         ],
-    },    
+    },
     author='Fred Trotter',
     author_email='fred.trotter@careset.com',
     description='A package to generate draw.io XML files with simple ERD table diagrams from various data sources.',
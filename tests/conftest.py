@@ -0,0 +1,106 @@
+# tests/conftest.py
+
+import sqlite3
+import pytest
+
+# Stand-in for MySQL's information_schema: the tables and columns that
+# MySQLSchemaParser reads, filled with three schemas. 'shop_archive' and
+# 'shopXarchive' tell whether the '_' of a glob is matched literally.
+INFORMATION_SCHEMA = """
+CREATE TABLE SCHEMATA (SCHEMA_NAME TEXT);
+CREATE TABLE TABLES (TABLE_SCHEMA TEXT, TABLE_NAME TEXT, CREATE_TIME TEXT, UPDATE_TIME TEXT);
+CREATE TABLE COLUMNS (TABLE_SCHEMA TEXT, TABLE_NAME TEXT, COLUMN_NAME TEXT, DATA_TYPE TEXT, ORDINAL_POSITION INTEGER);
+CREATE TABLE KEY_COLUMN_USAGE (
+    TABLE_SCHEMA TEXT, TABLE_NAME TEXT, COLUMN_NAME TEXT, CONSTRAINT_NAME TEXT,
+    REFERENCED_TABLE_SCHEMA TEXT, REFERENCED_TABLE_NAME TEXT, REFERENCED_COLUMN_NAME TEXT
+);
+
+INSERT INTO SCHEMATA VALUES ('mysql'), ('shop'), ('shop_archive'), ('shopXarchive');
+
+INSERT INTO TABLES VALUES
+    ('mysql', 'user', '2024-01-01', NULL),
+    ('shop', 'customers', '2024-01-01', NULL),
+    ('shop', 'orders', '2024-01-02', '2024-02-01'),
+    ('shop', 'order_items', '2024-01-03', NULL),
+    ('shop_archive', 'orders', '2024-01-04', NULL),
+    ('shopXarchive', 'orders', '2024-01-05', NULL);
+
+INSERT INTO COLUMNS VALUES
+    ('mysql', 'user', 'User', 'char', 1),
+    ('shop', 'customers', 'id', 'int', 1),
+    ('shop', 'customers', 'name', 'varchar', 2),
+    ('shop', 'orders', 'id', 'int', 1),
+    ('shop', 'orders', 'customer_id', 'int', 2),
+    ('shop', 'order_items', 'order_id', 'int', 1),
+    ('shop', 'order_items', 'line', 'int', 2),
+    ('shop', 'order_items', 'quantity', 'int', 3),
+    ('shop_archive', 'orders', 'id', 'int', 1),
+    ('shopXarchive', 'orders', 'id', 'int', 1);
+
+-- order_items.order_id is part of the composite primary key and a foreign
+-- key; it also has a second foreign key with a larger constraint name
+INSERT INTO KEY_COLUMN_USAGE VALUES
+    ('mysql', 'user', 'User', 'PRIMARY', NULL, NULL, NULL),
+    ('shop', 'customers', 'id', 'PRIMARY', NULL, NULL, NULL),
+    ('shop', 'orders', 'id', 'PRIMARY', NULL, NULL, NULL),
+    ('shop', 'orders', 'customer_id', 'fk_orders_customer', 'shop', 'customers', 'id'),
+    ('shop', 'order_items', 'order_id', 'PRIMARY', NULL, NULL, NULL),
+    ('shop', 'order_items', 'line', 'PRIMARY', NULL, NULL, NULL),
+    ('shop', 'order_items', 'order_id', 'fk_items_order', 'shop', 'orders', 'id'),
+    ('shop', 'order_items', 'order_id', 'fk_items_zarchive', 'shop_archive', 'orders', 'id'),
+    ('shop_archive', 'orders', 'id', 'PRIMARY', NULL, NULL, NULL),
+    ('shopXarchive', 'orders', 'id', 'PRIMARY', NULL, NULL, NULL);
+"""
+
+# A SQLite database with a composite primary key, a composite foreign key,
+# a foreign key to an implicit primary key, and a view
+SQLITE_SCHEMA = """
+CREATE TABLE customers (id INTEGER PRIMARY KEY, name TEXT);
+CREATE TABLE orders (
+    id INTEGER PRIMARY KEY,
+    customer_id INTEGER REFERENCES customers
+);
+CREATE TABLE order_items (
+    order_id INTEGER REFERENCES orders (id),
+    line INTEGER,
+    quantity INTEGER,
+    PRIMARY KEY (order_id, line)
+);
+CREATE TABLE shipments (
+    id INTEGER PRIMARY KEY,
+    order_id INTEGER,
+    line INTEGER,
+    FOREIGN KEY (order_id, line) REFERENCES order_items (order_id, line)
+);
+CREATE VIEW big_orders AS SELECT order_id, quantity FROM order_items WHERE quantity > 10;
+"""
+
+
+@pytest.fixture
+def mysql_engine(tmp_path):
+    """A SQLAlchemy engine on SQLite whose connections attach a stand-in
+    information_schema, for MySQLSchemaParser(engine=...)."""
+    sqlalchemy = pytest.importorskip('sqlalchemy')
+    information_schema_path = str(tmp_path / 'information_schema.db')
+    with sqlite3.connect(information_schema_path) as connection:
+        connection.executescript(INFORMATION_SCHEMA)
+    connection.close()
+
+    engine = sqlalchemy.create_engine(f"sqlite:///{tmp_path / 'main.db'}")
+
+    @sqlalchemy.event.listens_for(engine, 'connect')
+    def attach_information_schema(dbapi_connection, connection_record):
+        dbapi_connection.execute('ATTACH DATABASE ? AS information_schema', (information_schema_path,))
+
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def sqlite_path(tmp_path):
+    """Path of a SQLite database file holding SQLITE_SCHEMA."""
+    path = tmp_path / 'app.db'
+    with sqlite3.connect(path) as connection:
+        connection.executescript(SQLITE_SCHEMA)
+    connection.close()
+    return str(path)
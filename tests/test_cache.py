@@ -0,0 +1,47 @@
+# tests/test_cache.py
+
+import os
+import pytest
+from make_drawio_erd import cache
+from make_drawio_erd.cache import CachedParser, MetadataCache
+from make_drawio_erd.parsers.metadata_csv_parser import MetaDataCSVParser
+
+METADATA_CSV = os.path.join(os.path.dirname(__file__), 'data', 'metadata.csv')
+
+CACHE_FORMATS = [
+    'pickle',
+    pytest.param('feather', marks=pytest.mark.skipif(cache.CACHE_FORMAT != 'feather', reason='needs pyarrow')),
+]
+
+
+@pytest.fixture(params=CACHE_FORMATS)
+def cached_parser(request, tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, 'CACHE_FORMAT', request.param)
+    return CachedParser(MetaDataCSVParser(METADATA_CSV), MetadataCache(str(tmp_path)))
+
+
+def entry_paths(cached_parser):
+    return [entry.path for entry in os.scandir(cached_parser.cache.cache_dir)]
+
+
+def test_second_parse_reads_the_cache(cached_parser):
+    df = cached_parser.parse()
+    [path] = entry_paths(cached_parser)
+    assert cached_parser.cache.get(cached_parser._key()).equals(df)
+    assert path.endswith(cache.CACHE_FORMAT)
+
+
+@pytest.mark.parametrize('corrupt', [lambda data: data[:len(data) // 2], lambda data: b'', lambda data: b'garbage' * 10])
+def test_unreadable_entry_is_a_miss(cached_parser, corrupt):
+    df = cached_parser.parse()
+    [path] = entry_paths(cached_parser)
+    with open(path, 'rb') as f:
+        data = f.read()
+    with open(path, 'wb') as f:
+        f.write(corrupt(data))
+
+    assert cached_parser.cache.get(cached_parser._key()) is None
+    assert not os.path.exists(path)
+    # The source is parsed again and the entry rewritten
+    assert cached_parser.parse().equals(df)
+    assert entry_paths(cached_parser) == [path]
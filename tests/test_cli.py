@@ -0,0 +1,204 @@
+# tests/test_cli.py
+
+import logging
+import os
+import subprocess
+import sys
+import xml.etree.ElementTree as ET
+import pytest
+from make_drawio_erd.cli import HEAVY_MODULES, main
+from make_drawio_erd.drawio_file import read_drawio
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+
+# The rows of shop.orders are split by those of shop.customers, which
+# --stream only detects once the output is being written
+NON_CONTIGUOUS_CSV = """Catalog,Database,Table,Column,Type,Is_Primary_Key
+def,shop,orders,id,int,1
+def,shop,customers,id,int,1
+def,shop,orders,customer_id,int,0
+"""
+
+
+@pytest.fixture
+def diagram(tmp_path):
+    # A previously generated diagram, written by the command
+    output = tmp_path / 'erd.drawio'
+    main(['metadata', os.path.join(DATA_DIR, 'metadata.csv'), str(output), '--no-cache'])
+    return output
+
+
+def test_metadata_command_writes_golden_file(diagram):
+    with open(os.path.join(DATA_DIR, 'metadata.drawio'), encoding='utf-8') as f:
+        assert diagram.read_text(encoding='utf-8') == f.read()
+
+
+def cells_by_id(path):
+    [model] = read_drawio(str(path))
+    return {cell.get('id'): cell for cell in model.iter('mxCell')}
+
+
+def table_id(cells, full_name):
+    return next(cell_id for cell_id, cell in cells.items() if f'>{full_name}<' in (cell.get('value') or ''))
+
+
+def test_update_in_place(tmp_path, diagram, caplog):
+    caplog.set_level(logging.INFO, logger='make_drawio_erd.update')
+    cells = cells_by_id(diagram)
+    customers_id = table_id(cells, 'def.shop.customers')
+    orders_id = table_id(cells, 'def.shop.orders')
+    orders_geometry = dict(cells[orders_id].find('mxGeometry').attrib)
+
+    # Move a table and add a note, as a user would in draw.io
+    tree = ET.parse(diagram)
+    root = tree.getroot().find('root')
+    for cell in root:
+        if cell.get('id') == customers_id:
+            cell.find('mxGeometry').set('x', '1000')
+            cell.find('mxGeometry').set('y', '700')
+    note = ET.SubElement(root, 'mxCell', {'id': 'note-1', 'value': 'Ask about orders', 'vertex': '1', 'parent': '1'})
+    ET.SubElement(note, 'mxGeometry', {'x': '10', 'y': '10', 'width': '100', 'height': '40', 'as': 'geometry'})
+    tree.write(diagram, encoding='utf-8', xml_declaration=True)
+
+    # Rename a column of orders and add a table
+    with open(os.path.join(DATA_DIR, 'metadata.csv'), encoding='utf-8') as f:
+        metadata = f.read().replace(',placed_at,', ',ordered_at,')
+    metadata += 'def,stock,suppliers,admin,2024-01-01,id,int,1,suppliers,1,0,,,,\n'
+    metadata_csv = tmp_path / 'changed.csv'
+    metadata_csv.write_text(metadata, encoding='utf-8')
+    mode = diagram.stat().st_mode
+
+    main(['metadata', str(metadata_csv), str(diagram), '--update', str(diagram), '--no-cache'])
+
+    assert '1 added, 1 changed, 3 unchanged and 0 removed tables' in caplog.text
+    assert diagram.stat().st_mode == mode
+    cells = cells_by_id(diagram)
+    # The moved table and the note are kept
+    customers_geometry = cells[customers_id].find('mxGeometry')
+    assert (customers_geometry.get('x'), customers_geometry.get('y')) == ('1000', '700')
+    assert cells['note-1'].get('value') == 'Ask about orders'
+    # The changed table is regenerated where it was
+    labels = [cell.get('value') for cell in cells.values() if cell.get('id', '').startswith(orders_id)]
+    assert 'ordered_at' in labels and 'placed_at' not in labels
+    assert dict(cells[orders_id].find('mxGeometry').attrib) == orders_geometry
+    # The new table is placed below all the others
+    suppliers_y = float(cells[table_id(cells, 'def.stock.suppliers')].find('mxGeometry').get('y'))
+    other_bottoms = [
+        float(cell.find('mxGeometry').get('y')) + float(cell.find('mxGeometry').get('height'))
+        for cell_id, cell in cells.items()
+        if cell_id.startswith('tbl-') and cell.get('parent') == '1' and '>def.stock.suppliers<' not in cell.get('value')
+    ]
+    assert suppliers_y > max(other_bottoms)
+
+
+def test_failed_update_keeps_previous_output(tmp_path, diagram, monkeypatch, caplog):
+    previous = diagram.read_bytes()
+
+    def failing_update(erd_generator, existing_model, fp, compress=False):
+        fp.write('<?xml')
+        raise RuntimeError('rendering failed')
+
+    monkeypatch.setattr('make_drawio_erd.update.update_drawio', failing_update)
+    with pytest.raises(SystemExit):
+        main(['metadata', os.path.join(DATA_DIR, 'metadata.csv'), str(diagram), '--update', str(diagram), '--no-cache'])
+
+    assert 'rendering failed' in caplog.text
+    assert diagram.read_bytes() == previous
+    assert os.listdir(tmp_path) == ['erd.drawio']
+
+
+@pytest.mark.parametrize('update', [False, True])
+def test_failed_stream_keeps_previous_output(tmp_path, diagram, caplog, update):
+    previous = diagram.read_bytes()
+    bad_csv = tmp_path / 'bad.csv'
+    bad_csv.write_text(NON_CONTIGUOUS_CSV, encoding='utf-8')
+
+    argv = ['metadata', str(bad_csv), str(diagram), '--stream', '--no-cache']
+    if update:
+        argv += ['--update', str(diagram)]
+    with pytest.raises(SystemExit):
+        main(argv)
+
+    assert 'are not contiguous' in caplog.text
+    assert diagram.read_bytes() == previous
+    assert sorted(os.listdir(tmp_path)) == ['bad.csv', 'erd.drawio']
+
+
+@pytest.mark.parametrize('statement', [
+    'import make_drawio_erd.cli',
+    'from make_drawio_erd.cli import build_parser; build_parser().parse_args(["metadata", "in.csv", "out.drawio"])',
+])
+def test_starting_the_command_loads_no_heavy_modules(statement):
+    # In a fresh interpreter, since this one has already imported them
+    script = f'import sys\n{statement}\nprint(" ".join(name for name in {HEAVY_MODULES!r} if name in sys.modules))'
+    output = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True, cwd=ROOT_DIR)
+    assert output.stdout.split() == []
+
+
+# Generous, so that slow machines pass: the import takes tens of milliseconds,
+# importing pandas hundreds
+IMPORT_BUDGET_SECONDS = 0.5
+
+
+def test_importing_the_command_is_fast():
+    # -X importtime reports each module's cumulative import time in
+    # microseconds on stderr, as 'import time: self | cumulative | name'
+    output = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import make_drawio_erd.cli'],
+        capture_output=True, text=True, check=True, cwd=ROOT_DIR
+    )
+    times = {}
+    for line in output.stderr.splitlines():
+        fields = [field.strip() for field in line.split('|')]
+        if len(fields) == 3 and fields[1].isdigit():
+            times[fields[2]] = int(fields[1]) / 1e6
+    assert times['make_drawio_erd.cli'] < IMPORT_BUDGET_SECONDS
+
+
+@pytest.mark.parametrize('option', [['--page-by', 'Database'], ['--max-tables-per-page', '2'], ['--update', '{diagram}']])
+def test_fragments_reject_paged_and_update_output(tmp_path, diagram, caplog, option):
+    previous = diagram.read_bytes()
+    option = [arg.format(diagram=diagram) for arg in option]
+    with pytest.raises(SystemExit):
+        main(['metadata', os.path.join(DATA_DIR, 'metadata.csv'), str(diagram), '--fragments', '--no-cache'] + option)
+    assert '--fragments only supports' in caplog.text
+    assert diagram.read_bytes() == previous
+
+
+def read_pages(path):
+    # {page name: mxGraphModel} of a multi-page diagram
+    names = [diagram.get('name') for diagram in ET.parse(path).getroot().findall('diagram')]
+    return dict(zip(names, read_drawio(str(path))))
+
+
+def edge_count(model):
+    return sum(1 for cell in model.iter('mxCell') if cell.get('edge') == '1')
+
+
+def test_page_by_database(tmp_path):
+    output = tmp_path / 'erd.drawio'
+    main(['metadata', os.path.join(DATA_DIR, 'metadata.csv'), str(output), '--page-by', 'Database', '--no-cache', '--jobs', '1'])
+
+    pages = read_pages(output)
+    assert list(pages) == ['shop', 'stock']
+    # Two reserved cells, 3 tables of 3 columns with a row and 2 label cells
+    # each, and the 2 edges within shop; order_items.product_id points to
+    # stock and is dropped
+    assert len(list(pages['shop'].iter('mxCell'))) == 34
+    assert edge_count(pages['shop']) == 2
+    assert edge_count(pages['stock']) == 0
+
+
+def test_max_tables_per_page(tmp_path):
+    output = tmp_path / 'erd.drawio'
+    main(['metadata', os.path.join(DATA_DIR, 'metadata.csv'), str(output),
+          '--page-by', 'Database', '--max-tables-per-page', '2', '--compress', '--no-cache', '--jobs', '1'])
+
+    pages = read_pages(output)
+    assert list(pages) == ['shop', 'shop (2)', 'stock']
+    table_counts = [sum(1 for cell in model.iter('mxCell') if cell.get('parent') == '1' and cell.get('vertex') == '1')
+                    for model in pages.values()]
+    assert table_counts == [2, 1, 1]
+    # customers and orders share the first page; order_items is alone
+    assert [edge_count(model) for model in pages.values()] == [1, 0, 0]
@@ -0,0 +1,71 @@
+# tests/test_csv_data_parser.py
+
+import pandas as pd
+import pytest
+from make_drawio_erd.parsers.csv_data_parser import CSVDataParser, csv_table_names
+
+
+def write_csv(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding='utf-8')
+
+
+def test_table_names_are_base_names_when_unique(tmp_path):
+    paths = [str(tmp_path / 'a' / 'orders.csv'), str(tmp_path / 'b' / 'items.csv')]
+    assert csv_table_names(paths) == ['orders.csv', 'items.csv']
+
+
+def test_repeated_base_names_are_qualified_by_directory(tmp_path):
+    write_csv(tmp_path / 'a' / 'part.csv', 'id,name\n1,x\n2,y\n3,z\n')
+    write_csv(tmp_path / 'b' / 'part.csv', 'id,a_id\n1,1\n2,2\n3,3\n')
+
+    df = CSVDataParser(str(tmp_path / '*' / 'part.csv'), jobs=1, discover_keys=True).parse()
+
+    assert df['Table'].unique().tolist() == ['a/part.csv', 'b/part.csv']
+    assert len(df) == 4
+
+
+def test_same_file_twice_is_rejected(tmp_path):
+    write_csv(tmp_path / 'part.csv', 'id\n1\n')
+    with pytest.raises(ValueError, match='part.csv'):
+        csv_table_names([str(tmp_path / 'part.csv'), str(tmp_path / '.' / 'part.csv')])
+
+
+@pytest.mark.parametrize('sampling, expected', [('head', 'INT'), ('full-scan', 'DECIMAL')])
+def test_late_decimal_is_found_by_full_scan(tmp_path, sampling, expected):
+    rows = [str(i) for i in range(200)]
+    rows[150] = '2.5'
+    write_csv(tmp_path / 'late.csv', 'amount\n' + '\n'.join(rows) + '\n')
+
+    parser = CSVDataParser(str(tmp_path / 'late.csv'), sample_size=100, sampling=sampling, chunksize=32)
+    assert parser.parse()['Type'].tolist() == [expected]
+
+
+def write_numbered_csv(path, count, text_from):
+    # An id column, and a value column that turns to text from row text_from
+    rows = [f'{i},{i if i < text_from else "x" + str(i)}' for i in range(count)]
+    write_csv(path, 'id,value\n' + '\n'.join(rows) + '\n')
+
+
+def test_reservoir_sampling_is_reproducible_with_a_seed(tmp_path):
+    write_numbered_csv(tmp_path / 'data.csv', 1000, 1000)
+    samples = [
+        CSVDataParser(str(tmp_path / 'data.csv'), sample_size=50, sampling='reservoir', chunksize=64, random_seed=7)
+        ._reservoir_sample(str(tmp_path / 'data.csv'))
+        for _ in range(2)
+    ]
+    assert samples[0].equals(samples[1])
+    assert len(samples[0]) == 50
+    # The sample reaches past the first sample_size rows
+    assert pd.to_numeric(samples[0]['id']).max() >= 50
+
+
+def test_reservoir_sampling_sees_rows_beyond_the_head(tmp_path):
+    write_numbered_csv(tmp_path / 'data.csv', 1000, 50)
+    path = str(tmp_path / 'data.csv')
+    head = CSVDataParser(path, sample_size=50, sampling='head').parse()
+    reservoir = CSVDataParser(path, sample_size=50, sampling='reservoir', chunksize=64, random_seed=7).parse()
+    assert head['Type'].tolist() == ['INT', 'INT']
+    assert reservoir['Type'].tolist()[0] == 'INT'
+    assert reservoir['Type'].tolist()[1].startswith('VARCHAR')
+    assert reservoir.equals(CSVDataParser(path, sample_size=50, sampling='reservoir', chunksize=64, random_seed=7).parse())
@@ -0,0 +1,225 @@
+# tests/test_erd_drawio.py
+
+import io
+import os
+import re
+import xml.etree.ElementTree as ET
+import pytest
+from make_drawio_erd import erd_drawio
+from make_drawio_erd.cache import FragmentCache
+from make_drawio_erd.drawio_file import decompress_diagram, read_drawio
+from make_drawio_erd.erd_drawio import ERDGenerator
+from make_drawio_erd.parallel import ordered_process_map
+from make_drawio_erd.parsers.metadata_csv_parser import MetaDataCSVParser
+from make_drawio_erd.profiling import PhaseProfiler
+from make_drawio_erd.schema import Column, Table
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+METADATA_CSV = os.path.join(DATA_DIR, 'metadata.csv')
+# Regenerate with ERDGenerator(df).write_drawio() only when the output is
+# meant to change
+GOLDEN_DRAWIO = os.path.join(DATA_DIR, 'metadata.drawio')
+# Written by the original generator, which numbered cells sequentially and
+# drew no edges
+BASELINE_DRAWIO = os.path.join(DATA_DIR, 'metadata.baseline.drawio')
+
+
+def read_golden():
+    with open(GOLDEN_DRAWIO, encoding='utf-8', newline='') as f:
+        return f.read()
+
+
+def renumber_cell_ids(xml_str):
+    # Replace cell ids, and the references to them, by sequence numbers in
+    # order of appearance, as the original generator assigned them
+    ids = {}
+    for match in re.finditer(r' id="([^"]*)"', xml_str):
+        ids.setdefault(match.group(1), str(len(ids)))
+    return re.sub(
+        r' (id|parent|source|target)="([^"]*)"',
+        lambda match: f' {match.group(1)}="{ids[match.group(2)]}"',
+        xml_str
+    )
+
+
+def test_output_matches_baseline_generator():
+    df = MetaDataCSVParser(METADATA_CSV).parse()
+    out = io.StringIO()
+    ERDGenerator(df, edges=False).write_drawio(out)
+    with open(BASELINE_DRAWIO, encoding='utf-8', newline='') as f:
+        assert renumber_cell_ids(out.getvalue()) == f.read()
+
+
+def test_write_drawio_matches_golden_file():
+    df = MetaDataCSVParser(METADATA_CSV).parse()
+    out = io.StringIO()
+    ERDGenerator(df).write_drawio(out)
+    assert out.getvalue() == read_golden()
+
+
+def test_generate_drawio_xml_matches_golden_file():
+    df = MetaDataCSVParser(METADATA_CSV).parse()
+    assert ERDGenerator(df).generate_drawio_xml() == read_golden()
+
+
+def test_streamed_tables_match_golden_file():
+    tables = MetaDataCSVParser(METADATA_CSV).iter_tables()
+    out = io.StringIO()
+    ERDGenerator(tables).write_drawio(out)
+    assert out.getvalue() == read_golden()
+
+
+def test_fragments_match_golden_file_and_counts():
+    df = MetaDataCSVParser(METADATA_CSV).parse()
+    counts = {}
+    for fragments in (False, True):
+        profiler = PhaseProfiler(trace_memory=False)
+        out = io.StringIO()
+        ERDGenerator(df, fragments=fragments, jobs=1, profiler=profiler).write_drawio(out)
+        assert out.getvalue() == read_golden()
+        counts[fragments] = {name: profiler.counts[name] for name in ('tables', 'columns', 'cells', 'edges')}
+    assert counts[True] == counts[False]
+
+
+def test_fragment_rerun_submits_only_changed_tables(tmp_path, monkeypatch):
+    tasks = []
+
+    def render_fragments(tables, options):
+        tasks.append([table.name for table, _ in tables])
+        return real_render_fragments(tables, options)
+
+    real_render_fragments = erd_drawio._render_fragments
+    monkeypatch.setattr(erd_drawio, '_render_fragments', render_fragments)
+    monkeypatch.setattr(erd_drawio, 'FRAGMENT_BATCH_SIZE', 2)
+    cache = FragmentCache(str(tmp_path))
+    df = MetaDataCSVParser(METADATA_CSV).parse()
+
+    def rerun(df):
+        tasks.clear()
+        out = io.StringIO()
+        profiler = PhaseProfiler(trace_memory=False)
+        ERDGenerator(df, fragments=True, jobs=1, fragment_cache=cache, profiler=profiler).write_drawio(out)
+        return out.getvalue(), profiler.counts
+
+    output, counts = rerun(df)
+    assert output == read_golden()
+    assert tasks == [['customers', 'orders'], ['order_items', 'products']]
+    assert counts['fragments_rendered'] == 4
+
+    # Every batch is cached: nothing is sent to the pool
+    output, counts = rerun(df)
+    assert output == read_golden()
+    assert tasks == []
+    assert counts['fragments_cached'] == 4
+
+    # Only the changed table is rendered
+    changed = df.copy()
+    changed['Column'] = changed['Column'].where(changed['Column'] != 'title', 'name')
+    output, counts = rerun(changed)
+    assert tasks == [['products']]
+    assert (counts['fragments_rendered'], counts['fragments_cached']) == (1, 3)
+
+
+def test_ordered_process_map_skips_none():
+    args = [(7, 2), None, (9, 4), None]
+    assert list(ordered_process_map(divmod, args, jobs=2)) == [(3, 1), None, (2, 1), None]
+    assert list(ordered_process_map(divmod, args, jobs=1)) == [(3, 1), None, (2, 1), None]
+
+
+def test_compressed_output_round_trips(tmp_path):
+    df = MetaDataCSVParser(METADATA_CSV).parse()
+    path = tmp_path / 'erd.drawio'
+    with open(path, 'w', encoding='utf-8') as f:
+        ERDGenerator(df).write_drawio(f, compress=True)
+
+    document = ET.parse(path).getroot()
+    assert document.tag == 'mxfile'
+    diagram_text = document.find('diagram').text
+    # The diagram inflates to the uncompressed model, after the XML declaration
+    assert decompress_diagram(diagram_text) == read_golden().split('\n', 1)[1]
+
+    [model] = read_drawio(str(path))
+    [golden_model] = read_drawio(GOLDEN_DRAWIO)
+    assert [cell.attrib for cell in model.iter('mxCell')] == [cell.attrib for cell in golden_model.iter('mxCell')]
+
+
+def make_tables(count):
+    # Tables of 1 to 7 columns, in no particular order of height
+    return [
+        Table('', 'db', f't{i}', [Column(f'c{j}', 'int', j + 1) for j in range((i * 5) % 7 + 1)])
+        for i in range(count)
+    ]
+
+
+def table_rectangles(xml_str):
+    # (x, y, width, height) of each table cell
+    rectangles = []
+    for cell in ET.fromstring(xml_str.split('\n', 1)[1]).iter('mxCell'):
+        if cell.get('parent') == '1' and cell.get('vertex') == '1':
+            geometry = cell.find('mxGeometry')
+            rectangles.append(tuple(float(geometry.get(name)) for name in ('x', 'y', 'width', 'height')))
+    return rectangles
+
+
+def overlap(a, b):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    return ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah
+
+
+@pytest.mark.parametrize('layout', ['shelf', 'skyline'])
+def test_packed_layouts_place_every_table_without_overlap(layout):
+    tables = make_tables(23)
+    out = io.StringIO()
+    ERDGenerator(tables, layout=layout, table_width=200).write_drawio(out)
+
+    rectangles = table_rectangles(out.getvalue())
+    assert len(rectangles) == len(tables)
+    for i, a in enumerate(rectangles):
+        for b in rectangles[i + 1:]:
+            assert not overlap(a, b)
+    # Packed into several rows, unlike the single row layout
+    assert len({y for _, y, _, _ in rectangles}) > 1
+
+
+def compact_tables():
+    # parents and children are joined by a foreign key; notes stands alone
+    return [
+        Table('', 'db', 'parents', [Column('id', 'int', 1, is_primary_key=True), Column('name', 'text', 2)]),
+        Table('', 'db', 'children', [
+            Column('id', 'int', 1, is_primary_key=True),
+            Column('parent_id', 'int', 2, is_foreign_key=True, references=('', 'db', 'parents', 'id')),
+        ]),
+        Table('', 'db', 'notes', [Column('id', 'int', 1), Column('body', 'text', 2), Column('at', 'date', 3)]),
+    ]
+
+
+def cells_per_table(xml_str):
+    # {table name: number of cells of the table}, and the number of edges
+    cells = list(ET.fromstring(xml_str.split('\n', 1)[1]).iter('mxCell'))
+    parents = {cell.get('id'): cell.get('parent') for cell in cells}
+    names = {
+        cell.get('id'): re.search(r'db\.(\w+)', cell.get('value')).group(1)
+        for cell in cells if cell.get('parent') == '1' and cell.get('vertex') == '1'
+    }
+    counts = dict.fromkeys(names.values(), 0)
+    for cell in cells:
+        cell_id = cell.get('id')
+        while cell_id not in names and cell_id in parents:
+            cell_id = parents[cell_id]
+        if cell_id in names:
+            counts[names[cell_id]] += 1
+    return counts, sum(1 for cell in cells if cell.get('edge') == '1')
+
+
+@pytest.mark.parametrize('edges, expected_cells, expected_edges', [
+    # Tables at the ends of an edge keep a row and two label cells per column
+    (True, {'parents': 7, 'children': 7, 'notes': 1}, 1),
+    (False, {'parents': 1, 'children': 1, 'notes': 1}, 0),
+])
+def test_compact_render(edges, expected_cells, expected_edges):
+    out = io.StringIO()
+    ERDGenerator(compact_tables(), render='compact', edges=edges, show_types=True).write_drawio(out)
+    assert cells_per_table(out.getvalue()) == (expected_cells, expected_edges)
+    if not edges:
+        assert '&lt;i style=&quot;color:#808080;&quot;&gt;date&lt;/i&gt;' in out.getvalue()
@@ -0,0 +1,31 @@
+# tests/test_filters.py
+
+import pandas as pd
+from make_drawio_erd.filters import TableFilter, glob_to_like
+
+NAMES = pd.Series(['def.shop.orders', 'def.shop.order_items', 'def.stock.products', 'def.shop.multi\nline'])
+
+
+def test_match_names_with_globs():
+    keep = TableFilter(['def.shop.*'], exclude=['*items']).match_names(NAMES)
+    assert keep.tolist() == [True, False, False, True]
+
+
+def test_match_names_with_regular_expressions():
+    keep = TableFilter([r'def\.s\w+\.orders?', r'.*line'], regex=True).match_names(NAMES)
+    assert keep.tolist() == [True, False, False, True]
+
+
+def test_match_names_agrees_with_match():
+    table_filter = TableFilter(['def.s[ht]o*'], exclude=['*.products'])
+    assert table_filter.match_names(NAMES).tolist() == [table_filter.match(name) for name in NAMES]
+
+
+def test_empty_filter_keeps_every_name():
+    assert TableFilter().match_names(NAMES).all()
+    assert TableFilter('*').match_names(NAMES.iloc[:0]).empty
+
+
+def test_glob_to_like_escapes_wildcards():
+    assert glob_to_like('shop_*') == 'shop!_%'
+    assert glob_to_like('100%?') == '100!%_'
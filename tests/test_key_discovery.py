@@ -0,0 +1,79 @@
+# tests/test_key_discovery.py
+
+import numpy as np
+import pandas as pd
+import pytest
+from make_drawio_erd.parsers.csv_data_parser import CSVDataParser
+from make_drawio_erd.parsers.key_discovery import BloomFilter, HyperLogLog, KMinValues, hash_values
+
+
+def hashes_of(values):
+    return hash_values(pd.Series([str(value) for value in values]))
+
+
+def test_hyperloglog_estimates_distinct_count():
+    sketch = HyperLogLog()
+    sketch.update(hashes_of(range(50000)))
+    sketch.update(hashes_of(range(25000)))  # Repeated values are not counted again
+    assert sketch.count() == pytest.approx(50000, rel=0.03)
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1 << 16)
+    bloom.add(hashes_of(range(1000)))
+    assert bloom.contains(hashes_of(range(1000))).all()
+    # About 1% false positives at 64 bits per value, far fewer than 10%
+    assert bloom.contains(hashes_of(range(1000, 11000))).mean() < 0.1
+
+
+def test_bloom_filter_size_must_be_a_power_of_two():
+    with pytest.raises(ValueError):
+        BloomFilter(1000)
+
+
+def test_k_min_values_keeps_the_smallest_distinct_hashes():
+    sample = KMinValues(k=10)
+    hashes = hashes_of(range(100))
+    sample.update(hashes[:50])
+    sample.update(hashes)
+    assert sample.hashes.tolist() == sorted(set(hashes.tolist()))[:10]
+
+
+@pytest.fixture
+def data_files(tmp_path):
+    # data0.csv holds ids 1..500; data1.csv references them through parent_id
+    rng = np.random.default_rng(0)
+    rows = 500
+    pd.DataFrame({
+        'id': np.arange(1, rows + 1),
+        'amount': np.round(rng.random(rows) * 100, 2),
+    }).to_csv(tmp_path / 'data0.csv', index=False)
+    pd.DataFrame({
+        'id': np.arange(1, rows + 1),
+        'parent_id': rng.integers(1, rows + 1, rows),
+        'label': rng.choice(['a', 'b', 'c'], rows),
+    }).to_csv(tmp_path / 'data1.csv', index=False)
+    return str(tmp_path / '*.csv')
+
+
+def keys(df):
+    primary_keys = df.loc[df['Is_Primary_Key'] == 1, ['Table', 'Column']]
+    foreign_keys = df.loc[df['Is_Foreign_Key'] == 1, ['Table', 'Column', 'References_Table', 'References_Column']]
+    return [tuple(row) for row in primary_keys.to_numpy()], [tuple(row) for row in foreign_keys.to_numpy()]
+
+
+def test_full_scan_finds_primary_and_foreign_keys(data_files):
+    df = CSVDataParser(data_files, sampling='full-scan', chunksize=64, jobs=1, discover_keys=True).parse()
+    primary_keys, foreign_keys = keys(df)
+    assert primary_keys == [('data0.csv', 'id'), ('data1.csv', 'id')]
+    assert foreign_keys == [('data1.csv', 'parent_id', 'data0.csv', 'id')]
+
+
+@pytest.mark.parametrize('sampling', ['head', 'reservoir'])
+def test_sampled_modes_find_primary_keys_only(data_files, sampling):
+    # The sampled parent_id values mostly fall outside the sampled ids, so
+    # foreign keys need a full scan of the referenced key
+    df = CSVDataParser(data_files, sample_size=100, sampling=sampling, random_seed=1, jobs=1, discover_keys=True).parse()
+    primary_keys, foreign_keys = keys(df)
+    assert primary_keys == [('data0.csv', 'id'), ('data1.csv', 'id')]
+    assert foreign_keys == []
@@ -0,0 +1,43 @@
+# tests/test_metadata_csv_parser.py
+
+import os
+import pandas as pd
+import pytest
+from make_drawio_erd.parsers import metadata_csv_parser
+from make_drawio_erd.parsers.metadata_csv_parser import HAS_PYARROW, MetaDataCSVParser
+
+METADATA_CSV = os.path.join(os.path.dirname(__file__), 'data', 'metadata.csv')
+
+# Without Column_Order, with a blank and a non-numeric flag, and with a
+# table whose rows come in two blocks
+MESSY_CSV = """Catalog,Database,Table,Column,Type,Is_Primary_Key,Is_Foreign_Key
+,app,users,id,int,1,0
+,app,users,name,text,,0
+,app,posts,id,int,1,0
+,app,posts,author,int,yes,1
+,app,users,email,text,0,0
+"""
+
+
+@pytest.mark.skipif(not HAS_PYARROW, reason='needs pyarrow')
+@pytest.mark.parametrize('text', [None, MESSY_CSV])
+def test_pyarrow_engine_matches_pandas_engine(tmp_path, monkeypatch, text):
+    path = METADATA_CSV
+    if text is not None:
+        path = str(tmp_path / 'messy.csv')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+    # Several blocks (at least a whole header line each) and chunks, so that
+    # their categories are merged
+    monkeypatch.setattr(metadata_csv_parser, 'PYARROW_BLOCK_SIZE', 512)
+
+    pyarrow_df = MetaDataCSVParser(path, engine='pyarrow').parse()
+    pandas_df = MetaDataCSVParser(path, engine='pandas', chunksize=2).parse()
+    # The order of categories follows the chunks; unordered categorical
+    # dtypes compare their categories as sets
+    assert pyarrow_df.dtypes.to_dict() == pandas_df.dtypes.to_dict()
+    pd.testing.assert_frame_equal(pyarrow_df, pandas_df, check_categorical=False)
+
+
+def test_default_engine():
+    assert MetaDataCSVParser(METADATA_CSV).engine == ('pyarrow' if HAS_PYARROW else 'pandas')
@@ -0,0 +1,75 @@
+# tests/test_mysql_schema_parser.py
+
+import pytest
+
+pytest.importorskip('sqlalchemy')
+pytest.importorskip('dotenv')
+
+from make_drawio_erd.parsers.mysql_schema_parser import MySQLSchemaParser
+
+
+def rows(df):
+    # (database, table, column, PK, FK, referenced table) of each column
+    return [
+        (row.Database, row.Table, row.Column, int(row.Is_Primary_Key), int(row.Is_Foreign_Key),
+         f'{row.References_Database}.{row.References_Table}.{row.References_Column}'.strip('.'))
+        for row in df.itertuples()
+    ]
+
+
+def describe(tables):
+    # Comparable contents of schema.Table records
+    return [
+        (table.key, [(column.name, column.is_primary_key, column.references) for column in table.columns])
+        for table in tables
+    ]
+
+
+SHOP_ROWS = [
+    ('shop', 'customers', 'id', 1, 0, ''),
+    ('shop', 'customers', 'name', 0, 0, ''),
+    ('shop', 'order_items', 'order_id', 1, 1, 'shop.orders.id'),
+    ('shop', 'order_items', 'line', 1, 0, ''),
+    ('shop', 'order_items', 'quantity', 0, 0, ''),
+    ('shop', 'orders', 'id', 1, 0, ''),
+    ('shop', 'orders', 'customer_id', 0, 1, 'shop.customers.id'),
+]
+
+
+@pytest.mark.parametrize('max_connections', [1, 3])
+def test_parse_one_row_per_column(mysql_engine, max_connections):
+    parser = MySQLSchemaParser(max_connections=max_connections, engine=mysql_engine)
+    df = parser.parse(include_databases='shop')
+    assert rows(df) == SHOP_ROWS
+
+
+@pytest.mark.parametrize('max_connections', [1, 3])
+def test_parse_skips_system_schemas(mysql_engine, max_connections):
+    df = MySQLSchemaParser(max_connections=max_connections, engine=mysql_engine).parse()
+    assert sorted(df['Database'].unique()) == ['shop', 'shopXarchive', 'shop_archive']
+
+
+@pytest.mark.parametrize('max_connections', [1, 3])
+def test_glob_underscore_is_literal(mysql_engine, max_connections):
+    df = MySQLSchemaParser(max_connections=max_connections, engine=mysql_engine).parse(include_databases='shop_*')
+    assert df['Database'].unique().tolist() == ['shop_archive']
+
+
+@pytest.mark.parametrize('max_connections', [1, 3])
+def test_table_filters(mysql_engine, max_connections):
+    parser = MySQLSchemaParser(max_connections=max_connections, engine=mysql_engine)
+    df = parser.parse(include_databases='shop', include_tables='order*', exclude_tables='*items')
+    assert df['Table'].unique().tolist() == ['orders']
+
+
+def test_iter_tables_matches_parse(mysql_engine):
+    parser = MySQLSchemaParser(engine=mysql_engine)
+    tables = list(parser.iter_tables(include_databases='shop'))
+    assert describe(tables) == describe(parser.parse_tables(include_databases='shop'))
+    assert [table.key for table in tables] == [('', 'shop', 'customers'), ('', 'shop', 'order_items'), ('', 'shop', 'orders')]
+
+
+def test_fingerprint_follows_matching_tables(mysql_engine):
+    parser = MySQLSchemaParser(engine=mysql_engine)
+    assert parser.fingerprint(include_databases='shop') == parser.fingerprint(include_databases='shop')
+    assert parser.fingerprint(include_databases='shop') != parser.fingerprint(include_databases='shop_*')
@@ -0,0 +1,39 @@
+# tests/test_profiling.py
+
+import pandas as pd
+from make_drawio_erd.filters import TableFilter
+from make_drawio_erd.profiling import PhaseProfiler
+
+
+def test_peak_bytes_is_relative_to_phase_entry():
+    profiler = PhaseProfiler()
+    try:
+        retained = bytearray(4 * 1024 * 1024)
+        with profiler.phase('small'):
+            bytearray(1024)
+        with profiler.phase('large'):
+            bytearray(1024 * 1024)
+    finally:
+        profiler.stop()
+    del retained
+    assert profiler.phases['small']['peak_bytes'] < 64 * 1024
+    assert 1024 * 1024 <= profiler.phases['large']['peak_bytes'] < 2 * 1024 * 1024
+
+
+def test_nested_phase_peak_counts_toward_outer_phase():
+    profiler = PhaseProfiler()
+    try:
+        with profiler.phase('parse'):
+            with profiler.phase('filter'):
+                bytearray(1024 * 1024)
+    finally:
+        profiler.stop()
+    assert profiler.phases['parse']['peak_bytes'] >= profiler.phases['filter']['peak_bytes'] >= 1024 * 1024
+
+
+def test_table_filter_records_filter_phase():
+    profiler = PhaseProfiler(trace_memory=False)
+    df = pd.DataFrame({'Catalog': ['def', 'def'], 'Database': ['shop', 'stock'], 'Table': ['orders', 'products']})
+    kept = TableFilter('def.shop.*', profiler=profiler).apply(df)
+    assert kept['Table'].tolist() == ['orders']
+    assert profiler.phases['filter']['calls'] == 1
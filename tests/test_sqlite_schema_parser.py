@@ -0,0 +1,55 @@
+# tests/test_sqlite_schema_parser.py
+
+import sqlite3
+import pytest
+from make_drawio_erd.parsers.sqlite_schema_parser import SQLiteSchemaParser
+
+
+def rows(df):
+    # (table, column, PK, FK, referenced column) of each column
+    return [
+        (row.Table, row.Column, int(row.Is_Primary_Key), int(row.Is_Foreign_Key),
+         f'{row.References_Database}.{row.References_Table}.{row.References_Column}'.strip('.'))
+        for row in df.itertuples()
+    ]
+
+
+def test_parse_keys(sqlite_path):
+    df = SQLiteSchemaParser(sqlite_path).parse()
+    assert df['Database'].unique().tolist() == ['app']
+    assert rows(df) == [
+        ('big_orders', 'order_id', 0, 0, ''),
+        ('big_orders', 'quantity', 0, 0, ''),
+        ('customers', 'id', 1, 0, ''),
+        ('customers', 'name', 0, 0, ''),
+        ('order_items', 'order_id', 1, 1, 'app.orders.id'),
+        ('order_items', 'line', 1, 0, ''),
+        ('order_items', 'quantity', 0, 0, ''),
+        # A foreign key without target columns points to the primary key
+        ('orders', 'id', 1, 0, ''),
+        ('orders', 'customer_id', 0, 1, 'app.customers.id'),
+        # Each column of a composite foreign key points to its counterpart
+        ('shipments', 'id', 1, 0, ''),
+        ('shipments', 'order_id', 0, 1, 'app.order_items.order_id'),
+        ('shipments', 'line', 0, 1, 'app.order_items.line'),
+    ]
+
+
+def test_table_filters(sqlite_path):
+    parser = SQLiteSchemaParser(sqlite_path, database='shop')
+    df = parser.parse(include_tables=['order*', 's[h]*'], exclude_tables='*items')
+    assert df['Table'].unique().tolist() == ['orders', 'shipments']
+    assert df['Database'].unique().tolist() == ['shop']
+
+
+def test_iter_tables_matches_parse(sqlite_path):
+    parser = SQLiteSchemaParser(sqlite_path)
+    streamed = [(table.key, [column.name for column in table.columns]) for table in parser.iter_tables()]
+    parsed = [(table.key, [column.name for column in table.columns]) for table in parser.parse_tables()]
+    assert streamed == parsed
+
+
+def test_missing_file_is_an_error(tmp_path):
+    with pytest.raises(sqlite3.OperationalError):
+        SQLiteSchemaParser(str(tmp_path / 'missing.db')).parse()
+    assert not (tmp_path / 'missing.db').exists()
@@ -0,0 +1,43 @@
+# tests/test_type_inference.py
+
+import pandas as pd
+import pytest
+from make_drawio_erd.parsers.type_inference import ColumnTypeState, infer_column_type
+
+
+@pytest.mark.parametrize('values, expected', [
+    (['1', '-2', ' 3 ', None], 'INT'),
+    (['123456789012345678901234567890', '1'], 'INT'),
+    (['1', '2.5', '-3e2'], 'DECIMAL'),
+    (['18446744073709551616', '1.5'], 'DECIMAL'),
+    (['true', 'No', ' y '], 'BOOLEAN'),
+    (['2024-01-31', '1999-12-01'], 'DATE'),
+    (['2024-01-31 12:30:00', '2024-02-01T08:00Z', '2024-03-01'], 'DATETIME'),
+    (['2024-13-45'], 'VARCHAR(10)'),
+    (['abc', '1', 'abcdef'], 'VARCHAR(6)'),
+    ([None, None], 'VARCHAR'),
+])
+def test_infer_column_type(values, expected):
+    assert infer_column_type(pd.Series(values, dtype=object)) == expected
+
+
+def test_chunk_state_keeps_the_most_general_type():
+    state = ColumnTypeState()
+    state.update(pd.Series(['1', '2']))
+    assert state.inferred_type == 'INT'
+    state.update(pd.Series(['2.5']))
+    assert state.inferred_type == 'DECIMAL'
+    state.update(pd.Series([None], dtype=object))
+    assert state.inferred_type == 'DECIMAL'
+    state.update(pd.Series(['n/a', 'x']))
+    assert state.inferred_type == 'VARCHAR(3)'
+    # A later chunk of numbers cannot make the column numeric again
+    state.update(pd.Series(['12345']))
+    assert state.inferred_type == 'VARCHAR(5)'
+
+
+def test_chunk_state_of_dates():
+    state = ColumnTypeState()
+    state.update(pd.Series(['2024-01-01']))
+    state.update(pd.Series(['2024-01-02 10:00:00']))
+    assert state.inferred_type == 'DATETIME'